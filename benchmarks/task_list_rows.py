@@ -0,0 +1,100 @@
+"""对比只读列表两种加载方式的吞吐与峰值内存。
+
+- ``orm``：``select(Task)``，逐行构造 ORM 对象并登记到会话的 identity map；
+- ``core``：按 ``TaskResponse`` 字段顺序选列，直接返回 ``Row``，再由 ``dump_trusted_rows``
+  按位置组装（列表接口现在的做法）。
+
+两种方式的结果都是可直接输出的 dict。数据库是内存 SQLite，测的是加载与组装本身，
+不含网络和驱动的线程切换。
+
+用法（仓库根目录）：``PYTHONPATH=src python benchmarks/task_list_rows.py``
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import UTC, datetime
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Base, Task
+from app.schemas.task import TaskResponse
+from app.serialization import dump_trusted, dump_trusted_rows, response_columns
+
+
+def build_database(count: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    now = datetime.now(UTC)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Task),
+            [
+                {
+                    "workspace_id": 1,
+                    "project_id": 1,
+                    "title": f"任务 {index}",
+                    "description": "benchmark task " * 4,
+                    "status": "todo",
+                    "creator_id": 1,
+                    "assignee_id": 2 if index % 2 else None,
+                    "due_at": now,
+                    "version": 1,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(count)
+            ],
+        )
+    return engine
+
+
+def load_orm(session: Session, limit: int) -> list[dict]:
+    tasks = session.scalars(select(Task).order_by(Task.id).limit(limit)).all()
+    return [dump_trusted(task, TaskResponse) for task in tasks]
+
+
+def load_core(session: Session, limit: int) -> list[dict]:
+    columns = response_columns(Task.__table__, TaskResponse)
+    rows = session.execute(select(*columns).order_by(Task.id).limit(limit)).all()
+    return dump_trusted_rows(rows, TaskResponse)
+
+
+def measure(engine, load, limit: int, repeat: int) -> tuple[float, float]:
+    """返回 (rows/sec, 单次请求峰值内存 KiB)。每次请求使用新会话，与接口一致。"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with Session(engine) as session:
+            load(session, limit)
+    rate = limit * repeat / (time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    with Session(engine) as session:
+        load(session, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rate, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--rows", type=int, default=200_000, help="每种方式累计读取的行数")
+    args = parser.parse_args()
+
+    engine = build_database(max(args.sizes))
+    with Session(engine) as session:
+        assert load_orm(session, 10) == load_core(session, 10)
+    for limit in args.sizes:
+        repeat = max(1, args.rows // limit)
+        for name, load in (("orm", load_orm), ("core", load_core)):
+            load(Session(engine), limit)  # 预热语句缓存
+            rate, peak = measure(engine, load, limit, repeat)
+            print(f"{limit:>6} rows  {name:<4}  {rate:>10,.0f} rows/s  peak {peak:>9,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
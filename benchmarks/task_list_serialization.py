@@ -0,0 +1,94 @@
+"""对比任务列表页两种 JSON 输出路径的 CPU 耗时（不含数据库）。
+
+- ``validated``：原路径，逐行 ``TaskResponse.model_validate``，再由 FastAPI 按
+  ``response_model=PageResponse[TaskResponse]`` 校验、转成 JSON 兼容对象并 ``json.dumps``；
+- ``fast``：``dump_trusted`` 按字段读取属性，``FastJSONResponse`` 一次渲染成字节。
+
+用法（仓库根目录）：``PYTHONPATH=src python benchmarks/task_list_serialization.py``
+"""
+
+import argparse
+import json
+import time
+from datetime import UTC, datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from app.models.task import Task
+from app.schemas.common import PageResponse, TotalMode
+from app.schemas.task import TaskResponse
+from app.serialization import FastJSONResponse, dump_trusted
+
+PAGE_ADAPTER = TypeAdapter(PageResponse[TaskResponse])
+
+
+def build_tasks(count: int) -> list[Task]:
+    now = datetime.now(UTC)
+    return [
+        Task(
+            id=index + 1,
+            workspace_id=1,
+            project_id=1,
+            title=f"任务 {index}",
+            description="benchmark task " * 4,
+            status="in_progress",
+            creator_id=1,
+            assignee_id=2 if index % 2 else None,
+            due_at=now + timedelta(days=index % 7),
+            version=index % 5 + 1,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def _page(items: list) -> dict:
+    return {
+        "items": items,
+        "total": len(items),
+        "total_mode": TotalMode.exact,
+        "next_cursor": None,
+        "skip": 0,
+        "limit": 100,
+    }
+
+
+def render_validated(tasks: list[Task]) -> bytes:
+    payload = _page([TaskResponse.model_validate(task) for task in tasks])
+    # 与 fastapi.routing.serialize_response 相同：按 response_model 再校验一次再输出
+    value = PAGE_ADAPTER.validate_python(payload, from_attributes=True)
+    content = PAGE_ADAPTER.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def render_fast(tasks: list[Task]) -> bytes:
+    payload = _page([dump_trusted(task, TaskResponse) for task in tasks])
+    return FastJSONResponse(payload).body
+
+
+def measure(render, tasks: list[Task], pages: int) -> float:
+    start = time.process_time()
+    for _ in range(pages):
+        render(tasks)
+    return (time.process_time() - start) / pages * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.page_size)
+    assert json.loads(render_validated(tasks)) == json.loads(render_fast(tasks))
+
+    validated = measure(render_validated, tasks, args.pages)
+    fast = measure(render_fast, tasks, args.pages)
+    print(f"page size {args.page_size}, {args.pages} pages")
+    print(f"validated: {validated:8.1f} us CPU/page")
+    print(f"fast:      {fast:8.1f} us CPU/page  ({validated / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -22,7 +22,9 @@ from app.models import (  # noqa: F401
     project,
     task,
     task_comment,
+    task_counter,
     task_tag,
+    task_tombstone,
     task_watcher,
     todo,
     user,
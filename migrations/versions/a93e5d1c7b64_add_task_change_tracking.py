@@ -0,0 +1,61 @@
+"""add tasks.change_seq and task_tombstones for delta sync
+
+Revision ID: a93e5d1c7b64
+Revises: f2c9a4e7b318
+Create Date: 2026-10-17 16:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a93e5d1c7b64"
+down_revision = "f2c9a4e7b318"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 存量任务保持 0：不带 since 的首次同步会拿到全部任务
+    op.add_column(
+        "tasks",
+        sa.Column("change_seq", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index(
+        "ix_tasks_workspace_change_seq",
+        "tasks",
+        ["workspace_id", "change_seq"],
+        unique=False,
+    )
+
+    op.create_table(
+        "task_tombstones",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("workspace_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_workspace_change_seq",
+        "task_tombstones",
+        ["workspace_id", "change_seq"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_tombstones_workspace_change_seq", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    op.drop_index("ix_tasks_workspace_change_seq", table_name="tasks")
+    # 不用 batch 模式：重建 tasks 表会丢掉计数与全文索引触发器
+    op.drop_column("tasks", "change_seq")
@@ -0,0 +1,29 @@
+"""add users.membership_epoch for token role claims
+
+Revision ID: b3f7d92e6a15
+Revises: a93e5d1c7b64
+Create Date: 2026-10-17 17:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b3f7d92e6a15"
+down_revision = "a93e5d1c7b64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("membership_epoch", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("membership_epoch")
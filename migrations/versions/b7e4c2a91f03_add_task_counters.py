@@ -0,0 +1,96 @@
+"""add task_counters maintained by triggers
+
+Revision ID: b7e4c2a91f03
+Revises: 921743ddcb91
+Create Date: 2026-10-17 09:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e4c2a91f03"
+down_revision = "921743ddcb91"
+branch_labels = None
+depends_on = None
+
+_COUNTER_KEY_MATCH = """
+        workspace_id = OLD.workspace_id
+        AND project_id = OLD.project_id
+        AND status = OLD.status
+        AND assignee_id = COALESCE(OLD.assignee_id, 0)"""
+
+_INCREMENT_NEW = """
+    INSERT INTO task_counters (workspace_id, project_id, status, assignee_id, task_count)
+    VALUES (NEW.workspace_id, NEW.project_id, NEW.status, COALESCE(NEW.assignee_id, 0), 1)
+    ON CONFLICT (workspace_id, project_id, status, assignee_id)
+    DO UPDATE SET task_count = task_count + 1;"""
+
+_DECREMENT_OLD = f"""
+    UPDATE task_counters SET task_count = task_count - 1
+    WHERE {_COUNTER_KEY_MATCH};
+    DELETE FROM task_counters
+    WHERE {_COUNTER_KEY_MATCH}
+        AND task_count <= 0;"""
+
+TRIGGERS = {
+    "trg_tasks_counter_insert": f"""
+CREATE TRIGGER trg_tasks_counter_insert AFTER INSERT ON tasks
+BEGIN{_INCREMENT_NEW}
+END""",
+    "trg_tasks_counter_delete": f"""
+CREATE TRIGGER trg_tasks_counter_delete AFTER DELETE ON tasks
+BEGIN{_DECREMENT_OLD}
+END""",
+    "trg_tasks_counter_update": f"""
+CREATE TRIGGER trg_tasks_counter_update
+AFTER UPDATE OF workspace_id, project_id, status, assignee_id ON tasks
+WHEN OLD.workspace_id IS NOT NEW.workspace_id
+    OR OLD.project_id IS NOT NEW.project_id
+    OR OLD.status IS NOT NEW.status
+    OR OLD.assignee_id IS NOT NEW.assignee_id
+BEGIN{_DECREMENT_OLD}{_INCREMENT_NEW}
+END""",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counters",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("workspace_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("assignee_id", sa.Integer(), nullable=False),
+        sa.Column("task_count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["workspace_id"], ["workspaces.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "workspace_id",
+            "project_id",
+            "status",
+            "assignee_id",
+            name="uq_task_counter_key",
+        ),
+    )
+
+    op.execute(
+        """
+        INSERT INTO task_counters (workspace_id, project_id, status, assignee_id, task_count)
+        SELECT workspace_id, project_id, status, COALESCE(assignee_id, 0), COUNT(*)
+        FROM tasks
+        GROUP BY workspace_id, project_id, status, COALESCE(assignee_id, 0)
+        """
+    )
+
+    for ddl in TRIGGERS.values():
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table("task_counters")
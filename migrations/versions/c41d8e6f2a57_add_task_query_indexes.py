@@ -0,0 +1,39 @@
+"""add indexes matching task list query shapes
+
+Revision ID: c41d8e6f2a57
+Revises: b7e4c2a91f03
+Create Date: 2026-10-17 10:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c41d8e6f2a57"
+down_revision = "b7e4c2a91f03"
+branch_labels = None
+depends_on = None
+
+TASK_INDEXES = {
+    "ix_tasks_workspace_id": ["workspace_id"],
+    "ix_tasks_workspace_status": ["workspace_id", "status"],
+    "ix_tasks_workspace_assignee_status": ["workspace_id", "assignee_id", "status"],
+    "ix_tasks_workspace_created_at": ["workspace_id", "created_at"],
+    # 项目看板的默认查询：project_id 过滤 + created_at 排序
+    "ix_tasks_workspace_project_created_at": ["workspace_id", "project_id", "created_at"],
+    "ix_tasks_workspace_updated_at": ["workspace_id", "updated_at"],
+    "ix_tasks_workspace_due_at": ["workspace_id", "due_at"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in TASK_INDEXES.items():
+        op.create_index(name, "tasks", columns, unique=False)
+    op.create_index("ix_task_tags_tag_task_id", "task_tags", ["tag", "task_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_tags_tag_task_id", table_name="task_tags")
+    for name in reversed(list(TASK_INDEXES)):
+        op.drop_index(name, table_name="tasks")
@@ -0,0 +1,115 @@
+"""add FTS5 search index over tasks and comments
+
+Revision ID: d5a3f8e1b240
+Revises: c41d8e6f2a57
+Create Date: 2026-10-17 13:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d5a3f8e1b240"
+down_revision = "c41d8e6f2a57"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# external content 表：正文只存一份在 tasks / task_comments，FTS 只保存倒排索引
+FTS_TABLES = {
+    "tasks_fts": """
+CREATE VIRTUAL TABLE tasks_fts USING fts5(
+    title, description,
+    content='tasks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)""",
+    "task_comments_fts": """
+CREATE VIRTUAL TABLE task_comments_fts USING fts5(
+    content,
+    content='task_comments', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+)""",
+}
+
+_TASK_INSERT_NEW = """
+    INSERT INTO tasks_fts (rowid, title, description)
+    VALUES (NEW.id, NEW.title, NEW.description);"""
+
+_TASK_DELETE_OLD = """
+    INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+    VALUES ('delete', OLD.id, OLD.title, OLD.description);"""
+
+_COMMENT_INSERT_NEW = """
+    INSERT INTO task_comments_fts (rowid, content) VALUES (NEW.id, NEW.content);"""
+
+_COMMENT_DELETE_OLD = """
+    INSERT INTO task_comments_fts (task_comments_fts, rowid, content)
+    VALUES ('delete', OLD.id, OLD.content);"""
+
+TRIGGERS = {
+    "trg_tasks_fts_insert": f"""
+CREATE TRIGGER trg_tasks_fts_insert AFTER INSERT ON tasks
+BEGIN{_TASK_INSERT_NEW}
+END""",
+    "trg_tasks_fts_delete": f"""
+CREATE TRIGGER trg_tasks_fts_delete AFTER DELETE ON tasks
+BEGIN{_TASK_DELETE_OLD}
+END""",
+    "trg_tasks_fts_update": f"""
+CREATE TRIGGER trg_tasks_fts_update AFTER UPDATE OF title, description ON tasks
+BEGIN{_TASK_DELETE_OLD}{_TASK_INSERT_NEW}
+END""",
+    "trg_task_comments_fts_insert": f"""
+CREATE TRIGGER trg_task_comments_fts_insert AFTER INSERT ON task_comments
+BEGIN{_COMMENT_INSERT_NEW}
+END""",
+    "trg_task_comments_fts_delete": f"""
+CREATE TRIGGER trg_task_comments_fts_delete AFTER DELETE ON task_comments
+BEGIN{_COMMENT_DELETE_OLD}
+END""",
+    "trg_task_comments_fts_update": f"""
+CREATE TRIGGER trg_task_comments_fts_update AFTER UPDATE OF content ON task_comments
+BEGIN{_COMMENT_DELETE_OLD}{_COMMENT_INSERT_NEW}
+END""",
+}
+
+_BACKFILL = {
+    "tasks": """
+        INSERT INTO tasks_fts (rowid, title, description)
+        SELECT id, title, description FROM tasks
+        WHERE id > :low AND id <= :high""",
+    "task_comments": """
+        INSERT INTO task_comments_fts (rowid, content)
+        SELECT id, content FROM task_comments
+        WHERE id > :low AND id <= :high""",
+}
+
+
+def _backfill(bind: sa.engine.Connection, table: str) -> None:
+    # 按主键区间分批写入，避免一次性把整张表读进一条语句
+    max_id = bind.execute(sa.text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar_one()
+    statement = sa.text(_BACKFILL[table])
+    for low in range(0, max_id, BACKFILL_BATCH_SIZE):
+        bind.execute(statement, {"low": low, "high": low + BACKFILL_BATCH_SIZE})
+
+
+def upgrade() -> None:
+    for ddl in FTS_TABLES.values():
+        op.execute(ddl)
+
+    bind = op.get_bind()
+    for table in _BACKFILL:
+        _backfill(bind, table)
+
+    for ddl in TRIGGERS.values():
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for name in FTS_TABLES:
+        op.execute(f"DROP TABLE IF EXISTS {name}")
@@ -0,0 +1,30 @@
+"""add task_comments index for per-task lookups
+
+Revision ID: e8b1c7d40a96
+Revises: d5a3f8e1b240
+Create Date: 2026-10-17 14:00:00
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e8b1c7d40a96"
+down_revision = "d5a3f8e1b240"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 评论列表（按 created_at 排序）与 expand=comment_count 的批量计数共用
+    op.create_index(
+        "ix_task_comments_task_id_created_at",
+        "task_comments",
+        ["task_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_comments_task_id_created_at", table_name="task_comments")
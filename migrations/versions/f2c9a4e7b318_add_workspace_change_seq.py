@@ -0,0 +1,29 @@
+"""add workspaces.change_seq for collection ETags
+
+Revision ID: f2c9a4e7b318
+Revises: e8b1c7d40a96
+Create Date: 2026-10-17 15:00:00
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f2c9a4e7b318"
+down_revision = "e8b1c7d40a96"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workspaces",
+        sa.Column("change_seq", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("workspaces") as batch_op:
+        batch_op.drop_column("change_seq")
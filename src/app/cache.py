@@ -0,0 +1,214 @@
+"""进程内 LRU 缓存。
+
+``TTLCache`` 只用于可以容忍短暂陈旧的数据（例如列表总数估算）；``VersionedBytesCache``
+的键自带版本号（如工作区变更序号），写入后旧键自然不再命中，因此不会返回陈旧数据。
+多 worker 部署时每个进程各自一份。
+
+构造时给出 ``name`` 的缓存把命中、未命中、淘汰次数与当前大小报告到 ``/metrics``
+（``cache_requests_total``、``cache_evictions_total``、``cache_entries``、``cache_size_bytes``，
+以 ``cache`` 标签区分）。
+"""
+
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+from app.metrics import Counter, Gauge, registry
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_registry: "weakref.WeakSet[TTLCache | VersionedBytesCache]" = weakref.WeakSet()
+
+CACHE_REQUESTS = registry.register(
+    Counter("cache_requests_total", "In-process cache lookups", ["cache", "result"])
+)
+CACHE_EVICTIONS = registry.register(
+    Counter("cache_evictions_total", "Entries evicted to stay within the cache limit", ["cache"])
+)
+CACHE_ENTRIES = registry.register(Gauge("cache_entries", "Entries currently cached", ["cache"]))
+CACHE_SIZE_BYTES = registry.register(
+    Gauge("cache_size_bytes", "Bytes held by byte-limited caches", ["cache"])
+)
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        name: str | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        _registry.add(self)
+
+    def _record(self, result: str) -> None:
+        if self.name is not None:
+            CACHE_REQUESTS.inc(self.name, result)
+
+    def _report_size(self) -> None:
+        if self.name is not None:
+            CACHE_ENTRIES.set(len(self._entries), self.name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            self._record("miss")
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._report_size()
+            self.misses += 1
+            self._record("miss")
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._record("hit")
+        return value
+
+    def set(self, key: K, value: V, *, ttl_seconds: float | None = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.name is not None:
+                CACHE_EVICTIONS.inc(self.name)
+        self._report_size()
+
+    def pop(self, key: K) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._report_size()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._report_size()
+
+
+class VersionedBytesCache(Generic[K]):
+    """按总字节数限额的 LRU 缓存，值是序列化好的响应体。"""
+
+    def __init__(self, *, max_bytes: int, name: str | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries: OrderedDict[K, bytes] = OrderedDict()
+        _registry.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _record(self, result: str) -> None:
+        if self.name is not None:
+            CACHE_REQUESTS.inc(self.name, result)
+
+    def _report_size(self) -> None:
+        if self.name is not None:
+            CACHE_ENTRIES.set(len(self._entries), self.name)
+            CACHE_SIZE_BYTES.set(self.size_bytes, self.name)
+
+    def get(self, key: K) -> bytes | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            self._record("miss")
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._record("hit")
+        return value
+
+    def set(self, key: K, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        self.pop(key)
+        self._entries[key] = value
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+            if self.name is not None:
+                CACHE_EVICTIONS.inc(self.name)
+        self._report_size()
+
+    def pop(self, key: K) -> None:
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self.size_bytes -= len(value)
+            self._report_size()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+        self._report_size()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class InvalidationLog(Generic[K]):
+    """记录每个键最近一次失效的时刻，配合 ``TTLCache`` 防止并发请求写回陈旧条目。
+
+    读取方在查库前记下 ``time.monotonic()`` 并与结果一起缓存，有效期也从这一刻算起；
+    命中时早于该键最近一次失效的条目视为陈旧。超过缓存有效期的失效记录已不可能影响
+    任何条目，在后续失效时顺带清理，记录数因此有上限。
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[K, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, key: K, *, retention_seconds: float) -> None:
+        now = time.monotonic()
+        self._entries[key] = now
+        self._entries.move_to_end(key)
+        horizon = now - retention_seconds
+        while self._entries:
+            oldest_key, oldest_at = next(iter(self._entries.items()))
+            if oldest_at >= horizon:
+                break
+            del self._entries[oldest_key]
+
+    def is_current(self, key: K, checked_at: float) -> bool:
+        """``checked_at`` 之后该键没有失效过时返回 True。"""
+        return checked_at > self._entries.get(key, float("-inf"))
+
+
+def clear_all_caches() -> None:
+    """清空进程内所有缓存（测试隔离、运维排障时使用）。"""
+    for cache in list(_registry):
+        cache.clear()
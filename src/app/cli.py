@@ -0,0 +1,74 @@
+"""运维命令行入口。
+
+用法（项目根目录下；Docker 镜像中已设置 PYTHONPATH）：
+    PYTHONPATH=src python -m app.cli task-counters verify [--workspace-id N]
+    PYTHONPATH=src python -m app.cli task-counters rebuild [--workspace-id N]
+    PYTHONPATH=src python -m app.cli search-index rebuild
+
+verify 发现漂移时以退出码 1 结束，便于在定时任务中告警。
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from app.database import async_session, engine
+from app.services import search as search_service
+from app.services import task_counters as task_counter_service
+
+
+async def _run_task_counters(action: str, workspace_id: int | None) -> int:
+    async with async_session() as db:
+        if action == "rebuild":
+            await task_counter_service.rebuild_task_counters(db, workspace_id=workspace_id)
+            await db.commit()
+
+        drift = await task_counter_service.verify_task_counters(db, workspace_id=workspace_id)
+
+    for row in drift:
+        print(json.dumps(row))
+    print(f"task-counters {action}: {len(drift)} drifted key(s)", file=sys.stderr)
+    return 1 if drift else 0
+
+
+async def _run_search_index() -> int:
+    async with async_session() as db:
+        await search_service.rebuild_search_index(db)
+        await db.commit()
+    print("search-index rebuild: done", file=sys.stderr)
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    counters = commands.add_parser("task-counters", help="Verify or rebuild task_counters")
+    counters.add_argument("action", choices=["verify", "rebuild"])
+    counters.add_argument("--workspace-id", type=int, default=None)
+
+    search_index = commands.add_parser("search-index", help="Rebuild the full-text index")
+    search_index.add_argument("action", choices=["rebuild"])
+
+    return parser
+
+
+async def _main(args: argparse.Namespace) -> int:
+    try:
+        if args.command == "task-counters":
+            return await _run_task_counters(args.action, args.workspace_id)
+        if args.command == "search-index":
+            return await _run_search_index()
+        return 2
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    return asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
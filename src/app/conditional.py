@@ -0,0 +1,33 @@
+"""集合接口的条件请求。
+
+在路由上声明 ``Depends(workspace_collection_etag)``：先用一条主键查询读取工作区变更序号
+（同时校验成员关系），``If-None-Match`` 命中时直接返回 304，不再执行列表查询。
+"""
+
+from fastapi import Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.etags import if_none_match_hits
+from app.security import Principal, get_current_user
+from app.services.changes import get_change_seq, workspace_etag
+
+
+async def workspace_collection_etag(
+    workspace_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> str | None:
+    """返回当前 ETag 并写入响应头；直接返回 ``Response`` 的端点需自行带上返回值。"""
+    change_seq = await get_change_seq(db, workspace_id=workspace_id, user_id=current_user.id)
+    if change_seq is None:
+        # 非成员：交给端点本身的权限校验返回 404
+        return None
+
+    etag = workspace_etag(workspace_id, change_seq)
+    if if_none_match_hits(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
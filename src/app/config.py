@@ -19,6 +19,39 @@ class Settings(BaseSettings):
     SECRET_KEY: str = _DEFAULT_SECRET_KEY
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # token → 当前用户 的解析缓存（有效期同时不超过 token 的 exp；0 表示关闭）
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # 工作区成员关系的跨请求缓存（默认关闭：多 worker 时其他进程的变更最多延迟这么久生效）
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 0
+    MEMBERSHIP_CACHE_MAX_ENTRIES: int = 10000
+
+    # 在 access token 中携带工作区角色，只读接口据此授权、不查成员表；
+    # 成员数超过上限时不携带（token 体积受请求头大小限制）
+    TOKEN_ROLE_CLAIMS_ENABLED: bool = False
+    TOKEN_ROLE_CLAIMS_MAX_WORKSPACES: int = 100
+
+    # bcrypt 在独立线程池中执行：线程数、最多排队等待的请求数（超出返回 503）与 Retry-After 秒数
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # 设置后 GET /metrics 需要 Authorization: Bearer <METRICS_TOKEN>，否则返回 404
+    METRICS_TOKEN: str = ""
+
+    # include_total=estimate 时总数缓存的有效期与容量
+    TASK_COUNT_CACHE_TTL_SECONDS: int = 30
+    TASK_COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    # 任务列表响应缓存：键含工作区变更序号，任何写操作后旧页面自动失效
+    TASK_LIST_CACHE_ENABLED: bool = True
+    TASK_LIST_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # SSE：每个连接最多积压的事件数（超出即断开该连接）与心跳间隔
+    EVENT_QUEUE_SIZE: int = 256
+    EVENT_HEARTBEAT_SECONDS: float = 15.0
+
     # Comma-separated origins, e.g. "https://app.example.com,http://localhost:3000"
     CORS_ALLOWED_ORIGINS: str = "http://localhost:3000"
 
@@ -0,0 +1,46 @@
+"""HTTP 实体标签（ETag）的生成与条件请求匹配。
+
+``If-None-Match`` 使用弱比较（忽略 ``W/`` 前缀），``If-Match`` 使用强比较
+（弱标签永远不匹配），与 RFC 9110 的规定一致。
+"""
+
+
+def make_etag(value: str, *, weak: bool = False) -> str:
+    tag = f'"{value}"'
+    return f"W/{tag}" if weak else tag
+
+
+def _split_header(header: str) -> list[str]:
+    return [item.strip() for item in header.split(",") if item.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def if_none_match_hits(header: str | None, etag: str) -> bool:
+    """``If-None-Match`` 命中当前版本时返回 True（应返回 304）。"""
+    if header is None:
+        return False
+    candidates = _split_header(header)
+    if "*" in candidates:
+        return True
+    return _opaque(etag) in {_opaque(candidate) for candidate in candidates}
+
+
+def if_match_hits(header: str, etag: str) -> bool:
+    """``If-Match`` 满足前置条件时返回 True。"""
+    candidates = _split_header(header)
+    if "*" in candidates:
+        return True
+    if etag.startswith("W/"):
+        return False
+    return etag in candidates
+
+
+def if_match_candidates(header: str) -> list[str] | None:
+    """``If-Match`` 中可能满足强比较的标签；``*`` 时返回 None（任意当前版本都满足）。"""
+    candidates = _split_header(header)
+    if "*" in candidates:
+        return None
+    return [candidate for candidate in candidates if not candidate.startswith("W/")]
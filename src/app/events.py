@@ -0,0 +1,105 @@
+"""进程内工作区事件广播，供 SSE 推送使用。
+
+写路径通过 ``log_action`` 把事件挂到当前会话上，提交成功后由 ``after_commit`` 钩子一次性
+发布（每次提交一个生产者），回滚则直接丢弃。每个订阅连接有独立的有界队列：发布方从不等待，
+队列满说明消费者跟不上，直接把它踢掉，由客户端重连后用增量同步接口补齐。
+
+多 worker 部署时每个进程各自一份，只能看到本进程内提交的写操作。
+"""
+
+import asyncio
+import json
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+_PENDING_KEY = "pending_workspace_events"
+
+
+class Subscription:
+    def __init__(self, workspace_id: int, *, max_queue: int) -> None:
+        self.workspace_id = workspace_id
+        self.evicted = False
+        # None 作为"已被踢出"的哨兵，队列满时也要能放进去，所以多留一格
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=max_queue + 1)
+        self._max_queue = max_queue
+
+    def offer(self, payload: dict[str, Any]) -> bool:
+        if self.evicted:
+            return False
+        if self._queue.qsize() >= self._max_queue:
+            self.evicted = True
+            # 积压的事件已经没有意义，清空后只留下哨兵
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+            return False
+        self._queue.put_nowait(payload)
+        return True
+
+    async def get(self, timeout: float) -> dict[str, Any] | None:
+        """取下一条事件；超时抛出 TimeoutError，被踢出时返回 None。"""
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class EventBroker:
+    def __init__(self, *, max_queue: int) -> None:
+        self.max_queue = max_queue
+        self.published = 0
+        self.evictions = 0
+        self._subscribers: dict[int, set[Subscription]] = {}
+
+    def subscriber_count(self, workspace_id: int | None = None) -> int:
+        if workspace_id is not None:
+            return len(self._subscribers.get(workspace_id, ()))
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, workspace_id: int) -> Subscription:
+        subscription = Subscription(workspace_id, max_queue=self.max_queue)
+        self._subscribers.setdefault(workspace_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.workspace_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.workspace_id]
+
+    def publish(self, workspace_id: int, payload: dict[str, Any]) -> None:
+        self.published += 1
+        for subscription in list(self._subscribers.get(workspace_id, ())):
+            if not subscription.offer(payload):
+                self.evictions += 1
+                self.unsubscribe(subscription)
+
+
+broker = EventBroker(max_queue=settings.EVENT_QUEUE_SIZE)
+
+
+def queue_event(session: Session, workspace_id: int, payload: dict[str, Any]) -> None:
+    """登记一条事件，等所在事务提交后再发布。"""
+    session.info.setdefault(_PENDING_KEY, []).append((workspace_id, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for workspace_id, payload in session.info.pop(_PENDING_KEY, ()):
+        broker.publish(workspace_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def format_sse(payload: dict[str, Any] | None) -> str:
+    if payload is None:
+        return "event: evicted\ndata: {}\n\n"
+    data = json.dumps(payload, separators=(",", ":"))
+    event_name = f"{payload['entity_type']}.{payload['action']}"
+    return f"id: {payload['seq']}\nevent: {event_name}\ndata: {data}\n\n"
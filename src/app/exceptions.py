@@ -9,6 +9,9 @@
 class AppError(Exception):
     """所有业务异常的基类"""
 
+    # 需要随错误响应一起返回的响应头
+    headers: dict[str, str] | None = None
+
     def __init__(self, detail: str = "An error occurred") -> None:
         self.detail = detail
         super().__init__(detail)
@@ -28,3 +31,26 @@ class ConflictError(AppError):
 
 class BadRequestError(AppError):
     """请求参数无效（对应 HTTP 400）"""
+
+
+class PreconditionFailedError(AppError):
+    """条件请求的前置条件不满足，如 If-Match 与当前版本不符（对应 HTTP 412）"""
+
+
+class ServiceUnavailableError(AppError):
+    """服务暂时过载，客户端应在 ``Retry-After`` 秒后重试（对应 HTTP 503）"""
+
+    def __init__(self, detail: str, *, retry_after_seconds: int) -> None:
+        super().__init__(detail)
+        self.headers = {"Retry-After": str(retry_after_seconds)}
+
+
+# 异常类型到 HTTP 状态码的映射：全局异常处理器与批量接口的逐项结果共用
+STATUS_CODES: dict[type[AppError], int] = {
+    NotFoundError: 404,
+    ForbiddenError: 403,
+    ConflictError: 409,
+    BadRequestError: 400,
+    PreconditionFailedError: 412,
+    ServiceUnavailableError: 503,
+}
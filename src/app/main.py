@@ -1,34 +1,26 @@
+import hmac
 import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.config import settings
 from app.database import engine
-from app.exceptions import (
-    AppError,
-    BadRequestError,
-    ConflictError,
-    ForbiddenError,
-    NotFoundError,
-)
+from app.exceptions import STATUS_CODES, AppError
 from app.logging_config import logger
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.metrics import registry as metrics_registry
 from app.routers import audit as audit_router
 from app.routers import auth as auth_router
 from app.routers import collaboration as collaboration_router
+from app.routers import events as events_router
 from app.routers import projects as projects_router
+from app.routers import search as search_router
 from app.routers import tasks as tasks_router
 from app.routers import workspaces as workspaces_router
 
-_EXCEPTION_STATUS_MAP: dict[type[AppError], int] = {
-    NotFoundError: 404,
-    ForbiddenError: 403,
-    ConflictError: 409,
-    BadRequestError: 400,
-}
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -48,8 +40,12 @@ app = FastAPI(
 
 @app.exception_handler(AppError)
 async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
-    status_code = _EXCEPTION_STATUS_MAP.get(type(exc), 500)
-    return JSONResponse(status_code=status_code, content={"detail": exc.detail})
+    status_code = STATUS_CODES.get(type(exc), 500)
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": exc.detail},
+        headers=exc.headers,
+    )
 
 
 cors_allowed_origins = settings.cors_allowed_origins
@@ -85,6 +81,8 @@ app.include_router(projects_router.router)
 app.include_router(tasks_router.router)
 app.include_router(collaboration_router.router)
 app.include_router(audit_router.router)
+app.include_router(search_router.router)
+app.include_router(events_router.router)
 
 
 @app.get("/health", tags=["System"], summary="Health check")
@@ -94,3 +92,15 @@ async def health_check() -> dict:
         "app_name": settings.APP_NAME,
         "version": settings.APP_VERSION,
     }
+
+
+@app.get("/metrics", tags=["System"], summary="Prometheus metrics")
+async def metrics(
+    authorization: str | None = Header(default=None, alias="Authorization"),
+) -> PlainTextResponse:
+    if settings.METRICS_TOKEN and not hmac.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        # 不暴露端点是否存在
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -4,7 +4,9 @@ from app.models.idempotency_key import IdempotencyKey
 from app.models.project import Project
 from app.models.task import Task
 from app.models.task_comment import TaskComment
+from app.models.task_counter import TaskCounter
 from app.models.task_tag import TaskTag
+from app.models.task_tombstone import TaskTombstone
 from app.models.task_watcher import TaskWatcher
 from app.models.user import User
 from app.models.workspace import Workspace
@@ -17,7 +19,9 @@ __all__ = [
     "Project",
     "Task",
     "TaskComment",
+    "TaskCounter",
     "TaskTag",
+    "TaskTombstone",
     "TaskWatcher",
     "User",
     "Workspace",
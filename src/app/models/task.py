@@ -30,6 +30,15 @@ class Task(Base):
             "assignee_id",
             "due_at",
         ),
+        # 以下索引与 services.tasks.build_task_list_queries 的过滤/排序组合对应
+        Index("ix_tasks_workspace_id", "workspace_id"),
+        Index("ix_tasks_workspace_status", "workspace_id", "status"),
+        Index("ix_tasks_workspace_assignee_status", "workspace_id", "assignee_id", "status"),
+        Index("ix_tasks_workspace_created_at", "workspace_id", "created_at"),
+        Index("ix_tasks_workspace_project_created_at", "workspace_id", "project_id", "created_at"),
+        Index("ix_tasks_workspace_updated_at", "workspace_id", "updated_at"),
+        Index("ix_tasks_workspace_due_at", "workspace_id", "due_at"),
+        Index("ix_tasks_workspace_change_seq", "workspace_id", "change_seq"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -48,6 +57,8 @@ class Task(Base):
     )
     due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+    # 最近一次写入时的 workspaces.change_seq，增量同步按它排序
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
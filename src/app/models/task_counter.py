@@ -0,0 +1,37 @@
+from sqlalchemy import ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+# task_counters.assignee_id 用 0 表示未指派（唯一约束中的 NULL 互不相等，无法做 UPSERT）
+UNASSIGNED = 0
+
+
+class TaskCounter(Base):
+    """按 (workspace, project, status, assignee) 聚合的任务数。
+
+    由 ``tasks`` 表上的触发器在同一事务内维护（见迁移 ``b7e4c2a91f03``），
+    应用代码只读；出现漂移时用 ``python -m app.cli task-counters verify|rebuild`` 处理。
+    """
+
+    __tablename__ = "task_counters"
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id",
+            "project_id",
+            "status",
+            "assignee_id",
+            name="uq_task_counter_key",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    workspace_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False
+    )
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    assignee_id: Mapped[int] = mapped_column(Integer, nullable=False, default=UNASSIGNED)
+    task_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -8,7 +8,10 @@ from app.models.base import Base
 
 class TaskTag(Base):
     __tablename__ = "task_tags"
-    __table_args__ = (UniqueConstraint("task_id", "tag", name="uq_task_tag"),)
+    __table_args__ = (
+        UniqueConstraint("task_id", "tag", name="uq_task_tag"),
+        Index("ix_task_tags_tag_task_id", "tag", "task_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(
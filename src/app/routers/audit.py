@@ -1,14 +1,14 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.user import User
+from app.exceptions import ForbiddenError
 from app.schemas.audit import AuditLogResponse
-from app.schemas.common import PageResponse
-from app.schemas.workspace import RoleEnum
-from app.security import get_current_user
+from app.schemas.common import PageResponse, TotalMode
+from app.security import Principal, get_current_user
+from app.serialization import FastJSONResponse, dump_trusted_rows
 from app.services.audit import list_workspace_audit_logs
-from app.services.permissions import require_workspace_role
+from app.services.permissions import is_owner_or_admin, require_workspace_read_role
 
 router = APIRouter(tags=["Audit"])
 
@@ -21,19 +21,25 @@ async def get_audit_logs(
     workspace_id: int,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> dict:
-    await require_workspace_role(
-        db,
-        workspace_id,
-        current_user.id,
-        allowed_roles={RoleEnum.owner.value, RoleEnum.admin.value},
-    )
+) -> Response:
+    role = await require_workspace_read_role(db, workspace_id, current_user.id)
+    if not is_owner_or_admin(role):
+        raise ForbiddenError("Insufficient permissions")
     items, total = await list_workspace_audit_logs(
         db,
         workspace_id=workspace_id,
         skip=skip,
         limit=limit,
     )
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    return FastJSONResponse(
+        {
+            "items": dump_trusted_rows(items, AuditLogResponse),
+            "total": total,
+            "total_mode": TotalMode.exact,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": None,
+        }
+    )
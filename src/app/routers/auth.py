@@ -6,10 +6,18 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import Token, UserCreate, UserResponse
-from app.security import create_access_token, get_current_user, hash_password, verify_password
+from app.security import (
+    Principal,
+    create_access_token,
+    get_current_user,
+    hash_password_async,
+    verify_password_async,
+)
+from app.services.permissions import list_user_workspace_roles
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -34,7 +42,7 @@ async def register(
 
     user = User(
         username=user_in.username,
-        hashed_password=hash_password(user_in.password),
+        hashed_password=await hash_password_async(user_in.password),
     )
     db.add(user)
     try:
@@ -63,14 +71,23 @@ async def login(
     result = await db.execute(query)
     user = result.scalar_one_or_none()
 
-    if user is None or not verify_password(form_data.password, user.hashed_password):
+    if user is None or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="用户名或密码错误",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = create_access_token(user.id)
+    workspace_roles = None
+    if settings.TOKEN_ROLE_CLAIMS_ENABLED:
+        workspace_roles = await list_user_workspace_roles(db, user.id)
+        if len(workspace_roles) > settings.TOKEN_ROLE_CLAIMS_MAX_WORKSPACES:
+            workspace_roles = None
+    token = create_access_token(
+        user.id,
+        workspace_roles=workspace_roles,
+        membership_epoch=user.membership_epoch,
+    )
     return {"access_token": token, "token_type": "bearer"}
 
 
@@ -79,7 +96,7 @@ async def login(
     response_model=UserResponse,
     summary="获取当前用户信息",
 )
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: Principal = Depends(get_current_user)):
     return current_user
 
 
@@ -90,7 +107,7 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 )
 async def lookup_user_by_username(
     username: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> User:
     query = select(User).where(User.username == username, User.is_active.is_(True))
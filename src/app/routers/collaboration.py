@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.conditional import workspace_collection_etag
 from app.database import get_db
-from app.models.user import User
 from app.schemas.comment import (
     CommentCreate,
     CommentResponse,
@@ -12,7 +12,8 @@ from app.schemas.comment import (
     WatcherCreate,
     WatcherResponse,
 )
-from app.security import get_current_user
+from app.security import Principal, get_current_user
+from app.serialization import FastJSONResponse, dump_trusted_rows
 from app.services import comments as comment_service
 from app.services import tags as tag_service
 from app.services import watchers as watcher_service
@@ -29,7 +30,7 @@ async def create_comment(
     workspace_id: int,
     task_id: int,
     data: CommentCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> CommentResponse:
     comment = await comment_service.create_comment(
@@ -49,16 +50,18 @@ async def create_comment(
 async def list_comments(
     workspace_id: int,
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    etag: str | None = Depends(workspace_collection_etag),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[CommentResponse]:
+) -> Response:
     comments = await comment_service.list_comments(
         db,
         workspace_id=workspace_id,
         task_id=task_id,
         user_id=current_user.id,
     )
-    return [CommentResponse.model_validate(comment) for comment in comments]
+    headers = {"ETag": etag} if etag is not None else None
+    return FastJSONResponse(dump_trusted_rows(comments, CommentResponse), headers=headers)
 
 
 @router.patch(
@@ -70,7 +73,7 @@ async def update_comment(
     task_id: int,
     comment_id: int,
     data: CommentUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> CommentResponse:
     comment = await comment_service.update_comment(
@@ -92,7 +95,7 @@ async def delete_comment(
     workspace_id: int,
     task_id: int,
     comment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
     await comment_service.delete_comment(
@@ -111,7 +114,7 @@ async def delete_comment(
 async def list_tags(
     workspace_id: int,
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[TagResponse]:
     tags = await tag_service.list_tags(
@@ -132,7 +135,7 @@ async def add_tag(
     workspace_id: int,
     task_id: int,
     data: TagCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> TagResponse:
     tag = await tag_service.add_tag(
@@ -153,7 +156,7 @@ async def delete_tag(
     workspace_id: int,
     task_id: int,
     tag: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
     await tag_service.delete_tag(
@@ -172,7 +175,7 @@ async def delete_tag(
 async def list_watchers(
     workspace_id: int,
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[WatcherResponse]:
     watchers = await watcher_service.list_watchers(
@@ -193,7 +196,7 @@ async def add_watcher(
     workspace_id: int,
     task_id: int,
     data: WatcherCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> WatcherResponse:
     watcher = await watcher_service.add_watcher(
@@ -214,7 +217,7 @@ async def delete_watcher(
     workspace_id: int,
     task_id: int,
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
     await watcher_service.delete_watcher(
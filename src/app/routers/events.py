@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_db
+from app.security import Principal, get_current_user
+from app.services import events as event_service
+
+router = APIRouter(tags=["Events"])
+
+
+@router.get(
+    "/workspaces/{workspace_id}/events",
+    response_class=StreamingResponse,
+)
+async def stream_workspace_events(
+    workspace_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    subscription = await event_service.subscribe_workspace_events(
+        db,
+        workspace_id=workspace_id,
+        user_id=current_user.id,
+    )
+    return StreamingResponse(
+        event_service.stream_events(
+            subscription,
+            heartbeat_seconds=settings.EVENT_HEARTBEAT_SECONDS,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.conditional import workspace_collection_etag
 from app.database import get_db
-from app.models.user import User
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
-from app.security import get_current_user
+from app.security import Principal, get_current_user
+from app.serialization import FastJSONResponse, dump_trusted_rows
 from app.services import projects as project_service
 
 router = APIRouter(tags=["Projects"])
@@ -18,7 +19,7 @@ router = APIRouter(tags=["Projects"])
 async def create_project(
     workspace_id: int,
     data: ProjectCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectResponse:
     project = await project_service.create_project(
@@ -30,18 +31,23 @@ async def create_project(
     return ProjectResponse.model_validate(project)
 
 
-@router.get("/workspaces/{workspace_id}/projects", response_model=list[ProjectResponse])
+@router.get(
+    "/workspaces/{workspace_id}/projects",
+    response_model=list[ProjectResponse],
+)
 async def list_projects(
     workspace_id: int,
-    current_user: User = Depends(get_current_user),
+    etag: str | None = Depends(workspace_collection_etag),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> list[ProjectResponse]:
+) -> Response:
     projects = await project_service.list_projects(
         db,
         workspace_id=workspace_id,
         user_id=current_user.id,
     )
-    return [ProjectResponse.model_validate(project) for project in projects]
+    headers = {"ETag": etag} if etag is not None else None
+    return FastJSONResponse(dump_trusted_rows(projects, ProjectResponse), headers=headers)
 
 
 @router.get(
@@ -51,7 +57,7 @@ async def list_projects(
 async def get_project(
     workspace_id: int,
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectResponse:
     project = await project_service.get_project(
@@ -71,7 +77,7 @@ async def update_project(
     workspace_id: int,
     project_id: int,
     data: ProjectUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> ProjectResponse:
     project = await project_service.update_project(
@@ -91,7 +97,7 @@ async def update_project(
 async def delete_project(
     workspace_id: int,
     project_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
     await project_service.delete_project(
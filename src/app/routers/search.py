@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.schemas.search import SearchHitType, SearchResponse
+from app.security import Principal, get_current_user
+from app.services import search as search_service
+
+router = APIRouter(tags=["Search"])
+
+
+@router.get(
+    "/workspaces/{workspace_id}/search",
+    response_model=SearchResponse,
+)
+async def search_workspace(
+    workspace_id: int,
+    q: str = Query(min_length=1, max_length=200),
+    hit_type: SearchHitType | None = Query(default=None, alias="type"),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=50),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    items = await search_service.search_workspace(
+        db,
+        workspace_id=workspace_id,
+        user_id=current_user.id,
+        query=q,
+        hit_type=hit_type,
+        skip=skip,
+        limit=limit,
+    )
+    return {"query": q, "items": items, "skip": skip, "limit": limit}
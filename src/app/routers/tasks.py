@@ -1,25 +1,113 @@
+from collections.abc import Sequence
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.conditional import workspace_collection_etag
+from app.config import settings
 from app.database import get_db
-from app.models.user import User
-from app.schemas.common import PageResponse
+from app.etags import if_none_match_hits
+from app.models.task import Task
+from app.schemas.common import PageResponse, TotalMode
 from app.schemas.task import (
+    BoardResponse,
     SortOrder,
+    TagMode,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBulkPatch,
+    TaskBulkUpdateResponse,
+    TaskChangesResponse,
     TaskCreate,
+    TaskExpand,
+    TaskFileFormat,
+    TaskFilters,
+    TaskImportResponse,
     TaskResponse,
     TaskSortBy,
-    TaskStatus,
     TaskStatusTransition,
     TaskUpdate,
+    task_response_model,
 )
-from app.security import get_current_user
+from app.security import Principal, get_current_user
+from app.serialization import FastJSONResponse, dump_trusted_rows
+from app.services import changes as change_service
+from app.services import task_export as export_service
+from app.services import task_import as import_service
 from app.services import tasks as task_service
 
 router = APIRouter(tags=["Tasks"])
 
+FIELDS_DESCRIPTION = "Comma-separated TaskResponse fields to return, e.g. `title,status`"
+EXPAND_DESCRIPTION = "Comma-separated relations to embed: `tags`, `watchers`, `comment_count`"
+
+
+def get_task_filters(
+    status_filter: str | None = Query(
+        default=None,
+        alias="status",
+        max_length=200,
+        description="One status or a comma-separated list, e.g. `todo,blocked`",
+    ),
+    assignee_id: str | None = Query(
+        default=None,
+        max_length=500,
+        description="One user id or `in:3,5`",
+    ),
+    project_id: str | None = Query(
+        default=None,
+        max_length=500,
+        description="One project id or `in:3,5`",
+    ),
+    tag: list[str] | None = Query(default=None, description="Repeat to filter by several tags"),
+    tag_mode: TagMode = Query(default=TagMode.all, description="`all` (intersection) or `any`"),
+    unassigned: bool | None = None,
+    due_at_from: datetime | None = None,
+    due_at_to: datetime | None = None,
+) -> TaskFilters:
+    try:
+        return TaskFilters.model_validate(
+            {
+                "statuses": status_filter,
+                "assignee_ids": assignee_id,
+                "project_ids": project_id,
+                "tags": tag,
+                "tag_mode": tag_mode,
+                "unassigned": unassigned,
+                "due_at_from": due_at_from,
+                "due_at_to": due_at_to,
+            }
+        )
+    except ValidationError as exc:
+        # 与其他查询参数错误保持一致，返回 422
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+
+def _serialize_tasks(
+    tasks: Sequence[Task | Row[Any]],
+    fields: frozenset[str] | None,
+    expand: frozenset[TaskExpand] = frozenset(),
+    expansions: dict[TaskExpand, dict[int, Any]] | None = None,
+) -> list[dict[str, Any]] | list[BaseModel]:
+    """任务行直接按字段读出（受信任数据，不再校验）；嵌入的关联仍经模型转换。"""
+    rows = dump_trusted_rows(tasks, task_response_model(fields))
+    if not expand or expansions is None:
+        return rows
+
+    model = task_response_model(fields, expand)
+    serialized = []
+    for data in rows:
+        for relation in expand:
+            data[relation.value] = expansions[relation][data["id"]]
+        serialized.append(model.model_validate(data))
+    return serialized
+
 
 @router.post(
     "/workspaces/{workspace_id}/projects/{project_id}/tasks",
@@ -32,7 +120,7 @@ async def create_task(
     project_id: int,
     data: TaskCreate,
     idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> TaskResponse:
     return await task_service.create_task(
@@ -46,6 +134,80 @@ async def create_task(
     )
 
 
+@router.post(
+    "/workspaces/{workspace_id}/projects/{project_id}/tasks/import",
+    response_model=TaskImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_tasks(
+    request: Request,
+    workspace_id: int,
+    project_id: int,
+    import_format: TaskFileFormat = Query(default=TaskFileFormat.ndjson, alias="format"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    # 直接读取请求体流，不把整个文件读进内存
+    return await import_service.import_tasks(
+        db,
+        workspace_id=workspace_id,
+        project_id=project_id,
+        actor_user_id=current_user.id,
+        import_format=import_format,
+        chunks=request.stream(),
+    )
+
+
+@router.post(
+    "/workspaces/{workspace_id}/tasks/batch",
+    response_model=TaskBatchResponse,
+)
+async def run_task_batch(
+    workspace_id: int,
+    data: TaskBatchRequest,
+    atomic: bool = Query(default=True, description="Roll back every operation if any fails"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    return await task_service.run_task_batch(
+        db,
+        workspace_id=workspace_id,
+        actor_user_id=current_user.id,
+        operations=data.operations,
+        atomic=atomic,
+    )
+
+
+@router.post(
+    "/workspaces/{workspace_id}/tasks/bulk-update",
+    response_model=TaskBulkUpdateResponse,
+)
+async def bulk_update_tasks(
+    workspace_id: int,
+    patch: TaskBulkPatch,
+    filters: TaskFilters = Depends(get_task_filters),
+    dry_run: bool = Query(default=False, description="Only count the affected tasks"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    return await task_service.bulk_update_tasks(
+        db,
+        workspace_id=workspace_id,
+        actor_user_id=current_user.id,
+        filters=filters,
+        patch=patch,
+        dry_run=dry_run,
+    )
+
+
 @router.get(
     "/workspaces/{workspace_id}/tasks",
     response_model=PageResponse[TaskResponse],
@@ -54,38 +216,147 @@ async def list_tasks(
     workspace_id: int,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, max_length=512),
     sort_by: TaskSortBy = Query(default=TaskSortBy.created_at),
     sort_order: SortOrder = Query(default=SortOrder.desc),
-    status_filter: TaskStatus | None = Query(default=None, alias="status"),
-    assignee_id: int | None = Query(default=None, ge=1),
-    project_id: int | None = Query(default=None, ge=1),
-    tag: str | None = Query(default=None, min_length=1, max_length=50),
-    due_at_from: datetime | None = None,
-    due_at_to: datetime | None = None,
-    current_user: User = Depends(get_current_user),
+    filters: TaskFilters = Depends(get_task_filters),
+    include_total: TotalMode = Query(default=TotalMode.exact),
+    fields: str | None = Query(default=None, max_length=500, description=FIELDS_DESCRIPTION),
+    expand: str | None = Query(default=None, max_length=100, description=EXPAND_DESCRIPTION),
+    etag: str | None = Depends(workspace_collection_etag),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> dict:
-    items, total = await task_service.list_tasks(
+) -> Response:
+    selected_fields = task_service.parse_task_fields(fields)
+    selected_expand = task_service.parse_task_expand(expand)
+
+    cache_key: tuple | None = None
+    if etag is not None and settings.TASK_LIST_CACHE_ENABLED:
+        # etag 非空说明本次请求已通过成员校验；其中的变更序号保证缓存页不会陈旧
+        cache_key = (
+            etag,
+            skip,
+            limit,
+            cursor,
+            sort_by,
+            sort_order,
+            filters,
+            include_total,
+            selected_fields,
+            selected_expand,
+        )
+        body = task_service.task_page_cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    page = await task_service.list_tasks(
         db,
         workspace_id=workspace_id,
         user_id=current_user.id,
         skip=skip,
         limit=limit,
+        cursor=cursor,
         sort_by=sort_by,
         sort_order=sort_order,
-        status_filter=status_filter,
-        assignee_id=assignee_id,
-        project_id=project_id,
-        tag=tag,
-        due_at_from=due_at_from,
-        due_at_to=due_at_to,
+        filters=filters,
+        total_mode=include_total,
+        fields=selected_fields,
+    )
+    expansions = await task_service.load_task_expansions(
+        db,
+        task_ids=[item.id for item in page["items"]],
+        expand=selected_expand,
     )
-    return {
-        "items": [TaskResponse.model_validate(item) for item in items],
-        "total": total,
+    # 键顺序与 PageResponse 的字段顺序一致，输出与 response_model 路径逐字节相同
+    payload = {
+        "items": _serialize_tasks(page["items"], selected_fields, selected_expand, expansions),
+        "total": page["total"],
+        "total_mode": page["total_mode"],
         "skip": skip,
         "limit": limit,
+        "next_cursor": page["next_cursor"],
     }
+    headers = {"ETag": etag} if etag is not None else None
+    response = FastJSONResponse(payload, headers=headers)
+    if cache_key is not None:
+        task_service.task_page_cache.set(cache_key, bytes(response.body))
+    return response
+
+
+@router.get(
+    "/workspaces/{workspace_id}/board",
+    response_model=BoardResponse,
+)
+async def get_board(
+    workspace_id: int,
+    project_id: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=20, ge=1, le=100, description="Tasks per status column"),
+    sort_by: TaskSortBy = Query(default=TaskSortBy.created_at),
+    sort_order: SortOrder = Query(default=SortOrder.desc),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    board = await task_service.get_board(
+        db,
+        workspace_id=workspace_id,
+        user_id=current_user.id,
+        project_id=project_id,
+        limit=limit,
+        sort_by=sort_by,
+        sort_order=sort_order,
+    )
+    for column in board["columns"]:
+        column["items"] = dump_trusted_rows(column["items"], TaskResponse)
+    return FastJSONResponse(board)
+
+
+@router.get(
+    "/workspaces/{workspace_id}/tasks/export",
+    response_class=StreamingResponse,
+)
+async def export_tasks(
+    workspace_id: int,
+    export_format: TaskFileFormat = Query(default=TaskFileFormat.ndjson, alias="format"),
+    filters: TaskFilters = Depends(get_task_filters),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    # 生成器使用依赖注入的会话，该会话在响应发送完毕后才关闭
+    chunks = await export_service.export_tasks(
+        db,
+        workspace_id=workspace_id,
+        user_id=current_user.id,
+        filters=filters,
+        export_format=export_format,
+    )
+    filename = f"tasks-{workspace_id}.{export_format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=export_service.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/workspaces/{workspace_id}/tasks/changes",
+    response_model=TaskChangesResponse,
+)
+async def list_task_changes(
+    workspace_id: int,
+    since: str | None = Query(
+        default=None, max_length=512, description="`next_token` from the previous sync"
+    ),
+    limit: int = Query(default=100, ge=1, le=500),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    return await change_service.list_task_changes(
+        db,
+        workspace_id=workspace_id,
+        user_id=current_user.id,
+        since=since,
+        limit=limit,
+    )
 
 
 @router.get(
@@ -95,16 +366,49 @@ async def list_tasks(
 async def get_task(
     workspace_id: int,
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    fields: str | None = Query(default=None, max_length=500, description=FIELDS_DESCRIPTION),
+    expand: str | None = Query(default=None, max_length=100, description=EXPAND_DESCRIPTION),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> TaskResponse:
+) -> Response:
+    selected_fields = task_service.parse_task_fields(fields)
+    selected_expand = task_service.parse_task_expand(expand)
+
+    # 嵌入的关联变化不会递增 version，带 expand 的响应不提供 ETag
+    use_etag = not selected_expand
+    weak_etag = selected_fields is not None
+    if use_etag and if_none_match is not None:
+        version = await task_service.get_task_version(
+            db,
+            workspace_id=workspace_id,
+            task_id=task_id,
+            user_id=current_user.id,
+        )
+        if version is not None:
+            etag = task_service.task_etag(task_id, version, weak=weak_etag)
+            if if_none_match_hits(if_none_match, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
     task = await task_service.get_task(
         db,
         workspace_id=workspace_id,
         task_id=task_id,
         user_id=current_user.id,
+        fields=selected_fields,
     )
-    return TaskResponse.model_validate(task)
+    headers = (
+        {"ETag": task_service.task_etag(task.id, task.version, weak=weak_etag)}
+        if use_etag
+        else None
+    )
+    expansions = await task_service.load_task_expansions(
+        db,
+        task_ids=[task.id],
+        expand=selected_expand,
+    )
+    serialized = _serialize_tasks([task], selected_fields, selected_expand, expansions)
+    return FastJSONResponse(serialized[0], headers=headers)
 
 
 @router.patch(
@@ -115,7 +419,9 @@ async def update_task(
     workspace_id: int,
     task_id: int,
     data: TaskUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_match: str | None = Header(default=None, alias="If-Match"),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> TaskResponse:
     task = await task_service.update_task(
@@ -124,7 +430,9 @@ async def update_task(
         task_id=task_id,
         actor_user_id=current_user.id,
         data=data,
+        if_match=if_match,
     )
+    response.headers["ETag"] = task_service.task_etag(task.id, task.version)
     return TaskResponse.model_validate(task)
 
 
@@ -136,7 +444,9 @@ async def transition_task_status(
     workspace_id: int,
     task_id: int,
     data: TaskStatusTransition,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_match: str | None = Header(default=None, alias="If-Match"),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> TaskResponse:
     task = await task_service.transition_task_status(
@@ -145,7 +455,9 @@ async def transition_task_status(
         task_id=task_id,
         actor_user_id=current_user.id,
         data=data,
+        if_match=if_match,
     )
+    response.headers["ETag"] = task_service.task_etag(task.id, task.version)
     return TaskResponse.model_validate(task)
 
 
@@ -156,7 +468,8 @@ async def transition_task_status(
 async def delete_task(
     workspace_id: int,
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    if_match: str | None = Header(default=None, alias="If-Match"),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
     await task_service.delete_task(
@@ -164,4 +477,5 @@ async def delete_task(
         workspace_id=workspace_id,
         task_id=task_id,
         actor_user_id=current_user.id,
+        if_match=if_match,
     )
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.conditional import workspace_collection_etag
 from app.database import get_db
-from app.models.user import User
 from app.schemas.workspace import (
     WorkspaceCreate,
     WorkspaceMemberCreate,
@@ -10,7 +10,7 @@ from app.schemas.workspace import (
     WorkspaceMemberUpdate,
     WorkspaceResponse,
 )
-from app.security import get_current_user
+from app.security import Principal, get_current_user
 from app.services import workspaces as workspace_service
 
 router = APIRouter(tags=["Workspaces"])
@@ -23,7 +23,7 @@ router = APIRouter(tags=["Workspaces"])
 )
 async def create_workspace(
     data: WorkspaceCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     return await workspace_service.create_workspace(
@@ -35,7 +35,7 @@ async def create_workspace(
 
 @router.get("/workspaces", response_model=list[WorkspaceResponse])
 async def list_workspaces(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[dict]:
     return await workspace_service.list_workspaces(db, user_id=current_user.id)
@@ -44,7 +44,7 @@ async def list_workspaces(
 @router.get("/workspaces/{workspace_id}", response_model=WorkspaceResponse)
 async def get_workspace(
     workspace_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     return await workspace_service.get_workspace(
@@ -57,10 +57,11 @@ async def get_workspace(
 @router.get(
     "/workspaces/{workspace_id}/members",
     response_model=list[WorkspaceMemberResponse],
+    dependencies=[Depends(workspace_collection_etag)],
 )
 async def list_workspace_members(
     workspace_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[dict]:
     return await workspace_service.list_workspace_members(
@@ -78,7 +79,7 @@ async def list_workspace_members(
 async def add_workspace_member(
     workspace_id: int,
     data: WorkspaceMemberCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> WorkspaceMemberResponse:
     membership = await workspace_service.add_workspace_member(
@@ -98,7 +99,7 @@ async def update_workspace_member(
     workspace_id: int,
     user_id: int,
     data: WorkspaceMemberUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> WorkspaceMemberResponse:
     membership = await workspace_service.update_workspace_member(
@@ -118,7 +119,7 @@ async def update_workspace_member(
 async def delete_workspace_member(
     workspace_id: int,
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
     await workspace_service.remove_workspace_member(
@@ -8,11 +8,31 @@ from app.schemas.comment import (
     WatcherCreate,
     WatcherResponse,
 )
-from app.schemas.common import PageResponse
+from app.schemas.common import PageResponse, TotalMode
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
+from app.schemas.search import SearchHit, SearchHitType, SearchResponse
 from app.schemas.task import (
+    BoardColumn,
+    BoardResponse,
     SortOrder,
+    TagMode,
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchOperation,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBatchResult,
+    TaskBatchTransition,
+    TaskBatchUpdate,
+    TaskBulkPatch,
+    TaskBulkUpdateResponse,
+    TaskChangesResponse,
     TaskCreate,
+    TaskFileFormat,
+    TaskFilters,
+    TaskImportError,
+    TaskImportResponse,
+    TaskImportRow,
     TaskResponse,
     TaskSortBy,
     TaskStatus,
@@ -32,6 +52,8 @@ from app.schemas.workspace import (
 __all__ = [
     "AuditLogQuery",
     "AuditLogResponse",
+    "BoardColumn",
+    "BoardResponse",
     "CommentCreate",
     "CommentResponse",
     "CommentUpdate",
@@ -40,16 +62,36 @@ __all__ = [
     "ProjectResponse",
     "ProjectUpdate",
     "RoleEnum",
+    "SearchHit",
+    "SearchHitType",
+    "SearchResponse",
     "SortOrder",
     "TagCreate",
+    "TagMode",
     "TagResponse",
+    "TaskBatchCreate",
+    "TaskBatchDelete",
+    "TaskBatchOperation",
+    "TaskBatchRequest",
+    "TaskBatchResponse",
+    "TaskBatchResult",
+    "TaskBatchTransition",
+    "TaskBatchUpdate",
+    "TaskBulkPatch",
+    "TaskBulkUpdateResponse",
+    "TaskChangesResponse",
     "TaskCreate",
+    "TaskFileFormat",
+    "TaskFilters",
+    "TaskImportError",
+    "TaskImportResponse",
+    "TaskImportRow",
     "TaskResponse",
     "TaskSortBy",
     "TaskStatus",
     "TaskStatusTransition",
     "TaskUpdate",
-
+    "TotalMode",
     "Token",
     "UserCreate",
     "UserResponse",
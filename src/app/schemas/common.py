@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Generic, TypeVar
 
 from pydantic import BaseModel, Field
@@ -5,8 +6,16 @@ from pydantic import BaseModel, Field
 T = TypeVar("T")
 
 
+class TotalMode(str, Enum):
+    false = "false"
+    exact = "exact"
+    estimate = "estimate"
+
+
 class PageResponse(BaseModel, Generic[T]):
     items: list[T]
-    total: int = Field(ge=0)
+    total: int | None = Field(default=None, ge=0)
+    total_mode: TotalMode = TotalMode.exact
     skip: int = Field(ge=0)
     limit: int = Field(ge=1, le=100)
+    next_cursor: str | None = None
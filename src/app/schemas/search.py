@@ -0,0 +1,25 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class SearchHitType(str, Enum):
+    task = "task"
+    comment = "comment"
+
+
+class SearchHit(BaseModel):
+    type: SearchHitType
+    task_id: int
+    comment_id: int | None
+    project_id: int
+    title: str
+    snippet: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    items: list[SearchHit]
+    skip: int
+    limit: int
@@ -1,7 +1,11 @@
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator, model_validator
+
+from app.schemas.comment import TagResponse, WatcherResponse
 
 
 class TaskStatus(str, Enum):
@@ -24,6 +28,78 @@ class TaskSortBy(str, Enum):
     id = "id"
 
 
+class TaskExpand(str, Enum):
+    tags = "tags"
+    watchers = "watchers"
+    comment_count = "comment_count"
+
+
+class TagMode(str, Enum):
+    all = "all"
+    any = "any"
+
+
+class TaskFileFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def _split_csv(value: Any) -> Any:
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+
+class TaskFilters(BaseModel):
+    """任务列表的过滤条件，列表查询与计数共用。
+
+    多值参数既接受列表，也接受查询串写法：``status=todo,blocked``、
+    ``assignee_id=in:3,5``（单个值时 ``assignee_id=3`` 亦可）。
+    ``unassigned=true`` 与 ``assignee_ids`` 同时给出时取并集。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    statuses: tuple[TaskStatus, ...] | None = None
+    assignee_ids: tuple[int, ...] | None = None
+    project_ids: tuple[int, ...] | None = None
+    tags: tuple[str, ...] | None = None
+    tag_mode: TagMode = TagMode.all
+    unassigned: bool | None = None
+    due_at_from: datetime | None = None
+    due_at_to: datetime | None = None
+
+    @field_validator("statuses", mode="before")
+    @classmethod
+    def _parse_statuses(cls, value: Any) -> Any:
+        return _split_csv(value) or None
+
+    @field_validator("assignee_ids", "project_ids", mode="before")
+    @classmethod
+    def _parse_ids(cls, value: Any) -> Any:
+        if isinstance(value, int):
+            return [value]
+        if isinstance(value, str) and value.startswith("in:"):
+            value = value[len("in:") :]
+        return _split_csv(value) or None
+
+    @field_validator("assignee_ids", "project_ids")
+    @classmethod
+    def _positive_ids(cls, value: tuple[int, ...] | None) -> tuple[int, ...] | None:
+        if value is not None and any(item < 1 for item in value):
+            raise ValueError("ids must be positive integers")
+        return value
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, value: tuple[str, ...] | None) -> tuple[str, ...] | None:
+        if not value:
+            return None
+        if any(not 1 <= len(tag) <= 50 for tag in value):
+            raise ValueError("tags must be 1-50 characters")
+        return tuple(dict.fromkeys(value))
+
+
 class TaskCreate(BaseModel):
     title: str = Field(min_length=1, max_length=200)
     description: str | None = Field(default=None, max_length=5000)
@@ -32,13 +108,60 @@ class TaskCreate(BaseModel):
 
 
 class TaskUpdate(BaseModel):
-    version: int = Field(ge=1)
+    # 也可以用 If-Match 请求头代替
+    version: int | None = Field(default=None, ge=1)
     title: str | None = Field(default=None, min_length=1, max_length=200)
     description: str | None = Field(default=None, max_length=5000)
     assignee_id: int | None = Field(default=None, gt=0)
     due_at: datetime | None = None
 
 
+class TaskBulkPatch(BaseModel):
+    # assignee_id 显式传 null 表示取消指派
+    assignee_id: int | None = Field(default=None, gt=0)
+    project_id: int | None = Field(default=None, gt=0)
+    to_status: TaskStatus | None = None
+
+    @model_validator(mode="after")
+    def _require_change(self) -> "TaskBulkPatch":
+        if not self.model_fields_set & {"assignee_id", "project_id", "to_status"}:
+            raise ValueError("patch must set assignee_id, project_id or to_status")
+        if "project_id" in self.model_fields_set and self.project_id is None:
+            raise ValueError("project_id cannot be null")
+        if "to_status" in self.model_fields_set and self.to_status is None:
+            raise ValueError("to_status cannot be null")
+        return self
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    dry_run: bool
+    # matched：符合过滤条件的任务数；skipped：其中不允许流转到 to_status 的任务数
+    matched: int
+    updated: int
+    skipped: int
+
+
+class TaskImportRow(BaseModel):
+    # 其他列（例如导出文件中的 id、version）直接忽略，导出的文件可原样导入
+    title: str = Field(min_length=1, max_length=200)
+    description: str | None = Field(default=None, max_length=5000)
+    status: TaskStatus = TaskStatus.todo
+    assignee_id: int | None = Field(default=None, gt=0)
+    due_at: datetime | None = None
+
+
+class TaskImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class TaskImportResponse(BaseModel):
+    created: int
+    failed: int
+    # 最多返回前 IMPORT_MAX_REPORTED_ERRORS 条
+    errors: list[TaskImportError]
+
+
 class TaskStatusTransition(BaseModel):
     to_status: TaskStatus
 
@@ -58,3 +181,103 @@ class TaskResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class BoardColumn(BaseModel):
+    status: TaskStatus
+    items: list[TaskResponse]
+    total: int = Field(ge=0)
+    next_cursor: str | None = None
+
+
+class BoardResponse(BaseModel):
+    project_id: int | None
+    limit: int
+    columns: list[BoardColumn]
+
+
+class TaskChangesResponse(BaseModel):
+    # 客户端先应用 deleted 再应用 items（任务 id 可能被复用）
+    items: list[TaskResponse]
+    deleted: list[int]
+    next_token: str
+    has_more: bool
+
+
+class TaskBatchCreate(TaskCreate):
+    op: Literal["create"]
+    project_id: int = Field(gt=0)
+
+
+class TaskBatchUpdate(TaskUpdate):
+    op: Literal["update"]
+    task_id: int = Field(gt=0)
+    # 批量接口没有 If-Match，version 必填
+    version: int = Field(ge=1)
+
+
+class TaskBatchTransition(TaskStatusTransition):
+    op: Literal["transition"]
+    task_id: int = Field(gt=0)
+    version: int | None = Field(default=None, ge=1)
+
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    task_id: int = Field(gt=0)
+    version: int | None = Field(default=None, ge=1)
+
+
+TaskBatchOperation = Annotated[
+    TaskBatchCreate | TaskBatchUpdate | TaskBatchTransition | TaskBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: list[TaskBatchOperation] = Field(min_length=1, max_length=100)
+
+
+class TaskBatchResult(BaseModel):
+    index: int
+    op: str
+    # 与对应单个接口的状态码一致；atomic 模式下因其他操作失败而回滚的项为 424
+    status: int
+    task_id: int | None = None
+    task: TaskResponse | None = None
+    detail: str | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    atomic: bool
+    committed: bool
+    results: list[TaskBatchResult]
+
+
+EXPAND_ANNOTATIONS: dict[TaskExpand, Any] = {
+    TaskExpand.tags: list[TagResponse],
+    TaskExpand.watchers: list[WatcherResponse],
+    TaskExpand.comment_count: int,
+}
+
+
+@lru_cache(maxsize=128)
+def task_response_model(
+    fields: frozenset[str] | None,
+    expand: frozenset[TaskExpand] = frozenset(),
+) -> type[BaseModel]:
+    """按 ``fields=`` / ``expand=`` 参数生成 TaskResponse 的变体（按参数组合缓存）。"""
+    if fields is None and not expand:
+        return TaskResponse
+    definitions: dict = {
+        name: (info.annotation, ...)
+        for name, info in TaskResponse.model_fields.items()
+        if fields is None or name in fields
+    }
+    for relation in expand:
+        definitions[relation.value] = (EXPAND_ANNOTATIONS[relation], ...)
+    return create_model(
+        "TaskFieldsResponse",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
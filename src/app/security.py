@@ -9,7 +9,14 @@
    登录成功后生成"通行证"（token），之后每次请求带上它来证明身份。
 """
 
+import asyncio
+import hashlib
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import TypeVar
 
 import bcrypt
 from fastapi import Depends, HTTPException, status
@@ -17,9 +24,16 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import TTLCache
 from app.config import settings
 from app.database import get_db
+from app.exceptions import ServiceUnavailableError
+from app.metrics import Counter, Gauge, Histogram, registry
 from app.models.user import User
+from app.services.permissions import use_claimed_roles
+from app.user_invalidation import is_current
+
+T = TypeVar("T")
 
 # ========== 密码哈希工具 ==========
 
@@ -36,6 +50,79 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+# ========== 在线程池中执行哈希 ==========
+# bcrypt 单次约几百毫秒，直接在协程里调用会卡住整个事件循环。
+# 放到固定大小的线程池里执行；排队的请求过多时直接返回 503，而不是让登录无限堆积。
+
+# 线程数在启动时固定；排队上限按同一个值计算，而不是每次重新读配置
+_HASH_WORKERS = settings.PASSWORD_HASH_WORKERS
+_hash_executor = ThreadPoolExecutor(
+    max_workers=_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
+HASH_SECONDS = registry.register(
+    Histogram(
+        "password_hash_seconds",
+        "bcrypt execution time in the worker thread",
+        ["operation"],
+    )
+)
+HASH_QUEUE_WAIT_SECONDS = registry.register(
+    Histogram(
+        "password_hash_queue_wait_seconds",
+        "Time spent waiting for a free hashing thread",
+        ["operation"],
+    )
+)
+HASH_IN_FLIGHT = registry.register(
+    Gauge("password_hash_in_flight", "Hashing calls running or queued")
+)
+HASH_REJECTED = registry.register(
+    Counter(
+        "password_hash_rejected_total",
+        "Hashing calls rejected with 503 because the queue was full",
+        ["operation"],
+    )
+)
+
+
+async def _run_hashing(operation: str, func: Callable[[], T]) -> T:
+    limit = _HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+    if HASH_IN_FLIGHT.value() >= limit:
+        HASH_REJECTED.inc(operation)
+        raise ServiceUnavailableError(
+            "Server is busy, please retry later",
+            retry_after_seconds=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+        )
+
+    def timed() -> tuple[T, float, float]:
+        started = time.perf_counter()
+        result = func()
+        return result, started, time.perf_counter() - started
+
+    loop = asyncio.get_running_loop()
+    HASH_IN_FLIGHT.inc()
+    submitted = time.perf_counter()
+    job = _hash_executor.submit(timed)
+    # 请求被取消（如客户端断开）时，已在执行的 bcrypt 仍会跑完；
+    # 计数跟随线程池中的任务本身结束时才减少，排队上限才能反映真实负载
+    job.add_done_callback(lambda _: loop.call_soon_threadsafe(HASH_IN_FLIGHT.dec))
+    result, started, elapsed = await asyncio.wrap_future(job)
+    # 指标只在事件循环线程里更新
+    HASH_QUEUE_WAIT_SECONDS.observe(started - submitted, operation)
+    HASH_SECONDS.observe(elapsed, operation)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hashing("hash", lambda: hash_password(password))
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing("verify", lambda: verify_password(plain_password, hashed_password))
+
+
 # ========== JWT Token 工具 ==========
 # OAuth2PasswordBearer 告诉 FastAPI：
 # "用户的 token 从请求头 Authorization: Bearer <token> 中获取"
@@ -44,24 +131,91 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 ALGORITHM = "HS256"
 
 
-def create_access_token(user_id: int) -> str:
-    """创建 JWT token，包含用户 ID 和过期时间"""
+def create_access_token(
+    user_id: int,
+    *,
+    workspace_roles: Mapping[int, str] | None = None,
+    membership_epoch: int = 0,
+) -> str:
+    """创建 JWT token，包含用户 ID 和过期时间
+
+    传入 ``workspace_roles`` 时一并写入角色声明 ``ws`` 与签发时的成员纪元 ``me``
+    """
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    payload = {"sub": str(user_id), "exp": expire}
+    payload: dict[str, object] = {"sub": str(user_id), "exp": expire}
+    if workspace_roles is not None:
+        payload["ws"] = {str(workspace_id): role for workspace_id, role in workspace_roles.items()}
+        payload["me"] = membership_epoch
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _claimed_roles(payload: dict, user: User) -> dict[int, str] | None:
+    """token 中的角色声明；未开启、未携带或成员纪元已变化时返回 None（回退查库）。"""
+    claims = payload.get("ws")
+    if not settings.TOKEN_ROLE_CLAIMS_ENABLED or not isinstance(claims, dict):
+        return None
+    if payload.get("me") != user.membership_epoch:
+        return None
+    return {int(workspace_id): role for workspace_id, role in claims.items()}
+
+
+# ========== 当前用户缓存 ==========
+# 同一个 token 在有效期内反复使用，每次都解码并查一次 users 表没有必要。
+# 按 token 摘要缓存解析结果，有效期不超过 token 本身的 exp；
+# 用户被修改或删除的事务提交后，旧的缓存条目随即失效（见 app.user_invalidation）。
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """已认证的调用者；与会话无关，可以跨请求复用。"""
+
+    id: int
+    username: str
+    # token 中已核对成员纪元的工作区角色；None 表示没有可信的声明
+    workspace_roles: Mapping[int, str] | None = None
+
+
+# 值为 (查库前的 time.monotonic(), Principal)
+_principal_cache: TTLCache[str, tuple[float, Principal]] = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+PRINCIPAL_CACHE_REQUESTS = registry.register(
+    Counter(
+        "principal_cache_requests_total",
+        "Authenticated-principal cache lookups",
+        ["result"],
+    )
+)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 # ========== 获取当前用户（依赖注入） ==========
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
     """从 token 中解析当前用户
 
-    FastAPI 自动从请求头提取 token → 解码 → 查找用户 → 返回
+    FastAPI 自动从请求头提取 token → 解码 → 查找用户 → 返回；
+    同一 token 的解析结果会被缓存，命中时既不解码也不查库
     """
+    digest = _token_digest(token)
+    cached = _principal_cache.get(digest)
+    if cached is not None:
+        checked_at, principal = cached
+        if is_current(principal.id, checked_at):
+            PRINCIPAL_CACHE_REQUESTS.inc("hit")
+            use_claimed_roles(db, principal.id, principal.workspace_roles)
+            return principal
+    PRINCIPAL_CACHE_REQUESTS.inc("miss")
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="无法验证身份，请重新登录",
@@ -76,8 +230,24 @@ async def get_current_user(
     except JWTError as err:
         raise credentials_exception from err
 
+    # 先记下时刻再查库：查询期间有变更提交时，写入的条目会立即过期
+    checked_at = time.monotonic()
     user = await db.get(User, int(user_id))
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        workspace_roles=_claimed_roles(payload, user),
+    )
+    # 有效期从查库前算起，失效记录只需保留 PRINCIPAL_CACHE_TTL_SECONDS
+    ttl_seconds = min(
+        settings.PRINCIPAL_CACHE_TTL_SECONDS - (time.monotonic() - checked_at),
+        payload["exp"] - time.time(),
+    )
+    # 带角色声明的结果不缓存：每次请求都重新核对成员纪元，其他进程里的成员变更也能立即生效
+    if principal.workspace_roles is None:
+        _principal_cache.set(digest, (checked_at, principal), ttl_seconds=ttl_seconds)
+    use_claimed_roles(db, principal.id, principal.workspace_roles)
+    return principal
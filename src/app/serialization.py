@@ -0,0 +1,52 @@
+"""受信任数据的快速 JSON 输出。
+
+响应里的 ORM 行都是本服务写入的，已经满足响应模型的约束：先 ``model_validate`` 再交给
+FastAPI 按 ``response_model`` 校验并序列化一遍，同样的数据会被处理两次。这里按响应模型的
+字段名直接读取属性，由 pydantic-core 的序列化器一次渲染成字节，输出格式（日期时间、枚举等）
+与原路径相同。需要嵌套校验的数据（如 ``expand`` 的关联）仍可以传入模型实例。
+
+只读列表用 Core 查询按 ``response_columns`` 的顺序选列，得到的 ``Row`` 交给
+``dump_trusted_rows`` 按位置组装，连逐个属性查找也省掉（``Row`` 按名取值比按下标慢得多）。
+"""
+
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import FromClause, Row
+from sqlalchemy.sql.elements import KeyedColumnElement
+from starlette.responses import Response
+
+
+@lru_cache(maxsize=256)
+def response_fields(model: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def response_columns(table: FromClause, model: type[BaseModel]) -> list[KeyedColumnElement[Any]]:
+    """按 ``model`` 的字段顺序取出 ``table`` 的列。"""
+    return [table.c[name] for name in response_fields(model)]
+
+
+def dump_trusted(obj: Any, model: type[BaseModel]) -> dict[str, Any]:
+    """按 ``model`` 的字段读取 ``obj`` 的属性，不做校验。"""
+    return {name: getattr(obj, name) for name in response_fields(model)}
+
+
+def dump_trusted_rows(rows: Sequence[Any], model: type[BaseModel]) -> list[dict[str, Any]]:
+    """批量版的 ``dump_trusted``；``Row`` 的前几列与模型字段一致时按位置组装，多出的列忽略。"""
+    names = response_fields(model)
+    if rows and isinstance(rows[0], Row) and rows[0]._fields[: len(names)] == names:
+        return [dict(zip(names, row, strict=False)) for row in rows]
+    return [dump_trusted(row, model) for row in rows]
+
+
+class FastJSONResponse(Response):
+    """接受 dict / list / 模型实例的混合结构，直接输出紧凑 JSON。"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
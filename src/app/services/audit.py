@@ -1,10 +1,15 @@
 import json
+from collections.abc import Sequence
 from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.events import queue_event
 from app.models.audit_log import AuditLog
+from app.schemas.audit import AuditLogResponse
+from app.serialization import response_columns
+from app.services.changes import bump_change_seq
 
 SENSITIVE_FIELDS = {
     "password",
@@ -17,6 +22,9 @@ SENSITIVE_FIELDS = {
     "authorization",
 }
 
+# 通过 SSE 推送给工作区成员的实体类型；项目删除会连带删除任务，所以也推送
+EVENT_ENTITY_TYPES = frozenset({"task", "task_comment", "task_tag", "task_watcher", "project"})
+
 
 def _sanitize(value: Any) -> Any:
     if isinstance(value, dict):
@@ -48,7 +56,13 @@ async def log_action(
     entity_id: int,
     action: str,
     changes: dict[str, Any] | None = None,
-) -> None:
+    change_seq: int | None = None,
+) -> int:
+    """记录审计日志并递增工作区变更序号，返回新的序号。
+
+    调用方已经用 ``bump_change_seq`` 取得序号时通过 ``change_seq`` 传入，不再重复递增。
+    与任务相关的写操作同时登记一条工作区事件，事务提交后推送给 SSE 订阅者。
+    """
     db.add(
         AuditLog(
             actor_user_id=actor_user_id,
@@ -59,6 +73,62 @@ async def log_action(
             changes=_serialize_changes(changes),
         )
     )
+    if change_seq is None:
+        change_seq = await bump_change_seq(db, workspace_id)
+    if entity_type in EVENT_ENTITY_TYPES:
+        queue_event(
+            db.sync_session,
+            workspace_id,
+            {
+                "seq": change_seq,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "action": action,
+                "actor_user_id": actor_user_id,
+            },
+        )
+    return change_seq
+
+
+async def log_bulk_action(
+    db: AsyncSession,
+    *,
+    actor_user_id: int,
+    workspace_id: int,
+    entity_type: str,
+    entity_ids: Sequence[int],
+    action: str,
+    changes: dict[str, Any] | None = None,
+) -> int:
+    """一次写操作涉及多个实体时只记一条审计日志，并递增工作区变更序号，返回新的序号。
+
+    记录归属于工作区，``changes`` 中的 ``{entity_type}_ids`` 列出全部实体 id。
+    工作区事件同样只登记一条，用 ``entity_ids`` 列出全部实体，避免大批量修改占满订阅者的队列。
+    """
+    db.add(
+        AuditLog(
+            actor_user_id=actor_user_id,
+            workspace_id=workspace_id,
+            entity_type="workspace",
+            entity_id=workspace_id,
+            action=action,
+            changes=_serialize_changes({**(changes or {}), f"{entity_type}_ids": list(entity_ids)}),
+        )
+    )
+    change_seq = await bump_change_seq(db, workspace_id)
+    if entity_type in EVENT_ENTITY_TYPES:
+        queue_event(
+            db.sync_session,
+            workspace_id,
+            {
+                "seq": change_seq,
+                "entity_type": entity_type,
+                "entity_ids": list(entity_ids),
+                "action": action,
+                "actor_user_id": actor_user_id,
+            },
+        )
+    return change_seq
 
 
 async def list_workspace_audit_logs(
@@ -66,9 +136,10 @@ async def list_workspace_audit_logs(
     workspace_id: int,
     skip: int,
     limit: int,
-) -> tuple[list[AuditLog], int]:
+) -> tuple[Sequence[Row[Any]], int]:
+    # 只读列表按列查询：返回 Row，不构造 ORM 对象、不进入 identity map
     query = (
-        select(AuditLog)
+        select(*response_columns(AuditLog.__table__, AuditLogResponse))
         .where(AuditLog.workspace_id == workspace_id)
         .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
         .offset(skip)
@@ -81,4 +152,4 @@ async def list_workspace_audit_logs(
     result = await db.execute(query)
     count_result = await db.execute(count_query)
 
-    return list(result.scalars().all()), int(count_result.scalar_one())
+    return result.all(), int(count_result.scalar_one())
@@ -0,0 +1,180 @@
+"""工作区变更序号与任务增量同步。
+
+``workspaces.change_seq`` 在工作区内每次写操作时递增，只经由 ``bump_change_seq``，
+且总是与审计记录在同一事务中：
+
+- ``services.audit.log_action``：未传入 ``change_seq`` 时递增，覆盖 ``services.projects``
+  （删除项目时任务墓碑共用该序号）、评论、标签、关注者、工作区与成员、任务导入（每块一次），
+  以及批量接口中的状态流转与删除（``_apply_status_transition``、``_apply_task_delete``）；
+- ``services.audit.log_bulk_action``：按条件批量修改任务时每块递增一次；
+- ``services.tasks`` 中需要先拿到序号再写任务行的路径直接调用，再把序号传给 ``log_action``：
+  ``_add_task``（单个与批量创建）、``_apply_task_update``（批量更新）、``update_task``、
+  ``transition_task_status``、``delete_task``。
+
+任务写入时把该序号记到 ``tasks.change_seq``，删除时写入 ``task_tombstones``；
+增量同步按 (change_seq, kind, id) 顺序合并两条流，令牌即流中的位置。
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+from sqlalchemy import and_, literal, or_, select, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.etags import make_etag
+from app.exceptions import BadRequestError
+from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.models.workspace import Workspace
+from app.models.workspace_membership import WorkspaceMembership
+from app.services.permissions import require_workspace_read_role
+
+# 同一序号下先删除后更新：id 可能被复用，客户端先应用 deleted 再应用 items
+KIND_DELETED = "d"
+KIND_UPSERTED = "u"
+_STREAM_START = (-1, KIND_UPSERTED, 0)
+
+
+def workspace_etag(workspace_id: int, change_seq: int) -> str:
+    """集合接口的弱 ETag：同一序号下内容相同，但不同查询参数的表示各不相同。"""
+    return make_etag(f"ws-{workspace_id}-c{change_seq}", weak=True)
+
+
+async def bump_change_seq(db: AsyncSession, workspace_id: int) -> int:
+    result = await db.execute(
+        update(Workspace)
+        .where(Workspace.id == workspace_id)
+        # 显式保留 updated_at，避免 onupdate 把每次子资源写入都记成工作区本身的修改
+        .values(change_seq=Workspace.change_seq + 1, updated_at=Workspace.updated_at)
+        .returning(Workspace.change_seq)
+        .execution_options(synchronize_session=False)
+    )
+    return int(result.scalar_one())
+
+
+async def get_change_seq(db: AsyncSession, *, workspace_id: int, user_id: int) -> int | None:
+    """一条主键查询同时读取序号并校验成员关系；不可见时返回 None。"""
+    result = await db.execute(
+        select(Workspace.change_seq)
+        .join(
+            WorkspaceMembership,
+            and_(
+                WorkspaceMembership.workspace_id == Workspace.id,
+                WorkspaceMembership.user_id == user_id,
+            ),
+        )
+        .where(Workspace.id == workspace_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def _encode_sync_token(change_seq: int, kind: str, row_id: int) -> str:
+    payload = {"c": change_seq, "k": kind, "id": row_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_sync_token(token: str) -> tuple[int, str, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        change_seq, kind, row_id = payload["c"], payload["k"], payload["id"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as err:
+        raise BadRequestError("Invalid sync token") from err
+
+    if (
+        not isinstance(change_seq, int)
+        or not isinstance(row_id, int)
+        or kind not in (KIND_DELETED, KIND_UPSERTED)
+    ):
+        raise BadRequestError("Invalid sync token")
+    return change_seq, kind, row_id
+
+
+def _after_position(seq_column, id_column, kind: str, position: tuple[int, str, int]):
+    """某一分支中排在令牌位置之后的行，与 ORDER BY (change_seq, kind, id) 一致。
+
+    统一写成 ``change_seq >= s AND ...`` 的形式，让 (workspace_id, change_seq) 索引做范围扫描。
+    """
+    change_seq, token_kind, row_id = position
+    if kind > token_kind:
+        return seq_column >= change_seq
+    if kind < token_kind:
+        return seq_column > change_seq
+    return and_(seq_column >= change_seq, or_(seq_column > change_seq, id_column > row_id))
+
+
+async def list_task_changes(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    user_id: int,
+    since: str | None,
+    limit: int,
+) -> dict[str, Any]:
+    await require_workspace_read_role(db, workspace_id, user_id)
+    position = _decode_sync_token(since) if since else _STREAM_START
+
+    # 每个分支先按索引顺序各取 limit + 1 行，合并后只需对至多 2 * (limit + 1) 行排序
+    upserted = (
+        select(
+            Task.change_seq.label("change_seq"),
+            literal(KIND_UPSERTED).label("kind"),
+            Task.id.label("row_id"),
+            Task.id.label("task_id"),
+        )
+        .where(
+            Task.workspace_id == workspace_id,
+            _after_position(Task.change_seq, Task.id, KIND_UPSERTED, position),
+        )
+        .order_by(Task.change_seq, Task.id)
+        .limit(limit + 1)
+        .subquery()
+    )
+    deleted = (
+        select(
+            TaskTombstone.change_seq.label("change_seq"),
+            literal(KIND_DELETED).label("kind"),
+            TaskTombstone.id.label("row_id"),
+            TaskTombstone.task_id.label("task_id"),
+        )
+        .where(
+            TaskTombstone.workspace_id == workspace_id,
+            _after_position(TaskTombstone.change_seq, TaskTombstone.id, KIND_DELETED, position),
+        )
+        .order_by(TaskTombstone.change_seq, TaskTombstone.id)
+        .limit(limit + 1)
+        .subquery()
+    )
+    stream = union_all(select(upserted), select(deleted)).subquery()
+    result = await db.execute(
+        select(stream)
+        .order_by(stream.c.change_seq, stream.c.kind, stream.c.row_id)
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    upserted_ids = [row.task_id for row in rows if row.kind == KIND_UPSERTED]
+    items: list[Task] = []
+    if upserted_ids:
+        task_result = await db.execute(
+            select(Task).where(Task.id.in_(upserted_ids)).order_by(Task.change_seq, Task.id)
+        )
+        items = list(task_result.scalars().all())
+
+    if rows:
+        last = rows[-1]
+        next_token = _encode_sync_token(last.change_seq, last.kind, last.row_id)
+    else:
+        next_token = since or _encode_sync_token(*_STREAM_START)
+
+    return {
+        "items": items,
+        "deleted": [row.task_id for row in rows if row.kind == KIND_DELETED],
+        "next_token": next_token,
+        "has_more": has_more,
+    }
@@ -1,12 +1,20 @@
-from sqlalchemy import select
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import ForbiddenError, NotFoundError
 from app.models.task import Task
 from app.models.task_comment import TaskComment
-from app.schemas.comment import CommentCreate, CommentUpdate
+from app.schemas.comment import CommentCreate, CommentResponse, CommentUpdate
+from app.serialization import response_columns
 from app.services.audit import log_action
-from app.services.permissions import ADMIN_ROLES, require_workspace_membership
+from app.services.permissions import (
+    ADMIN_ROLES,
+    require_workspace_membership,
+    require_workspace_read_role,
+)
 
 
 async def _get_task(
@@ -68,19 +76,20 @@ async def list_comments(
     workspace_id: int,
     task_id: int,
     user_id: int,
-) -> list[TaskComment]:
-    await require_workspace_membership(db, workspace_id, user_id)
+) -> Sequence[Row[Any]]:
+    await require_workspace_read_role(db, workspace_id, user_id)
     await _get_task(db, workspace_id=workspace_id, task_id=task_id)
 
+    # 只读列表按列查询：返回 Row，不构造 ORM 对象、不进入 identity map
     result = await db.execute(
-        select(TaskComment)
+        select(*response_columns(TaskComment.__table__, CommentResponse))
         .where(
             TaskComment.workspace_id == workspace_id,
             TaskComment.task_id == task_id,
         )
         .order_by(TaskComment.created_at.asc(), TaskComment.id.asc())
     )
-    return list(result.scalars().all())
+    return result.all()
 
 
 async def update_comment(
@@ -0,0 +1,43 @@
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.events import Subscription, broker, format_sse
+from app.services.permissions import require_workspace_read_role
+
+
+async def subscribe_workspace_events(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    user_id: int,
+) -> Subscription:
+    """只在订阅时校验一次成员关系。"""
+    await require_workspace_read_role(db, workspace_id, user_id)
+    # SSE 连接可能保持数小时，校验完立即归还数据库连接，避免占满连接池
+    await db.close()
+    return broker.subscribe(workspace_id)
+
+
+async def stream_events(
+    subscription: Subscription,
+    *,
+    heartbeat_seconds: float,
+    is_disconnected: Callable[[], Awaitable[bool]],
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {int(heartbeat_seconds * 1000)}\n\n"
+        while True:
+            try:
+                payload = await subscription.get(heartbeat_seconds)
+            except TimeoutError:
+                if await is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+
+            yield format_sse(payload)
+            if payload is None:
+                break
+    finally:
+        broker.unsubscribe(subscription)
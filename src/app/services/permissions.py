@@ -1,43 +1,146 @@
-from sqlalchemy import select
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import InvalidationLog, TTLCache
+from app.config import settings
 from app.exceptions import ForbiddenError, NotFoundError
+from app.metrics import Counter, registry
+from app.models.user import User
 from app.models.workspace_membership import WorkspaceMembership
+from app.user_invalidation import mark_user_changed
 
 ADMIN_ROLES = {"owner", "admin"}
 
+# 本次请求 token 中已核验的工作区角色，存放在请求级会话的 info 里
+_CLAIMED_ROLES_KEY = "claimed_workspace_roles"
+
+
+def use_claimed_roles(
+    db: AsyncSession,
+    user_id: int,
+    workspace_roles: Mapping[int, str] | None,
+) -> None:
+    """登记当前用户在 token 中声明、且成员纪元已核对过的工作区角色。"""
+    if workspace_roles is None:
+        db.info.pop(_CLAIMED_ROLES_KEY, None)
+    else:
+        db.info[_CLAIMED_ROLES_KEY] = (user_id, workspace_roles)
+
+
+@dataclass(frozen=True, slots=True)
+class Membership:
+    """成员关系的只读快照；与会话无关，可以跨请求缓存。"""
+
+    workspace_id: int
+    user_id: int
+    role: str
+
+
+# 成员关系解析：同一请求内按 (workspace_id, user_id) 记住结果（包括"不是成员"），
+# 同一次请求里重复的校验（如 create_task 的操作者与负责人、标签与关注者）不再重复查询；
+# 可选的跨请求缓存只保存"是成员"的结果，成员增删改提交后立即失效；
+# 条目带着查库前的时刻，查询期间发生的失效不会被并发请求写回的旧结果掩盖。
+_MEMO_KEY = "workspace_memberships"
+
+_membership_cache: TTLCache[tuple[int, int], tuple[float, Membership]] = TTLCache(
+    max_entries=settings.MEMBERSHIP_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+_membership_invalidations: InvalidationLog[tuple[int, int]] = InvalidationLog()
+
+MEMBERSHIP_LOOKUPS = registry.register(
+    Counter(
+        "membership_lookups_total",
+        "Workspace membership lookups by where they were answered",
+        ["source"],
+    )
+)
+
+
+def invalidate_membership(db: AsyncSession, workspace_id: int, user_id: int) -> None:
+    """成员关系变化后调用（在提交之后），清掉本请求与跨请求的缓存结果。"""
+    key = (workspace_id, user_id)
+    db.info.get(_MEMO_KEY, {}).pop(key, None)
+    _membership_invalidations.invalidate(
+        key, retention_seconds=settings.MEMBERSHIP_CACHE_TTL_SECONDS
+    )
+    _membership_cache.pop(key)
+
 
 async def get_workspace_membership(
     db: AsyncSession,
     workspace_id: int,
     user_id: int,
-) -> WorkspaceMembership | None:
-    result = await db.execute(
-        select(WorkspaceMembership).where(
-            WorkspaceMembership.workspace_id == workspace_id,
-            WorkspaceMembership.user_id == user_id,
+) -> Membership | None:
+    key = (workspace_id, user_id)
+    memo: dict[tuple[int, int], Membership | None] = db.info.setdefault(_MEMO_KEY, {})
+    if key in memo:
+        MEMBERSHIP_LOOKUPS.inc("request")
+        return memo[key]
+
+    membership = None
+    cached = _membership_cache.get(key)
+    if cached is not None and _membership_invalidations.is_current(key, cached[0]):
+        membership = cached[1]
+        MEMBERSHIP_LOOKUPS.inc("shared")
+    else:
+        MEMBERSHIP_LOOKUPS.inc("database")
+        checked_at = time.monotonic()
+        result = await db.execute(
+            select(WorkspaceMembership.role).where(
+                WorkspaceMembership.workspace_id == workspace_id,
+                WorkspaceMembership.user_id == user_id,
+            )
         )
-    )
-    return result.scalar_one_or_none()
+        role = result.scalar_one_or_none()
+        if role is not None:
+            membership = Membership(workspace_id=workspace_id, user_id=user_id, role=role)
+            ttl_seconds = settings.MEMBERSHIP_CACHE_TTL_SECONDS - (time.monotonic() - checked_at)
+            _membership_cache.set(key, (checked_at, membership), ttl_seconds=ttl_seconds)
+    memo[key] = membership
+    return membership
 
 
 async def require_workspace_membership(
     db: AsyncSession,
     workspace_id: int,
     user_id: int,
-) -> WorkspaceMembership:
+) -> Membership:
     membership = await get_workspace_membership(db, workspace_id, user_id)
     if membership is None:
         raise NotFoundError("Workspace not found")
     return membership
 
 
+async def require_workspace_read_role(
+    db: AsyncSession,
+    workspace_id: int,
+    user_id: int,
+) -> str:
+    """只读接口的成员校验，返回角色。
+
+    token 带有可信的角色声明时直接采用、不查库；声明里没有该工作区（如签发后才加入）时
+    回退到数据库。写操作始终用 ``require_workspace_membership`` 以数据库为准。
+    """
+    claimed = db.info.get(_CLAIMED_ROLES_KEY)
+    if claimed is not None and claimed[0] == user_id:
+        role = claimed[1].get(workspace_id)
+        if role is not None:
+            return role
+    membership = await require_workspace_membership(db, workspace_id, user_id)
+    return membership.role
+
+
 async def require_workspace_role(
     db: AsyncSession,
     workspace_id: int,
     user_id: int,
     allowed_roles: set[str],
-) -> WorkspaceMembership:
+) -> Membership:
     membership = await require_workspace_membership(db, workspace_id, user_id)
     if membership.role not in allowed_roles:
         raise ForbiddenError("Insufficient permissions")
@@ -48,7 +151,7 @@ async def ensure_user_in_workspace(
     db: AsyncSession,
     workspace_id: int,
     user_id: int,
-) -> WorkspaceMembership:
+) -> Membership:
     membership = await get_workspace_membership(db, workspace_id, user_id)
     if membership is None:
         raise NotFoundError("User not in workspace")
@@ -71,5 +174,25 @@ async def count_role_members(
     return int(result.scalar_one())
 
 
+async def list_user_workspace_roles(db: AsyncSession, user_id: int) -> dict[int, str]:
+    result = await db.execute(
+        select(WorkspaceMembership.workspace_id, WorkspaceMembership.role).where(
+            WorkspaceMembership.user_id == user_id
+        )
+    )
+    return {workspace_id: role for workspace_id, role in result.all()}
+
+
+async def bump_membership_epoch(db: AsyncSession, user_id: int) -> None:
+    """成员关系变化后使该用户 token 中的角色声明作废；随调用方的事务一起提交。"""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(membership_epoch=User.membership_epoch + 1)
+    )
+    # Core UPDATE 不触发 User 的 mapper 事件，手动登记，提交后再使缓存失效
+    mark_user_changed(db.sync_session, user_id)
+
+
 def is_owner_or_admin(role: str) -> bool:
     return role in ADMIN_ROLES
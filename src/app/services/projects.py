@@ -1,13 +1,19 @@
-from sqlalchemy import select
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Row, delete, insert, literal, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.exceptions import ConflictError, NotFoundError
 from app.models.project import Project
-from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.models.task import Task
+from app.models.task_tombstone import TaskTombstone
+from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
 from app.schemas.workspace import RoleEnum
+from app.serialization import response_columns
 from app.services.audit import log_action
-from app.services.permissions import require_workspace_membership, require_workspace_role
+from app.services.permissions import require_workspace_read_role, require_workspace_role
 
 
 async def create_project(
@@ -58,15 +64,16 @@ async def list_projects(
     *,
     workspace_id: int,
     user_id: int,
-) -> list[Project]:
-    await require_workspace_membership(db, workspace_id, user_id)
+) -> Sequence[Row[Any]]:
+    await require_workspace_read_role(db, workspace_id, user_id)
 
+    # 只读列表按列查询：返回 Row，不构造 ORM 对象、不进入 identity map
     result = await db.execute(
-        select(Project)
+        select(*response_columns(Project.__table__, ProjectResponse))
         .where(Project.workspace_id == workspace_id)
         .order_by(Project.created_at.desc(), Project.id.desc())
     )
-    return list(result.scalars().all())
+    return result.all()
 
 
 async def get_project(
@@ -76,7 +83,7 @@ async def get_project(
     project_id: int,
     user_id: int,
 ) -> Project:
-    await require_workspace_membership(db, workspace_id, user_id)
+    await require_workspace_read_role(db, workspace_id, user_id)
 
     result = await db.execute(
         select(Project).where(
@@ -163,7 +170,7 @@ async def delete_project(
     if project is None:
         raise NotFoundError("Project not found")
 
-    await log_action(
+    change_seq = await log_action(
         db,
         actor_user_id=actor_user_id,
         workspace_id=workspace_id,
@@ -173,5 +180,22 @@ async def delete_project(
         changes={"name": project.name},
     )
 
+    # 显式删除项目下的任务并留下墓碑，增量同步才能下发这些删除（不依赖 SQLite 外键级联是否开启）
+    project_tasks = select(Task.workspace_id, Task.id, literal(change_seq)).where(
+        Task.workspace_id == workspace_id,
+        Task.project_id == project_id,
+    )
+    await db.execute(
+        insert(TaskTombstone).from_select(
+            ["workspace_id", "task_id", "change_seq"],
+            project_tasks,
+        )
+    )
+    await db.execute(
+        delete(Task)
+        .where(Task.workspace_id == workspace_id, Task.project_id == project_id)
+        .execution_options(synchronize_session=False)
+    )
+
     await db.delete(project)
     await db.commit()
@@ -0,0 +1,122 @@
+"""工作区内的全文检索。
+
+索引是迁移 ``d5a3f8e1b240`` 建立的两张 FTS5 external content 表
+（``tasks_fts``、``task_comments_fts``），由触发器与源表保持同步，
+因此任何写入路径都不需要额外维护索引。
+"""
+
+import html
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import BadRequestError
+from app.schemas.search import SearchHitType
+from app.services.permissions import require_workspace_read_role
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_TOKENS = 12
+
+# snippet() 先用私有区字符标出命中位置，转义正文后再换成 <mark>，避免正文中的 HTML 原样输出
+_SENTINEL_OPEN = "\ue000"
+_SENTINEL_CLOSE = "\ue001"
+
+# 标题命中的权重高于描述
+TASK_COLUMN_WEIGHTS = (10.0, 1.0)
+
+_WORD = re.compile(r"\w+(\*?)")
+
+_TASK_HITS = f"""
+    SELECT 'task' AS type, t.id AS task_id, NULL AS comment_id, t.project_id, t.title,
+        snippet(tasks_fts, -1, :open, :close, '…', :tokens) AS snippet,
+        -bm25(tasks_fts, {TASK_COLUMN_WEIGHTS[0]}, {TASK_COLUMN_WEIGHTS[1]}) AS score
+    FROM tasks_fts
+    JOIN tasks AS t ON t.id = tasks_fts.rowid
+    WHERE tasks_fts MATCH :match AND t.workspace_id = :workspace_id"""
+
+_COMMENT_HITS = """
+    SELECT 'comment' AS type, t.id AS task_id, c.id AS comment_id, t.project_id, t.title,
+        snippet(task_comments_fts, 0, :open, :close, '…', :tokens) AS snippet,
+        -bm25(task_comments_fts) AS score
+    FROM task_comments_fts
+    JOIN task_comments AS c ON c.id = task_comments_fts.rowid
+    JOIN tasks AS t ON t.id = c.task_id AND t.workspace_id = c.workspace_id
+    WHERE task_comments_fts MATCH :match AND c.workspace_id = :workspace_id"""
+
+
+FTS_TABLES = ("tasks_fts", "task_comments_fts")
+
+
+async def rebuild_search_index(db: AsyncSession) -> None:
+    """按源表整体重建 FTS 索引（调用方负责提交）。"""
+    for table in FTS_TABLES:
+        await db.execute(text(f"INSERT INTO {table} ({table}) VALUES ('rebuild')"))
+
+
+def render_snippet(raw: str) -> str:
+    """HTML 转义 FTS5 返回的片段，只保留本服务加上的 ``<mark>`` 标记。"""
+    return (
+        html.escape(raw)
+        .replace(_SENTINEL_OPEN, SNIPPET_OPEN)
+        .replace(_SENTINEL_CLOSE, SNIPPET_CLOSE)
+    )
+
+
+def build_match_query(raw: str) -> str:
+    """把用户输入转换成安全的 FTS5 查询：每个词加引号后按 AND 组合，``词*`` 表示前缀匹配。
+
+    只保留单词字符，引号、括号、``NEAR`` 等 FTS5 语法不会被解释，
+    任意输入都不会触发语法错误。
+    """
+    terms = [
+        f'"{match.group(0).rstrip("*")}"{match.group(1)}' for match in _WORD.finditer(raw)
+    ]
+    if not terms:
+        raise BadRequestError("Search query must contain at least one word")
+    return " ".join(terms)
+
+
+async def search_workspace(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    user_id: int,
+    query: str,
+    hit_type: SearchHitType | None,
+    skip: int,
+    limit: int,
+) -> list[dict]:
+    """按 bm25 相关度（``score`` 越大越相关）返回任务与评论的命中结果。"""
+    await require_workspace_read_role(db, workspace_id, user_id)
+    match = build_match_query(query)
+
+    if hit_type == SearchHitType.task:
+        selects = [_TASK_HITS]
+    elif hit_type == SearchHitType.comment:
+        selects = [_COMMENT_HITS]
+    else:
+        selects = [_TASK_HITS, _COMMENT_HITS]
+
+    statement = text(
+        "\n    UNION ALL".join(selects)
+        + "\n    ORDER BY score DESC, task_id DESC, comment_id DESC"
+        + "\n    LIMIT :limit OFFSET :skip"
+    )
+    result = await db.execute(
+        statement,
+        {
+            "match": match,
+            "workspace_id": workspace_id,
+            "open": _SENTINEL_OPEN,
+            "close": _SENTINEL_CLOSE,
+            "tokens": SNIPPET_TOKENS,
+            "limit": limit,
+            "skip": skip,
+        },
+    )
+    hits = [dict(row) for row in result.mappings()]
+    for hit in hits:
+        hit["snippet"] = render_snippet(hit["snippet"])
+    return hits
@@ -7,7 +7,7 @@ from app.models.task import Task
 from app.models.task_tag import TaskTag
 from app.schemas.comment import TagCreate
 from app.services.audit import log_action
-from app.services.permissions import require_workspace_membership
+from app.services.permissions import require_workspace_membership, require_workspace_read_role
 
 
 async def _require_task(
@@ -35,7 +35,7 @@ async def list_tags(
     task_id: int,
     actor_user_id: int,
 ) -> list[TaskTag]:
-    await require_workspace_membership(db, workspace_id, actor_user_id)
+    await require_workspace_read_role(db, workspace_id, actor_user_id)
     await _require_task(db, workspace_id=workspace_id, task_id=task_id)
     result = await db.execute(select(TaskTag).where(TaskTag.task_id == task_id))
     return list(result.scalars().all())
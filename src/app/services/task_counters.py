@@ -0,0 +1,149 @@
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.models.task_counter import UNASSIGNED, TaskCounter
+from app.schemas.task import TaskFilters, TaskStatus
+
+
+def counters_can_answer(filters: TaskFilters) -> bool:
+    """计数表只按 project/status/assignee 聚合，标签与截止时间过滤仍需扫描 ``tasks``。"""
+    return filters.tags is None and filters.due_at_from is None and filters.due_at_to is None
+
+
+async def count_tasks(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    filters: TaskFilters,
+) -> int:
+    """从计数表汇总任务数，不扫描 ``tasks``（调用前用 ``counters_can_answer`` 判断）。"""
+    query = select(func.coalesce(func.sum(TaskCounter.task_count), 0)).where(
+        TaskCounter.workspace_id == workspace_id
+    )
+    if filters.project_ids is not None:
+        query = query.where(TaskCounter.project_id.in_(filters.project_ids))
+    if filters.statuses is not None:
+        query = query.where(TaskCounter.status.in_([s.value for s in filters.statuses]))
+
+    if filters.assignee_ids is not None:
+        assignee_keys = list(filters.assignee_ids)
+        if filters.unassigned:
+            assignee_keys.append(UNASSIGNED)
+        query = query.where(TaskCounter.assignee_id.in_(assignee_keys))
+    elif filters.unassigned is not None:
+        query = query.where(
+            TaskCounter.assignee_id == UNASSIGNED
+            if filters.unassigned
+            else TaskCounter.assignee_id != UNASSIGNED
+        )
+
+    result = await db.execute(query)
+    return int(result.scalar_one())
+
+
+async def count_tasks_by_status(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    project_id: int | None = None,
+) -> dict[TaskStatus, int]:
+    query = (
+        select(TaskCounter.status, func.sum(TaskCounter.task_count))
+        .where(TaskCounter.workspace_id == workspace_id)
+        .group_by(TaskCounter.status)
+    )
+    if project_id is not None:
+        query = query.where(TaskCounter.project_id == project_id)
+
+    counts = dict.fromkeys(TaskStatus, 0)
+    for status_value, total in (await db.execute(query)).all():
+        counts[TaskStatus(status_value)] = int(total)
+    return counts
+
+
+def _expected_counts_query(workspace_id: int | None):
+    assignee_key = func.coalesce(Task.assignee_id, UNASSIGNED)
+    query = select(
+        Task.workspace_id,
+        Task.project_id,
+        Task.status,
+        assignee_key,
+        func.count(Task.id),
+    ).group_by(Task.workspace_id, Task.project_id, Task.status, assignee_key)
+    if workspace_id is not None:
+        query = query.where(Task.workspace_id == workspace_id)
+    return query
+
+
+async def verify_task_counters(
+    db: AsyncSession,
+    *,
+    workspace_id: int | None = None,
+) -> list[dict]:
+    """对比计数表与 ``tasks`` 的实际分组计数，返回所有不一致的 key。"""
+    expected = {
+        (ws_id, project_id, status, assignee): int(total)
+        for ws_id, project_id, status, assignee, total in (
+            await db.execute(_expected_counts_query(workspace_id))
+        ).all()
+    }
+
+    counter_query = select(
+        TaskCounter.workspace_id,
+        TaskCounter.project_id,
+        TaskCounter.status,
+        TaskCounter.assignee_id,
+        TaskCounter.task_count,
+    )
+    if workspace_id is not None:
+        counter_query = counter_query.where(TaskCounter.workspace_id == workspace_id)
+    actual = {
+        (ws_id, project_id, status, assignee): int(total)
+        for ws_id, project_id, status, assignee, total in (
+            await db.execute(counter_query)
+        ).all()
+    }
+
+    drift = []
+    for key in sorted(expected.keys() | actual.keys()):
+        expected_count = expected.get(key, 0)
+        actual_count = actual.get(key, 0)
+        if expected_count != actual_count:
+            ws_id, project_id, status, assignee = key
+            drift.append(
+                {
+                    "workspace_id": ws_id,
+                    "project_id": project_id,
+                    "status": status,
+                    "assignee_id": assignee,
+                    "expected": expected_count,
+                    "actual": actual_count,
+                }
+            )
+    return drift
+
+
+async def rebuild_task_counters(
+    db: AsyncSession,
+    *,
+    workspace_id: int | None = None,
+) -> None:
+    """按 ``tasks`` 重新生成计数表（调用方负责提交事务）。"""
+    clear = delete(TaskCounter)
+    if workspace_id is not None:
+        clear = clear.where(TaskCounter.workspace_id == workspace_id)
+    await db.execute(clear)
+
+    await db.execute(
+        insert(TaskCounter).from_select(
+            [
+                TaskCounter.workspace_id,
+                TaskCounter.project_id,
+                TaskCounter.status,
+                TaskCounter.assignee_id,
+                TaskCounter.task_count,
+            ],
+            _expected_counts_query(workspace_id),
+        )
+    )
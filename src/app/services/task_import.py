@@ -0,0 +1,211 @@
+"""任务批量导入：边读上传内容边校验，按块 executemany 写入。
+
+项目与成员集合只查询一次；每块写入一条汇总审计记录并单独提交，已提交的块不会因为后续
+行出错而回滚，出错的行逐条返回行号与原因。
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.exceptions import BadRequestError, NotFoundError
+from app.models.project import Project
+from app.models.task import Task
+from app.models.workspace_membership import WorkspaceMembership
+from app.schemas.task import TaskFileFormat, TaskImportRow
+from app.services.audit import log_action
+from app.services.permissions import require_workspace_membership
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_no = 0
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                line_no += 1
+                yield line_no, line + "\n"
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as err:
+        raise BadRequestError("Import file must be UTF-8 encoded") from err
+    if pending:
+        yield line_no + 1, pending
+
+
+async def _iter_records(
+    chunks: AsyncIterator[bytes],
+    import_format: TaskFileFormat,
+) -> AsyncIterator[tuple[int, Any]]:
+    """产出 (起始行号, 原始记录)；无法解析的记录以异常对象代替。"""
+    if import_format == TaskFileFormat.ndjson:
+        async for line_no, line in _iter_lines(chunks):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as err:
+                yield line_no, err
+        return
+
+    header: list[str] | None = None
+    record, start = "", 0
+    async for line_no, line in _iter_lines(chunks):
+        if not record:
+            start = line_no
+        record += line
+        # 引号成对出现才说明记录结束，带换行的引号字段会跨多个物理行
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as err:
+            yield start, ValueError(str(err))
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, ValueError(f"expected {len(header)} columns, got {len(values)}")
+            continue
+        # CSV 没有 null，空字符串按未提供处理
+        yield start, {name: value for name, value in zip(header, values, strict=True) if value}
+    if record:
+        yield start, ValueError("unterminated quoted field")
+
+
+def _describe(err: Exception) -> str:
+    if isinstance(err, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in err.errors()
+        )
+    return str(err) or type(err).__name__
+
+
+async def _insert_chunk(
+    db: AsyncSession,
+    rows: list[dict[str, Any]],
+    *,
+    workspace_id: int,
+    project_id: int,
+    actor_user_id: int,
+    lines: tuple[int, int],
+) -> None:
+    change_seq = await log_action(
+        db,
+        actor_user_id=actor_user_id,
+        workspace_id=workspace_id,
+        entity_type="project",
+        entity_id=project_id,
+        action="import_tasks",
+        changes={"created": len(rows), "first_line": lines[0], "last_line": lines[1]},
+    )
+    for row in rows:
+        row["change_seq"] = change_seq
+    await db.execute(insert(Task), rows)
+    await db.commit()
+
+
+async def import_tasks(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    project_id: int,
+    actor_user_id: int,
+    import_format: TaskFileFormat,
+    chunks: AsyncIterator[bytes],
+) -> dict[str, Any]:
+    await require_workspace_membership(db, workspace_id, actor_user_id)
+
+    project_result = await db.execute(
+        select(Project.id).where(
+            Project.workspace_id == workspace_id,
+            Project.id == project_id,
+        )
+    )
+    if project_result.scalar_one_or_none() is None:
+        raise NotFoundError("Project not found")
+
+    member_result = await db.execute(
+        select(WorkspaceMembership.user_id).where(
+            WorkspaceMembership.workspace_id == workspace_id
+        )
+    )
+    member_ids = set(member_result.scalars().all())
+    # 读取上传内容期间不持有读事务
+    await db.commit()
+
+    created = failed = 0
+    errors: list[dict[str, Any]] = []
+    rows: list[dict[str, Any]] = []
+    first_line = last_line = 0
+
+    async for line_no, raw in _iter_records(chunks, import_format):
+        try:
+            if isinstance(raw, Exception):
+                raise raw
+            if not isinstance(raw, dict):
+                raise ValueError("record must be a JSON object")
+            data = TaskImportRow.model_validate(raw)
+            if data.assignee_id is not None and data.assignee_id not in member_ids:
+                raise ValueError("assignee_id: User not in workspace")
+        except (ValidationError, ValueError) as err:
+            failed += 1
+            if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({"line": line_no, "detail": _describe(err)})
+            continue
+
+        if not rows:
+            first_line = line_no
+        last_line = line_no
+        rows.append(
+            {
+                "workspace_id": workspace_id,
+                "project_id": project_id,
+                "title": data.title,
+                "description": data.description,
+                "status": data.status.value,
+                "creator_id": actor_user_id,
+                "assignee_id": data.assignee_id,
+                "due_at": data.due_at,
+            }
+        )
+        if len(rows) >= IMPORT_CHUNK_SIZE:
+            await _insert_chunk(
+                db,
+                rows,
+                workspace_id=workspace_id,
+                project_id=project_id,
+                actor_user_id=actor_user_id,
+                lines=(first_line, last_line),
+            )
+            created += len(rows)
+            rows = []
+
+    if rows:
+        await _insert_chunk(
+            db,
+            rows,
+            workspace_id=workspace_id,
+            project_id=project_id,
+            actor_user_id=actor_user_id,
+            lines=(first_line, last_line),
+        )
+        created += len(rows)
+
+    return {"created": created, "failed": failed, "errors": errors}
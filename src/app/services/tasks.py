@@ -1,29 +1,76 @@
-from datetime import datetime
+import base64
+import binascii
+import json
+import re
+from typing import Any
 
 from fastapi import status
-from sqlalchemy import func, select
+from sqlalchemy import (
+    DateTime,
+    String,
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    type_coerce,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only
 
-from app.exceptions import BadRequestError, ConflictError, ForbiddenError, NotFoundError
+from app.cache import TTLCache, VersionedBytesCache
+from app.config import settings
+from app.etags import if_match_candidates, if_match_hits, make_etag
+from app.exceptions import (
+    STATUS_CODES,
+    AppError,
+    BadRequestError,
+    ConflictError,
+    ForbiddenError,
+    NotFoundError,
+    PreconditionFailedError,
+)
 from app.models.project import Project
 from app.models.task import Task
+from app.models.task_comment import TaskComment
 from app.models.task_tag import TaskTag
+from app.models.task_tombstone import TaskTombstone
+from app.models.task_watcher import TaskWatcher
+from app.models.workspace_membership import WorkspaceMembership
+from app.schemas.common import TotalMode
 from app.schemas.task import (
     SortOrder,
+    TagMode,
+    TaskBatchCreate,
+    TaskBatchOperation,
+    TaskBatchTransition,
+    TaskBatchUpdate,
+    TaskBulkPatch,
     TaskCreate,
+    TaskExpand,
+    TaskFilters,
     TaskResponse,
     TaskSortBy,
     TaskStatus,
     TaskStatusTransition,
     TaskUpdate,
+    task_response_model,
 )
-from app.services.audit import log_action
+from app.serialization import response_columns
+from app.services.audit import log_action, log_bulk_action
+from app.services.changes import bump_change_seq
 from app.services.idempotency import build_request_hash, get_replay_response, save_response
 from app.services.permissions import (
     ADMIN_ROLES,
     ensure_user_in_workspace,
     require_workspace_membership,
+    require_workspace_read_role,
+    require_workspace_role,
 )
+from app.services.task_counters import count_tasks, count_tasks_by_status, counters_can_answer
 
 ALLOWED_TRANSITIONS: dict[TaskStatus, set[TaskStatus]] = {
     TaskStatus.todo: {TaskStatus.in_progress},
@@ -40,6 +87,71 @@ SORT_COLUMNS = {
     TaskSortBy.id: Task.id,
 }
 
+_count_cache: TTLCache[tuple, int] = TTLCache(
+    max_entries=settings.TASK_COUNT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TASK_COUNT_CACHE_TTL_SECONDS,
+    name="task_counts",
+)
+
+# 序列化好的任务列表页，键以集合 ETag（工作区 id + 变更序号）开头
+task_page_cache: VersionedBytesCache[tuple] = VersionedBytesCache(
+    max_bytes=settings.TASK_LIST_CACHE_MAX_BYTES,
+    name="task_list_pages",
+)
+
+
+def _sort_key(sort_column):
+    """游标比较使用列的原始存储值。
+
+    SQLite 中 DateTime 以文本存储，且 ``server_default=func.now()`` 写入的值不带微秒，
+    若按 Python datetime 绑定参数比较会漏掉同一秒内的行，因此按文本直接比较。
+    """
+    if isinstance(sort_column.type, DateTime):
+        return type_coerce(sort_column, String)
+    return sort_column
+
+
+def _encode_cursor(
+    sort_by: TaskSortBy,
+    sort_order: SortOrder,
+    value: Any,
+    task_id: int,
+) -> str:
+    payload = {"s": sort_by.value, "o": sort_order.value, "v": value, "id": task_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: TaskSortBy, sort_order: SortOrder) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, task_id = payload["v"], payload["id"]
+        if payload["s"] != sort_by.value or payload["o"] != sort_order.value:
+            raise BadRequestError("Cursor does not match sort parameters")
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as err:
+        raise BadRequestError("Invalid cursor") from err
+
+    if not isinstance(task_id, int) or not isinstance(value, str | int | None):
+        raise BadRequestError("Invalid cursor")
+    return value, task_id
+
+
+def _keyset_condition(sort_column, sort_order: SortOrder, value: Any, last_id: int):
+    """构造"排在游标之后"的条件，与 ORDER BY (sort_column, Task.id) 保持一致。
+
+    SQLite 将 NULL 视为最小值：升序时 NULL 在最前，降序时 NULL 在最后。
+    """
+    key = _sort_key(sort_column)
+    if sort_order == SortOrder.asc:
+        if value is None:
+            return or_(and_(sort_column.is_(None), Task.id > last_id), sort_column.is_not(None))
+        return or_(key > value, and_(key == value, Task.id > last_id))
+
+    if value is None:
+        return and_(sort_column.is_(None), Task.id < last_id)
+    return or_(key < value, and_(key == value, Task.id < last_id), sort_column.is_(None))
+
 
 def _can_manage_task(task: Task, role: str, user_id: int) -> bool:
     if role in ADMIN_ROLES:
@@ -47,50 +159,464 @@ def _can_manage_task(task: Task, role: str, user_id: int) -> bool:
     return task.creator_id == user_id or task.assignee_id == user_id
 
 
+def task_etag(task_id: int, version: int, *, weak: bool = False) -> str:
+    """任务的 ETag：``version`` 在每次更新/流转时递增，(id, version) 唯一确定内容。
+
+    完整表示用强 ETag；``fields`` 精简后的响应字节不同，用同名弱 ETag。
+    """
+    return make_etag(f"task-{task_id}-v{version}", weak=weak)
+
+
+def _check_task_preconditions(task: Task, *, version: int | None, if_match: str | None) -> None:
+    if if_match is not None and not if_match_hits(if_match, task_etag(task.id, task.version)):
+        raise PreconditionFailedError("Task has been modified")
+    if version is not None and version != task.version:
+        raise ConflictError("Task version conflict")
+
+
+_TASK_ETAG = re.compile(r'"task-(\d+)-v(\d+)"')
+
+
+def _task_write_conditions(
+    *,
+    workspace_id: int,
+    task_id: int,
+    role: str,
+    actor_user_id: int,
+    version: int | None,
+    if_match: str | None,
+) -> list:
+    """把权限与版本前置条件翻译成 WHERE 条件，由一条 UPDATE/DELETE 原子地比较并写入。"""
+    conditions = [Task.workspace_id == workspace_id, Task.id == task_id]
+    if role not in ADMIN_ROLES:
+        conditions.append(or_(Task.creator_id == actor_user_id, Task.assignee_id == actor_user_id))
+    if version is not None:
+        conditions.append(Task.version == version)
+    if if_match is not None:
+        candidates = if_match_candidates(if_match)
+        if candidates is not None:
+            versions = [
+                int(match.group(2))
+                for match in map(_TASK_ETAG.fullmatch, candidates)
+                if match is not None and int(match.group(1)) == task_id
+            ]
+            conditions.append(Task.version.in_(versions))
+    return conditions
+
+
+async def _load_checked_task(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    task_id: int,
+    role: str,
+    actor_user_id: int,
+    version: int | None,
+    if_match: str | None,
+    assignee_id: int | None = None,
+) -> Task:
+    """按单个接口的顺序逐项校验（404 → 403 → 412 → 409 → 指派人），返回任务。
+
+    条件写入没有命中任何行时用它给出准确的错误。
+    """
+    task = await _get_task_scoped(db, workspace_id=workspace_id, task_id=task_id)
+    if task is None:
+        raise NotFoundError("Task not found")
+    if not _can_manage_task(task, role, actor_user_id):
+        raise ForbiddenError("Insufficient permissions")
+    _check_task_preconditions(task, version=version, if_match=if_match)
+    if assignee_id is not None:
+        await ensure_user_in_workspace(db, workspace_id, assignee_id)
+    return task
+
+
+def parse_task_fields(raw: str | None) -> frozenset[str] | None:
+    """解析 ``fields=title,status`` 形式的字段列表；``id`` 总是包含在内。"""
+    if raw is None:
+        return None
+
+    fields = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = fields - TaskResponse.model_fields.keys()
+    if unknown:
+        raise BadRequestError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+    return frozenset(fields | {"id"})
+
+
+def parse_task_expand(raw: str | None) -> frozenset[TaskExpand]:
+    """解析 ``expand=tags,watchers,comment_count`` 形式的关联列表。"""
+    if raw is None:
+        return frozenset()
+
+    names = {name.strip() for name in raw.split(",") if name.strip()}
+    known = {relation.value for relation in TaskExpand}
+    unknown = names - known
+    if unknown:
+        raise BadRequestError(f"Unknown task expansions: {', '.join(sorted(unknown))}")
+    return frozenset(TaskExpand(name) for name in names)
+
+
+async def load_task_expansions(
+    db: AsyncSession,
+    *,
+    task_ids: list[int],
+    expand: frozenset[TaskExpand],
+) -> dict[TaskExpand, dict[int, Any]]:
+    """为一页任务批量加载关联数据：每种关联一条 ``IN (...)`` 查询。
+
+    调用方负责在此之前完成 workspace 权限校验（任务本身已按 workspace 过滤）。
+    返回值对每个任务都有条目，没有关联行的任务得到空列表或 0。
+    """
+    expansions: dict[TaskExpand, dict[int, Any]] = {}
+    if not expand:
+        return expansions
+
+    if TaskExpand.tags in expand:
+        tags: dict[int, list[TaskTag]] = {task_id: [] for task_id in task_ids}
+        if task_ids:
+            tag_rows = await db.scalars(
+                select(TaskTag)
+                .where(TaskTag.task_id.in_(task_ids))
+                .order_by(TaskTag.task_id, TaskTag.id)
+            )
+            for tag in tag_rows:
+                tags[tag.task_id].append(tag)
+        expansions[TaskExpand.tags] = tags
+
+    if TaskExpand.watchers in expand:
+        watchers: dict[int, list[TaskWatcher]] = {task_id: [] for task_id in task_ids}
+        if task_ids:
+            watcher_rows = await db.scalars(
+                select(TaskWatcher)
+                .where(TaskWatcher.task_id.in_(task_ids))
+                .order_by(TaskWatcher.task_id, TaskWatcher.id)
+            )
+            for watcher in watcher_rows:
+                watchers[watcher.task_id].append(watcher)
+        expansions[TaskExpand.watchers] = watchers
+
+    if TaskExpand.comment_count in expand:
+        comment_counts = dict.fromkeys(task_ids, 0)
+        if task_ids:
+            count_rows = await db.execute(
+                select(TaskComment.task_id, func.count(TaskComment.id))
+                .where(TaskComment.task_id.in_(task_ids))
+                .group_by(TaskComment.task_id)
+            )
+            for task_id, comment_count in count_rows.all():
+                comment_counts[task_id] = int(comment_count)
+        expansions[TaskExpand.comment_count] = comment_counts
+
+    return expansions
+
+
+def _load_fields(fields: frozenset[str] | None) -> list:
+    """只加载请求的列；其余列访问时直接报错，避免在异步会话中触发隐式懒加载。"""
+    if fields is None:
+        return []
+    return [load_only(*(getattr(Task, name) for name in sorted(fields)), raiseload=True)]
+
+
 async def _get_task_scoped(
     db: AsyncSession,
     *,
     workspace_id: int,
     task_id: int,
+    fields: frozenset[str] | None = None,
 ) -> Task | None:
     result = await db.execute(
-        select(Task).where(
+        select(Task)
+        .where(
             Task.workspace_id == workspace_id,
             Task.id == task_id,
         )
+        .options(*_load_fields(fields))
     )
     return result.scalar_one_or_none()
 
 
-def _apply_task_filters(
-    query,
+def _match_any(column, values: tuple) -> Any:
+    if len(values) == 1:
+        return column == values[0]
+    return column.in_(values)
+
+
+def apply_task_filters(query, filters: TaskFilters):
+    """将过滤条件统一应用到查询和计数查询上，避免重复构建。
+
+    每个条件都落在同一条 SQL 的 WHERE 中：多值用 IN，多标签用一次
+    ``task_tags`` 分组子查询（all 模式用 HAVING 计数求交集），而不是逐个 JOIN。
+    """
+    if filters.project_ids is not None:
+        query = query.where(_match_any(Task.project_id, filters.project_ids))
+
+    if filters.tags is not None:
+        tagged = select(TaskTag.task_id).where(_match_any(TaskTag.tag, filters.tags))
+        if filters.tag_mode == TagMode.all and len(filters.tags) > 1:
+            tagged = tagged.group_by(TaskTag.task_id).having(
+                func.count(TaskTag.id) == len(filters.tags)
+            )
+        query = query.where(Task.id.in_(tagged))
+
+    if filters.statuses is not None:
+        query = query.where(
+            _match_any(Task.status, tuple(status.value for status in filters.statuses))
+        )
+
+    if filters.assignee_ids is not None:
+        assigned = _match_any(Task.assignee_id, filters.assignee_ids)
+        if filters.unassigned:
+            assigned = or_(assigned, Task.assignee_id.is_(None))
+        query = query.where(assigned)
+    elif filters.unassigned is not None:
+        if filters.unassigned:
+            query = query.where(Task.assignee_id.is_(None))
+        else:
+            query = query.where(Task.assignee_id.is_not(None))
+
+    if filters.due_at_from is not None:
+        query = query.where(Task.due_at >= filters.due_at_from)
+
+    if filters.due_at_to is not None:
+        query = query.where(Task.due_at <= filters.due_at_to)
+
+    return query
+
+
+def _task_columns(fields: frozenset[str] | None) -> list:
+    """按响应字段顺序选列；``fields`` 为 None 时在后面补上其余列（看板按完整实体读取）。"""
+    columns = response_columns(Task.__table__, task_response_model(fields))
+    if fields is None:
+        names = {column.name for column in columns}
+        columns += [column for column in Task.__table__.c if column.name not in names]
+    return columns
+
+
+def build_task_list_queries(
     *,
-    status_filter: TaskStatus | None,
-    assignee_id: int | None,
-    project_id: int | None,
-    tag: str | None,
-    due_at_from: datetime | None,
-    due_at_to: datetime | None,
+    workspace_id: int,
+    sort_by: TaskSortBy,
+    sort_order: SortOrder,
+    filters: TaskFilters,
+    fields: frozenset[str] | None = None,
 ):
-    """将过滤条件统一应用到查询和计数查询上，避免重复构建。"""
-    if project_id is not None:
-        query = query.where(Task.project_id == project_id)
-    if tag is not None:
-        query = query.join(TaskTag, TaskTag.task_id == Task.id).where(TaskTag.tag == tag)
+    """构造任务列表的分页查询（已排序，未分页）和计数查询。
 
-    if status_filter is not None:
-        query = query.where(Task.status == status_filter.value)
+    只选取列（``fields`` 为 None 时是全部列）加排序键，结果是普通的 ``Row``，不构造 ORM 对象。
+    查询形状与 ``tasks``/``task_tags`` 上的索引一一对应，
+    ``tests/test_query_plans.py`` 会对这里产出的 SQL 做 EXPLAIN QUERY PLAN 回归。
+    """
+    sort_column = SORT_COLUMNS[sort_by]
+    base_query = select(*_task_columns(fields), _sort_key(sort_column).label("sort_key")).where(
+        Task.workspace_id == workspace_id
+    )
+    base_count = select(func.count(Task.id)).where(Task.workspace_id == workspace_id)
 
-    if assignee_id is not None:
-        query = query.where(Task.assignee_id == assignee_id)
+    query = apply_task_filters(base_query, filters)
+    count_query = apply_task_filters(base_count, filters)
+
+    if sort_order == SortOrder.asc:
+        query = query.order_by(sort_column.asc(), Task.id.asc())
+    else:
+        query = query.order_by(sort_column.desc(), Task.id.desc())
 
-    if due_at_from is not None:
-        query = query.where(Task.due_at >= due_at_from)
+    return query, count_query
 
-    if due_at_to is not None:
-        query = query.where(Task.due_at <= due_at_to)
 
-    return query
+async def _check_assignee(
+    db: AsyncSession,
+    workspace_id: int,
+    assignee_id: int,
+    member_ids: set[int] | None,
+) -> None:
+    """``member_ids`` 为预先加载的成员集合（批量接口）；为 None 时单独查询。"""
+    if member_ids is None:
+        await ensure_user_in_workspace(db, workspace_id, assignee_id)
+    elif assignee_id not in member_ids:
+        raise NotFoundError("User not in workspace")
+
+
+async def _add_task(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    project_id: int,
+    actor_user_id: int,
+    data: TaskCreate,
+) -> Task:
+    """单个与批量创建共用；调用方已完成校验，不提交事务。
+
+    ``INSERT ... RETURNING`` 一次拿回数据库生成的 id 与时间戳，不再 flush 后 refresh。
+    """
+    change_seq = await bump_change_seq(db, workspace_id)
+    result = await db.execute(
+        insert(Task)
+        .values(
+            workspace_id=workspace_id,
+            project_id=project_id,
+            title=data.title,
+            description=data.description,
+            status=TaskStatus.todo.value,
+            creator_id=actor_user_id,
+            assignee_id=data.assignee_id,
+            due_at=data.due_at,
+            version=1,
+            change_seq=change_seq,
+        )
+        .returning(Task)
+    )
+    task = result.scalar_one()
+
+    await log_action(
+        db,
+        actor_user_id=actor_user_id,
+        workspace_id=workspace_id,
+        entity_type="task",
+        entity_id=task.id,
+        action="create",
+        changes={
+            "project_id": project_id,
+            "title": data.title,
+            "assignee_id": data.assignee_id,
+            "due_at": data.due_at,
+        },
+        change_seq=change_seq,
+    )
+    return task
+
+
+# 以下 _apply_* 供批量接口使用：任务已在同一事务里整批加载，先完成全部校验再修改数据，
+# 因此抛出业务异常时会话中不会留下部分修改（并发冲突除外，见 _apply_task_update）；
+# 均不提交事务。
+
+
+async def _apply_task_update(
+    db: AsyncSession,
+    task: Task,
+    *,
+    role: str,
+    actor_user_id: int,
+    update_data: dict[str, Any],
+    version: int | None,
+    if_match: str | None,
+    member_ids: set[int] | None = None,
+) -> Task:
+    """返回更新后的任务；与 ``update_task`` 相同，写入是一条带前置条件的
+    ``UPDATE ... WHERE version = ? RETURNING``。"""
+    if not _can_manage_task(task, role, actor_user_id):
+        raise ForbiddenError("Insufficient permissions")
+
+    _check_task_preconditions(task, version=version, if_match=if_match)
+
+    if update_data.get("assignee_id") is not None:
+        await _check_assignee(db, task.workspace_id, update_data["assignee_id"], member_ids)
+
+    if not update_data:
+        return task
+
+    conditions = _task_write_conditions(
+        workspace_id=task.workspace_id,
+        task_id=task.id,
+        role=role,
+        actor_user_id=actor_user_id,
+        version=version,
+        if_match=if_match,
+    )
+    change_seq = await bump_change_seq(db, task.workspace_id)
+    result = await db.execute(
+        update(Task)
+        .where(*conditions)
+        .values(**update_data, version=Task.version + 1, change_seq=change_seq)
+        .returning(Task)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    updated = result.scalar_one_or_none()
+    if updated is None:
+        # 校验都已通过，说明任务在加载之后被并发写入修改；此时只多递增了一次变更序号
+        raise ConflictError("Task version conflict")
+
+    await log_action(
+        db,
+        actor_user_id=actor_user_id,
+        workspace_id=updated.workspace_id,
+        entity_type="task",
+        entity_id=updated.id,
+        action="update",
+        changes={
+            "changes": update_data,
+            "version_from": updated.version - 1,
+            "version_to": updated.version,
+        },
+        change_seq=change_seq,
+    )
+    return updated
+
+
+async def _apply_status_transition(
+    db: AsyncSession,
+    task: Task,
+    *,
+    role: str,
+    actor_user_id: int,
+    to_status: TaskStatus,
+    version: int | None,
+    if_match: str | None,
+) -> None:
+    if not _can_manage_task(task, role, actor_user_id):
+        raise ForbiddenError("Insufficient permissions")
+
+    _check_task_preconditions(task, version=version, if_match=if_match)
+
+    from_status = TaskStatus(task.status)
+    allowed = ALLOWED_TRANSITIONS[from_status]
+    if to_status not in allowed:
+        raise BadRequestError(f"Invalid status transition: {task.status} -> {to_status.value}")
+
+    previous_status = task.status
+    previous_version = task.version
+    task.status = to_status.value
+    task.version += 1
+
+    task.change_seq = await log_action(
+        db,
+        actor_user_id=actor_user_id,
+        workspace_id=task.workspace_id,
+        entity_type="task",
+        entity_id=task.id,
+        action="status_transition",
+        changes={
+            "from": previous_status,
+            "to": to_status.value,
+            "version_from": previous_version,
+            "version_to": task.version,
+        },
+    )
+
+
+async def _apply_task_delete(
+    db: AsyncSession,
+    task: Task,
+    *,
+    role: str,
+    actor_user_id: int,
+    version: int | None,
+    if_match: str | None,
+) -> None:
+    if not _can_manage_task(task, role, actor_user_id):
+        raise ForbiddenError("Insufficient permissions")
+
+    _check_task_preconditions(task, version=version, if_match=if_match)
+
+    change_seq = await log_action(
+        db,
+        actor_user_id=actor_user_id,
+        workspace_id=task.workspace_id,
+        entity_type="task",
+        entity_id=task.id,
+        action="delete",
+        changes={"title": task.title},
+    )
+    db.add(TaskTombstone(workspace_id=task.workspace_id, task_id=task.id, change_seq=change_seq))
+    await db.delete(task)
 
 
 async def create_task(
@@ -132,20 +658,13 @@ async def create_task(
         if replay_payload is not None:
             return TaskResponse.model_validate(replay_payload)
 
-    task = Task(
+    task = await _add_task(
+        db,
         workspace_id=workspace_id,
         project_id=project_id,
-        title=data.title,
-        description=data.description,
-        status=TaskStatus.todo.value,
-        creator_id=actor_user_id,
-        assignee_id=data.assignee_id,
-        due_at=data.due_at,
-        version=1,
+        actor_user_id=actor_user_id,
+        data=data,
     )
-    db.add(task)
-    await db.flush()
-    await db.refresh(task)
 
     response_payload = TaskResponse.model_validate(task).model_dump(mode="json")
 
@@ -163,21 +682,6 @@ async def create_task(
             resource_id=task.id,
         )
 
-    await log_action(
-        db,
-        actor_user_id=actor_user_id,
-        workspace_id=workspace_id,
-        entity_type="task",
-        entity_id=task.id,
-        action="create",
-        changes={
-            "project_id": project_id,
-            "title": data.title,
-            "assignee_id": data.assignee_id,
-            "due_at": data.due_at,
-        },
-    )
-
     await db.commit()
     return TaskResponse.model_validate(task)
 
@@ -189,54 +693,177 @@ async def list_tasks(
     user_id: int,
     skip: int,
     limit: int,
+    cursor: str | None,
     sort_by: TaskSortBy,
     sort_order: SortOrder,
-    status_filter: TaskStatus | None,
-    assignee_id: int | None,
-    project_id: int | None,
-    tag: str | None,
-    due_at_from: datetime | None,
-    due_at_to: datetime | None,
-) -> tuple[list[Task], int]:
-    await require_workspace_membership(db, workspace_id, user_id)
+    filters: TaskFilters,
+    total_mode: TotalMode = TotalMode.exact,
+    fields: frozenset[str] | None = None,
+) -> dict:
+    """返回 ``items``/``total``/``total_mode``/``next_cursor``；``items`` 是只读的 ``Row``。
+
+    ``total_mode=false`` 不计数。只按 project/status/assignee 过滤时总数直接读计数表；
+    其他组合下 ``exact`` 执行 COUNT，``estimate`` 优先使用短期缓存的计数。
+    """
+    await require_workspace_read_role(db, workspace_id, user_id)
 
+    due_at_from, due_at_to = filters.due_at_from, filters.due_at_to
     if due_at_from and due_at_to and due_at_from > due_at_to:
         raise BadRequestError("due_at_from cannot be greater than due_at_to")
+    if cursor is not None and skip:
+        raise BadRequestError("skip cannot be combined with cursor")
 
-    base_query = select(Task).where(Task.workspace_id == workspace_id)
-    base_count = select(func.count(Task.id)).where(Task.workspace_id == workspace_id)
-
-    query = _apply_task_filters(
-        base_query,
-        status_filter=status_filter,
-        assignee_id=assignee_id,
-        project_id=project_id,
-        tag=tag,
-        due_at_from=due_at_from,
-        due_at_to=due_at_to,
-    )
-    count_query = _apply_task_filters(
-        base_count,
-        status_filter=status_filter,
-        assignee_id=assignee_id,
-        project_id=project_id,
-        tag=tag,
-        due_at_from=due_at_from,
-        due_at_to=due_at_to,
+    sort_column = SORT_COLUMNS[sort_by]
+    query, count_query = build_task_list_queries(
+        workspace_id=workspace_id,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        filters=filters,
+        fields=fields,
     )
 
-    sort_column = SORT_COLUMNS[sort_by]
+    if cursor is not None:
+        value, last_id = _decode_cursor(cursor, sort_by, sort_order)
+        query = query.where(_keyset_condition(sort_column, sort_order, value, last_id))
+    else:
+        query = query.offset(skip)
+
+    # 多取一行用于判断是否还有下一页
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(sort_by, sort_order, rows[-1].sort_key, rows[-1].id)
+
+    total: int | None = None
+    if total_mode != TotalMode.false and counters_can_answer(filters):
+        # 仅按 project/status/assignee 过滤时，计数表能直接给出精确值
+        total = await count_tasks(db, workspace_id=workspace_id, filters=filters)
+    elif total_mode == TotalMode.estimate:
+        cache_key = (workspace_id, filters)
+        total = _count_cache.get(cache_key)
+        if total is None:
+            total = int((await db.execute(count_query)).scalar_one())
+            _count_cache.set(cache_key, total)
+    elif total_mode == TotalMode.exact:
+        total = int((await db.execute(count_query)).scalar_one())
+
+    return {
+        "items": rows,
+        "total": total,
+        "total_mode": total_mode,
+        "next_cursor": next_cursor,
+    }
+
+
+def build_board_query(
+    *,
+    workspace_id: int,
+    project_id: int | None,
+    limit: int,
+    sort_by: TaskSortBy,
+    sort_order: SortOrder,
+):
+    """每个状态列各取 ``limit + 1`` 行（多一行用于判断是否有下一页），用 UNION ALL 合成一条语句。
+
+    每个分支与 ``status=<列>`` 的任务列表查询完全相同（同样走索引、同样的 LIMIT），
+    因此列的 ``next_cursor`` 可以直接交给列表接口继续翻页。
+    """
+    branches = []
+    for column_status in TaskStatus:
+        query, _ = build_task_list_queries(
+            workspace_id=workspace_id,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            filters=TaskFilters(
+                statuses=(column_status,),
+                project_ids=(project_id,) if project_id is not None else None,
+            ),
+        )
+        branches.append(select(query.limit(limit + 1).subquery()))
+
+    board = union_all(*branches).subquery("board")
+    board_task = aliased(Task, board, adapt_on_names=True)
     if sort_order == SortOrder.asc:
-        query = query.order_by(sort_column.asc(), Task.id.asc())
+        ordering = (board.c.sort_key.asc(), board.c.id.asc())
     else:
-        query = query.order_by(sort_column.desc(), Task.id.desc())
+        ordering = (board.c.sort_key.desc(), board.c.id.desc())
+    return select(board_task, board.c.sort_key).order_by(*ordering)
 
-    query = query.offset(skip).limit(limit)
 
-    result = await db.execute(query)
-    count_result = await db.execute(count_query)
+async def get_board(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    user_id: int,
+    project_id: int | None,
+    limit: int,
+    sort_by: TaskSortBy,
+    sort_order: SortOrder,
+) -> dict:
+    """看板：四个状态列各自的首页、总数和 ``next_cursor``，共两条查询。
 
-    return list(result.scalars().all()), int(count_result.scalar_one())
+    总数来自计数表，与列表接口 ``status=<列>`` 的总数一致。
+    """
+    await require_workspace_read_role(db, workspace_id, user_id)
+
+    totals = await count_tasks_by_status(db, workspace_id=workspace_id, project_id=project_id)
+    query = build_board_query(
+        workspace_id=workspace_id,
+        project_id=project_id,
+        limit=limit,
+        sort_by=sort_by,
+        sort_order=sort_order,
+    )
+
+    rows_by_status: dict[TaskStatus, list] = {column_status: [] for column_status in TaskStatus}
+    for task, sort_value in (await db.execute(query)).all():
+        rows_by_status[TaskStatus(task.status)].append((task, sort_value))
+
+    columns = []
+    for column_status, rows in rows_by_status.items():
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_task, last_value = rows[-1]
+            next_cursor = _encode_cursor(sort_by, sort_order, last_value, last_task.id)
+        columns.append(
+            {
+                "status": column_status,
+                "items": [task for task, _ in rows],
+                "total": totals[column_status],
+                "next_cursor": next_cursor,
+            }
+        )
+
+    return {"project_id": project_id, "limit": limit, "columns": columns}
+
+
+async def get_task_version(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    task_id: int,
+    user_id: int,
+) -> int | None:
+    """只查 ``version`` 一列（与成员关系一起校验），用于条件 GET，不构造 ORM 对象。
+
+    不可见或不存在时返回 None，由调用方走完整查询给出准确的 404。
+    """
+    result = await db.execute(
+        select(Task.version)
+        .join(
+            WorkspaceMembership,
+            and_(
+                WorkspaceMembership.workspace_id == Task.workspace_id,
+                WorkspaceMembership.user_id == user_id,
+            ),
+        )
+        .where(Task.workspace_id == workspace_id, Task.id == task_id)
+    )
+    return result.scalar_one_or_none()
 
 
 async def get_task(
@@ -245,10 +872,17 @@ async def get_task(
     workspace_id: int,
     task_id: int,
     user_id: int,
+    fields: frozenset[str] | None = None,
 ) -> Task:
-    await require_workspace_membership(db, workspace_id, user_id)
+    await require_workspace_read_role(db, workspace_id, user_id)
 
-    task = await _get_task_scoped(db, workspace_id=workspace_id, task_id=task_id)
+    task = await _get_task_scoped(
+        db,
+        workspace_id=workspace_id,
+        task_id=task_id,
+        # version 总是加载，用于生成 ETag
+        fields=fields | {"version"} if fields is not None else None,
+    )
     if task is None:
         raise NotFoundError("Task not found")
     return task
@@ -261,48 +895,71 @@ async def update_task(
     task_id: int,
     actor_user_id: int,
     data: TaskUpdate,
+    if_match: str | None = None,
 ) -> Task:
-    membership = await require_workspace_membership(db, workspace_id, actor_user_id)
-
-    task = await _get_task_scoped(db, workspace_id=workspace_id, task_id=task_id)
-    if task is None:
-        raise NotFoundError("Task not found")
-
-    if not _can_manage_task(task, membership.role, actor_user_id):
-        raise ForbiddenError("Insufficient permissions")
+    """``data.version`` 与 ``If-Match`` 至少提供一个；两者都给出时都必须满足。
 
-    if data.version != task.version:
-        raise ConflictError("Task version conflict")
+    校验与写入合并为一条 ``UPDATE ... WHERE version = ? RETURNING``，并发写入不会互相覆盖。
+    """
+    if data.version is None and if_match is None:
+        raise BadRequestError("Either version or If-Match is required")
 
+    membership = await require_workspace_membership(db, workspace_id, actor_user_id)
     update_data = data.model_dump(exclude_unset=True, exclude={"version"})
+    assignee_id = update_data.get("assignee_id")
+    checks: dict[str, Any] = {
+        "workspace_id": workspace_id,
+        "task_id": task_id,
+        "role": membership.role,
+        "actor_user_id": actor_user_id,
+        "version": data.version,
+        "if_match": if_match,
+    }
 
-    if "assignee_id" in update_data and update_data["assignee_id"] is not None:
-        await ensure_user_in_workspace(db, workspace_id, update_data["assignee_id"])
+    if not update_data:
+        return await _load_checked_task(db, **checks)
 
-    for field, value in update_data.items():
-        setattr(task, field, value)
-
-    if update_data:
-        previous_version = task.version
-        task.version += 1
-
-        await log_action(
-            db,
-            actor_user_id=actor_user_id,
-            workspace_id=workspace_id,
-            entity_type="task",
-            entity_id=task_id,
-            action="update",
-            changes={
-                "changes": update_data,
-                "version_from": previous_version,
-                "version_to": task.version,
-            },
+    conditions = _task_write_conditions(**checks)
+    if assignee_id is not None:
+        conditions.append(
+            select(WorkspaceMembership.id)
+            .where(
+                WorkspaceMembership.workspace_id == workspace_id,
+                WorkspaceMembership.user_id == assignee_id,
+            )
+            .exists()
         )
 
-        await db.commit()
-        await db.refresh(task)
+    change_seq = await bump_change_seq(db, workspace_id)
+    result = await db.execute(
+        update(Task)
+        .where(*conditions)
+        .values(**update_data, version=Task.version + 1, change_seq=change_seq)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalar_one_or_none()
+    if task is None:
+        await db.rollback()
+        await _load_checked_task(db, **checks, assignee_id=assignee_id)
+        # 各项校验都通过，说明条件在两条语句之间被并发写入打破
+        raise ConflictError("Task version conflict")
 
+    await log_action(
+        db,
+        actor_user_id=actor_user_id,
+        workspace_id=workspace_id,
+        entity_type="task",
+        entity_id=task.id,
+        action="update",
+        changes={
+            "changes": update_data,
+            "version_from": task.version - 1,
+            "version_to": task.version,
+        },
+        change_seq=change_seq,
+    )
+    await db.commit()
     return task
 
 
@@ -313,27 +970,39 @@ async def transition_task_status(
     task_id: int,
     actor_user_id: int,
     data: TaskStatusTransition,
+    if_match: str | None = None,
 ) -> Task:
+    """审计需要记录流转前的状态，而 RETURNING 只能返回新值，所以先读一次任务，
+    再以读到的 version 做条件更新。"""
     membership = await require_workspace_membership(db, workspace_id, actor_user_id)
 
-    task = await _get_task_scoped(db, workspace_id=workspace_id, task_id=task_id)
-    if task is None:
-        raise NotFoundError("Task not found")
-
-    if not _can_manage_task(task, membership.role, actor_user_id):
-        raise ForbiddenError("Insufficient permissions")
-
-    from_status = TaskStatus(task.status)
-    allowed = ALLOWED_TRANSITIONS[from_status]
-    if data.to_status not in allowed:
+    task = await _load_checked_task(
+        db,
+        workspace_id=workspace_id,
+        task_id=task_id,
+        role=membership.role,
+        actor_user_id=actor_user_id,
+        version=None,
+        if_match=if_match,
+    )
+    previous_status = task.status
+    previous_version = task.version
+    if data.to_status not in ALLOWED_TRANSITIONS[TaskStatus(previous_status)]:
         raise BadRequestError(
-            f"Invalid status transition: {task.status} -> {data.to_status.value}"
+            f"Invalid status transition: {previous_status} -> {data.to_status.value}"
         )
 
-    previous_status = task.status
-    previous_version = task.version
-    task.status = data.to_status.value
-    task.version += 1
+    change_seq = await bump_change_seq(db, workspace_id)
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.version == previous_version)
+        .values(status=data.to_status.value, version=Task.version + 1, change_seq=change_seq)
+        .returning(Task)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        raise ConflictError("Task version conflict")
 
     await log_action(
         db,
@@ -348,10 +1017,9 @@ async def transition_task_status(
             "version_from": previous_version,
             "version_to": task.version,
         },
+        change_seq=change_seq,
     )
-
     await db.commit()
-    await db.refresh(task)
     return task
 
 
@@ -361,16 +1029,33 @@ async def delete_task(
     workspace_id: int,
     task_id: int,
     actor_user_id: int,
+    if_match: str | None = None,
 ) -> None:
     membership = await require_workspace_membership(db, workspace_id, actor_user_id)
+    checks: dict[str, Any] = {
+        "workspace_id": workspace_id,
+        "task_id": task_id,
+        "role": membership.role,
+        "actor_user_id": actor_user_id,
+        "version": None,
+        "if_match": if_match,
+    }
 
-    task = await _get_task_scoped(db, workspace_id=workspace_id, task_id=task_id)
-    if task is None:
-        raise NotFoundError("Task not found")
-
-    if not _can_manage_task(task, membership.role, actor_user_id):
-        raise ForbiddenError("Insufficient permissions")
+    change_seq = await bump_change_seq(db, workspace_id)
+    # DELETE ... RETURNING 返回的是删除前的行，审计所需的标题不必事先查询
+    result = await db.execute(
+        delete(Task)
+        .where(*_task_write_conditions(**checks))
+        .returning(Task.title)
+        .execution_options(synchronize_session=False)
+    )
+    title = result.scalar_one_or_none()
+    if title is None:
+        await db.rollback()
+        await _load_checked_task(db, **checks)
+        raise ConflictError("Task version conflict")
 
+    db.add(TaskTombstone(workspace_id=workspace_id, task_id=task_id, change_seq=change_seq))
     await log_action(
         db,
         actor_user_id=actor_user_id,
@@ -378,8 +1063,256 @@ async def delete_task(
         entity_type="task",
         entity_id=task_id,
         action="delete",
-        changes={"title": task.title},
+        changes={"title": title},
+        change_seq=change_seq,
     )
+    await db.commit()
+
+
+_BATCH_SUCCESS_STATUS = {"create": 201, "update": 200, "transition": 200, "delete": 204}
+
+
+def _batch_item(index: int, op: TaskBatchOperation, **values: Any) -> dict[str, Any]:
+    return {"index": index, "op": op.op, "task_id": getattr(op, "task_id", None), **values}
+
+
+async def run_task_batch(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    actor_user_id: int,
+    operations: list[TaskBatchOperation],
+    atomic: bool,
+) -> dict:
+    """在一个事务中依次执行批量操作，语义与对应的单个接口一致。
+
+    成员关系、涉及的任务、项目与成员集合各只查询一次。``atomic=true`` 时任一操作失败即
+    整体回滚；``atomic=false`` 时跳过失败项（校验先于修改，失败项不会留下部分修改），
+    其余操作一起提交。
+    """
+    membership = await require_workspace_membership(db, workspace_id, actor_user_id)
+
+    task_ids = {op.task_id for op in operations if not isinstance(op, TaskBatchCreate)}
+    tasks: dict[int, Task] = {}
+    if task_ids:
+        task_rows = await db.execute(
+            select(Task).where(Task.workspace_id == workspace_id, Task.id.in_(task_ids))
+        )
+        tasks = {task.id: task for task in task_rows.scalars().all()}
+
+    project_ids = {op.project_id for op in operations if isinstance(op, TaskBatchCreate)}
+    if project_ids:
+        project_rows = await db.execute(
+            select(Project.id).where(
+                Project.workspace_id == workspace_id,
+                Project.id.in_(project_ids),
+            )
+        )
+        project_ids = set(project_rows.scalars().all())
+
+    member_ids: set[int] = set()
+    if any(getattr(op, "assignee_id", None) is not None for op in operations):
+        member_rows = await db.execute(
+            select(WorkspaceMembership.user_id).where(
+                WorkspaceMembership.workspace_id == workspace_id
+            )
+        )
+        member_ids = set(member_rows.scalars().all())
+
+    results: list[dict[str, Any]] = []
+    touched: dict[int, Task] = {}
+    failed_index: int | None = None
+
+    for index, op in enumerate(operations):
+        item = _batch_item(index, op)
+        results.append(item)
+        try:
+            if isinstance(op, TaskBatchCreate):
+                if op.project_id not in project_ids:
+                    raise NotFoundError("Project not found")
+                if op.assignee_id is not None:
+                    await _check_assignee(db, workspace_id, op.assignee_id, member_ids)
+                task = await _add_task(
+                    db,
+                    workspace_id=workspace_id,
+                    project_id=op.project_id,
+                    actor_user_id=actor_user_id,
+                    data=TaskCreate.model_validate(op.model_dump(exclude={"op", "project_id"})),
+                )
+                item["task_id"] = task.id
+                tasks[task.id] = touched[task.id] = task
+            else:
+                existing = tasks.get(op.task_id)
+                if existing is None:
+                    raise NotFoundError("Task not found")
+                task = existing
+                if isinstance(op, TaskBatchUpdate):
+                    task = await _apply_task_update(
+                        db,
+                        task,
+                        role=membership.role,
+                        actor_user_id=actor_user_id,
+                        update_data=op.model_dump(
+                            exclude_unset=True, exclude={"op", "task_id", "version"}
+                        ),
+                        version=op.version,
+                        if_match=None,
+                        member_ids=member_ids,
+                    )
+                    touched[task.id] = task
+                elif isinstance(op, TaskBatchTransition):
+                    await _apply_status_transition(
+                        db,
+                        task,
+                        role=membership.role,
+                        actor_user_id=actor_user_id,
+                        to_status=op.to_status,
+                        version=op.version,
+                        if_match=None,
+                    )
+                    touched[task.id] = task
+                else:
+                    await _apply_task_delete(
+                        db,
+                        task,
+                        role=membership.role,
+                        actor_user_id=actor_user_id,
+                        version=op.version,
+                        if_match=None,
+                    )
+                    del tasks[task.id]
+                    touched.pop(task.id, None)
+        except AppError as err:
+            item["status"] = STATUS_CODES.get(type(err), 500)
+            item["detail"] = err.detail
+            if atomic:
+                failed_index = index
+                break
+            continue
+        item["status"] = _BATCH_SUCCESS_STATUS[op.op]
+
+    if failed_index is not None:
+        await db.rollback()
+        for index, op in enumerate(operations):
+            if index == failed_index:
+                continue
+            if index < failed_index:
+                results[index].update(status=424, detail="Rolled back: batch failed")
+            else:
+                results.append(
+                    _batch_item(index, op, status=424, detail="Not executed: batch failed")
+                )
+        return {"atomic": atomic, "committed": False, "results": results}
 
-    await db.delete(task)
     await db.commit()
+    if touched:
+        # 一条查询刷新所有被修改的任务（updated_at 等由数据库生成）
+        refreshed_rows = await db.execute(
+            select(Task)
+            .where(Task.id.in_(touched))
+            .execution_options(populate_existing=True)
+        )
+        refreshed = {task.id: task for task in refreshed_rows.scalars().all()}
+        for item in results:
+            if item["task_id"] in refreshed and item["status"] in (200, 201):
+                item["task"] = TaskResponse.model_validate(refreshed[item["task_id"]])
+
+    return {"atomic": atomic, "committed": True, "results": results}
+
+
+BULK_UPDATE_CHUNK_SIZE = 500
+
+
+async def _count_rows(db: AsyncSession, query) -> int:
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    return int(result.scalar_one())
+
+
+async def bulk_update_tasks(
+    db: AsyncSession,
+    *,
+    workspace_id: int,
+    actor_user_id: int,
+    filters: TaskFilters,
+    patch: TaskBulkPatch,
+    dry_run: bool,
+) -> dict:
+    """按过滤条件批量修改任务（仅 owner/admin）。
+
+    按主键分块：每块先取出至多 ``BULK_UPDATE_CHUNK_SIZE`` 个 id，写一条列出这些 id 的审计记录，
+    再用一条 ``UPDATE ... WHERE id IN (...)`` 递增 version 并单独提交。
+    指定 ``to_status`` 时，当前状态不允许流转到目标状态的任务被跳过。
+    """
+    await require_workspace_role(db, workspace_id, actor_user_id, ADMIN_ROLES)
+    if filters.due_at_from and filters.due_at_to and filters.due_at_from > filters.due_at_to:
+        raise BadRequestError("due_at_from cannot be greater than due_at_to")
+
+    values: dict[str, Any] = {}
+    if "assignee_id" in patch.model_fields_set:
+        if patch.assignee_id is not None:
+            await ensure_user_in_workspace(db, workspace_id, patch.assignee_id)
+        values["assignee_id"] = patch.assignee_id
+    if patch.project_id is not None:
+        project_result = await db.execute(
+            select(Project.id).where(
+                Project.workspace_id == workspace_id,
+                Project.id == patch.project_id,
+            )
+        )
+        if project_result.scalar_one_or_none() is None:
+            raise NotFoundError("Project not found")
+        values["project_id"] = patch.project_id
+
+    matched_query = apply_task_filters(
+        select(Task.id).where(Task.workspace_id == workspace_id), filters
+    )
+    eligible_query = matched_query
+    if patch.to_status is not None:
+        sources = [
+            source.value
+            for source, targets in ALLOWED_TRANSITIONS.items()
+            if patch.to_status in targets
+        ]
+        eligible_query = matched_query.where(Task.status.in_(sources))
+        values["status"] = patch.to_status.value
+
+    matched = await _count_rows(db, matched_query)
+    if dry_run:
+        eligible = await _count_rows(db, eligible_query)
+        skipped = matched - eligible
+        return {"dry_run": True, "matched": matched, "updated": eligible, "skipped": skipped}
+
+    audit_patch = patch.model_dump(mode="json", include=patch.model_fields_set)
+    updated = 0
+    last_id = 0
+    while True:
+        id_result = await db.execute(
+            eligible_query.where(Task.id > last_id).order_by(Task.id).limit(BULK_UPDATE_CHUNK_SIZE)
+        )
+        task_ids = list(id_result.scalars().all())
+        if not task_ids:
+            break
+
+        change_seq = await log_bulk_action(
+            db,
+            actor_user_id=actor_user_id,
+            workspace_id=workspace_id,
+            entity_type="task",
+            entity_ids=task_ids,
+            action="bulk_update",
+            changes={"patch": audit_patch},
+        )
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_(task_ids))
+            .values(**values, version=Task.version + 1, change_seq=change_seq)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+        updated += len(task_ids)
+        last_id = task_ids[-1]
+        if len(task_ids) < BULK_UPDATE_CHUNK_SIZE:
+            break
+
+    return {"dry_run": False, "matched": matched, "updated": updated, "skipped": matched - updated}
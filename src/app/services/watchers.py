@@ -7,7 +7,11 @@ from app.models.task import Task
 from app.models.task_watcher import TaskWatcher
 from app.schemas.comment import WatcherCreate
 from app.services.audit import log_action
-from app.services.permissions import ensure_user_in_workspace, require_workspace_membership
+from app.services.permissions import (
+    ensure_user_in_workspace,
+    require_workspace_membership,
+    require_workspace_read_role,
+)
 
 
 async def _require_task(
@@ -35,7 +39,7 @@ async def list_watchers(
     task_id: int,
     actor_user_id: int,
 ) -> list[TaskWatcher]:
-    await require_workspace_membership(db, workspace_id, actor_user_id)
+    await require_workspace_read_role(db, workspace_id, actor_user_id)
     await _require_task(db, workspace_id=workspace_id, task_id=task_id)
     result = await db.execute(select(TaskWatcher).where(TaskWatcher.task_id == task_id))
     return list(result.scalars().all())
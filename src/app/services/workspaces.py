@@ -14,8 +14,10 @@ from app.schemas.workspace import (
 )
 from app.services.audit import log_action
 from app.services.permissions import (
+    bump_membership_epoch,
     count_role_members,
-    require_workspace_membership,
+    invalidate_membership,
+    require_workspace_read_role,
     require_workspace_role,
 )
 
@@ -75,12 +77,12 @@ async def list_workspaces(db: AsyncSession, *, user_id: int) -> list[dict]:
 
 
 async def get_workspace(db: AsyncSession, *, workspace_id: int, user_id: int) -> dict:
-    membership = await require_workspace_membership(db, workspace_id, user_id)
+    role = await require_workspace_read_role(db, workspace_id, user_id)
     result = await db.execute(select(Workspace).where(Workspace.id == workspace_id))
     workspace = result.scalar_one_or_none()
     if workspace is None:
         raise NotFoundError("Workspace not found")
-    return _workspace_payload(workspace, membership.role)
+    return _workspace_payload(workspace, role)
 
 
 async def list_workspace_members(
@@ -90,7 +92,7 @@ async def list_workspace_members(
     actor_user_id: int,
 ) -> list[dict]:
     """List all members of a workspace with their usernames."""
-    await require_workspace_membership(db, workspace_id, actor_user_id)
+    await require_workspace_read_role(db, workspace_id, actor_user_id)
 
     result = await db.execute(
         select(WorkspaceMembership, User.username)
@@ -146,6 +148,7 @@ async def add_workspace_member(
         user_id=data.user_id,
         role=data.role.value,
     )
+    # 新增成员不改纪元：旧 token 的声明里没有这个工作区，会回退查库
     db.add(membership)
 
     await log_action(
@@ -163,6 +166,7 @@ async def add_workspace_member(
     except IntegrityError as err:
         await db.rollback()
         raise ConflictError("User already in workspace") from err
+    invalidate_membership(db, workspace_id, data.user_id)
 
     await db.refresh(membership)
     return membership
@@ -205,6 +209,8 @@ async def update_workspace_member(
 
     previous_role = target.role
     target.role = data.role.value
+    # 角色变化与移除会让已签发的角色声明失效
+    await bump_membership_epoch(db, target_user_id)
 
     await log_action(
         db,
@@ -217,6 +223,7 @@ async def update_workspace_member(
     )
 
     await db.commit()
+    invalidate_membership(db, workspace_id, target_user_id)
     await db.refresh(target)
     return target
 
@@ -264,4 +271,6 @@ async def remove_workspace_member(
     )
 
     await db.delete(target)
+    await bump_membership_epoch(db, target_user_id)
     await db.commit()
+    invalidate_membership(db, workspace_id, target_user_id)
@@ -0,0 +1,52 @@
+"""用户数据变更的失效记录，供 token 解析缓存判断条目是否陈旧。
+
+与事件广播相同，变更先挂在会话上，事务提交后由 ``after_commit`` 钩子一次性登记，回滚则丢弃：
+在提交前登记的话，并发请求可能先读到新的失效时间、再读到尚未提交的旧数据，把旧数据当成新的缓存下来。
+
+陈旧条目的判断与失效记录的清理见 ``app.cache.InvalidationLog``。
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.cache import InvalidationLog
+from app.config import settings
+from app.models.user import User
+
+_PENDING_KEY = "pending_user_invalidations"
+
+_invalidations: InvalidationLog[int] = InvalidationLog()
+
+
+def invalidate_user(user_id: int) -> None:
+    """立即让该用户所有已缓存的 token 解析结果失效。"""
+    _invalidations.invalidate(user_id, retention_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def is_current(user_id: int, checked_at: float) -> bool:
+    """``checked_at`` 时刻读取的用户数据此后没有被修改过。"""
+    return _invalidations.is_current(user_id, checked_at)
+
+
+def mark_user_changed(session: Session, user_id: int) -> None:
+    """登记一次用户数据变更，等所在事务提交后再使缓存失效。"""
+    session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_changed_user(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        mark_user_changed(session, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -9,6 +9,7 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.cache import clear_all_caches
 from app.database import get_db
 from app.main import app
 
@@ -21,6 +22,8 @@ TABLES_TO_CLEAN = [
     "task_watchers",
     "task_tags",
     "task_comments",
+    "task_counters",
+    "task_tombstones",
     "audit_logs",
     "idempotency_keys",
     "tasks",
@@ -79,6 +82,7 @@ async def cleanup_database(migrated_schema):
             await conn.execute(text("DELETE FROM sqlite_sequence"))
 
         await conn.execute(text("PRAGMA foreign_keys=ON"))
+    clear_all_caches()
     yield
 
 
@@ -4,7 +4,29 @@
 测试用户注册和登录功能。
 """
 
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+
+import pytest
 from httpx import AsyncClient
+from sqlalchemy import delete, event, update
+
+from app import security, user_invalidation
+from app.config import settings
+from app.models.user import User
+from app.models.workspace_membership import WorkspaceMembership
+from tests.conftest import test_engine
+from tests.conftest import test_session as session_factory
+from tests.helpers import create_workspace, register_and_login_with_id
+
+
+async def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
 
 
 class TestRegister:
@@ -85,3 +107,260 @@ class TestLogin:
             "password": "secret123",
         })
         assert response.status_code == 401
+
+
+class TestPasswordHashing:
+
+    async def test_hashing_runs_in_pool_and_reports_metrics(self, client: AsyncClient):
+        """注册/登录的 bcrypt 在线程池中执行，耗时与排队时间出现在 /metrics"""
+        await client.post("/auth/register", json={
+            "username": "metered",
+            "password": "secret123",
+        })
+        response = await client.post("/auth/login", data={
+            "username": "metered",
+            "password": "secret123",
+        })
+        assert response.status_code == 200
+
+        metrics = await client.get("/metrics")
+        assert metrics.status_code == 200
+        assert metrics.headers["content-type"].startswith("text/plain")
+        body = metrics.text
+        assert 'password_hash_seconds_count{operation="hash"}' in body
+        assert 'password_hash_seconds_count{operation="verify"}' in body
+        assert 'password_hash_queue_wait_seconds_bucket{operation="verify",le="+Inf"}' in body
+        assert "password_hash_in_flight 0" in body
+
+    async def test_saturated_pool_returns_503(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """线程池被真实占满、等待队列也满时直接返回 503 和 Retry-After"""
+        release = threading.Event()
+
+        def blocking_hash(password: str) -> str:
+            release.wait(timeout=10)
+            return "blocked"
+
+        monkeypatch.setattr(security, "hash_password", blocking_hash)
+        monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_QUEUE", 1)
+        monkeypatch.setattr(settings, "PASSWORD_HASH_RETRY_AFTER_SECONDS", 3)
+        limit = security._HASH_WORKERS + 1
+
+        jobs = [
+            asyncio.create_task(security.hash_password_async("secret123"))
+            for _ in range(limit)
+        ]
+        try:
+            await _wait_for(lambda: security.HASH_IN_FLIGHT.value() == limit)
+            response = await client.post("/auth/register", json={
+                "username": "overloaded",
+                "password": "secret123",
+            })
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "3"
+        finally:
+            release.set()
+            await asyncio.gather(*jobs)
+        await _wait_for(lambda: security.HASH_IN_FLIGHT.value() == 0)
+
+        metrics = await client.get("/metrics")
+        assert 'password_hash_rejected_total{operation="hash"}' in metrics.text
+
+    async def test_cancelled_request_keeps_running_job_counted(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """等待方被取消后，仍在线程中执行的 bcrypt 继续计入 in-flight，直到真正结束"""
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_hash(password: str) -> str:
+            started.set()
+            release.wait(timeout=10)
+            return "blocked"
+
+        monkeypatch.setattr(security, "hash_password", blocking_hash)
+        job = asyncio.create_task(security.hash_password_async("secret123"))
+        await _wait_for(started.is_set)
+        job.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await job
+        await asyncio.sleep(0.05)
+        assert security.HASH_IN_FLIGHT.value() == 1
+
+        release.set()
+        await _wait_for(lambda: security.HASH_IN_FLIGHT.value() == 0)
+
+    async def test_metrics_token(self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch):
+        """配置 METRICS_TOKEN 后 /metrics 需要对应的 Bearer token"""
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+        assert (await client.get("/metrics")).status_code == 404
+        wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 404
+        ok = await client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert ok.status_code == 200
+
+
+class TestPrincipalCache:
+
+    async def test_repeated_requests_skip_user_lookup(self, auth_client: AsyncClient):
+        """同一 token 第二次请求命中缓存，不再查询 users 表"""
+        first = await auth_client.get("/auth/me")
+        assert first.status_code == 200
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            second = await auth_client.get("/auth/me")
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+        assert second.json() == first.json()
+        assert not any("FROM users" in sql for sql in statements)
+
+        metrics = (await auth_client.get("/metrics")).text
+        assert 'principal_cache_requests_total{result="hit"}' in metrics
+
+    async def test_user_change_invalidates_cached_principal(self, auth_client: AsyncClient):
+        """用户被修改后，已缓存的解析结果立即失效"""
+        me = (await auth_client.get("/auth/me")).json()
+
+        async with session_factory() as session:
+            user = await session.get(User, me["id"])
+            assert user is not None
+            user.username = "renamed"
+            await session.commit()
+
+        assert (await auth_client.get("/auth/me")).json()["username"] == "renamed"
+
+        async with session_factory() as session:
+            user = await session.get(User, me["id"])
+            await session.delete(user)
+            await session.commit()
+
+        assert (await auth_client.get("/auth/me")).status_code == 401
+
+    async def test_uncommitted_change_is_not_cached_as_current(self, auth_client: AsyncClient):
+        """变更只在提交后才使缓存失效：提交前的并发请求读到的旧数据不会被当成新数据缓存"""
+        me = (await auth_client.get("/auth/me")).json()
+
+        async with session_factory() as session:
+            user = await session.get(User, me["id"])
+            assert user is not None
+            user.username = "pending"
+            await session.flush()
+            # 其他连接此时仍读到已提交的旧用户名
+            assert (await auth_client.get("/auth/me")).json()["username"] == me["username"]
+            await session.commit()
+
+        assert (await auth_client.get("/auth/me")).json()["username"] == "pending"
+
+    async def test_invalidation_records_are_pruned(self, monkeypatch: pytest.MonkeyPatch):
+        """超过缓存有效期的失效记录不再保留"""
+        monkeypatch.setattr(settings, "PRINCIPAL_CACHE_TTL_SECONDS", 0)
+        for user_id in range(1000, 1100):
+            user_invalidation.invalidate_user(user_id)
+        assert len(user_invalidation._invalidations) <= 1
+
+
+async def _login(client: AsyncClient, username: str) -> dict[str, str]:
+    resp = await client.post("/auth/login", data={"username": username, "password": "secret123"})
+    assert resp.status_code == 200
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+class TestTokenRoleClaims:
+
+    @pytest.fixture(autouse=True)
+    def _enable_claims(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(settings, "TOKEN_ROLE_CLAIMS_ENABLED", True)
+
+    async def test_reads_authorize_from_claims(self, client: AsyncClient):
+        """token 带角色声明时，只读接口不查成员表；写接口仍然查库"""
+        _, headers = await register_and_login_with_id(client, "claims_owner")
+        workspace_id = await create_workspace(client, headers, "claims-space")
+        headers = await _login(client, "claims_owner")
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            read = await client.get(f"/workspaces/{workspace_id}", headers=headers)
+            read_statements = list(statements)
+            write = await client.post(
+                f"/workspaces/{workspace_id}/projects", json={"name": "p"}, headers=headers
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+        assert read.status_code == 200
+        assert read.json()["role"] == "owner"
+        assert not any("FROM workspace_memberships" in sql for sql in read_statements)
+        assert write.status_code == 201
+        assert any("FROM workspace_memberships" in sql for sql in statements[len(read_statements):])
+
+    async def test_membership_change_revokes_claims(self, client: AsyncClient):
+        """角色变化或被移除后，旧 token 的声明不再可信，回退到数据库"""
+        _, owner_headers = await register_and_login_with_id(client, "claims_admin")
+        member_id, _ = await register_and_login_with_id(client, "claims_member")
+        workspace_id = await create_workspace(client, owner_headers, "claims-revoke")
+        members_url = f"/workspaces/{workspace_id}/members"
+        resp = await client.post(
+            members_url, json={"user_id": member_id, "role": "admin"}, headers=owner_headers
+        )
+        assert resp.status_code == 201
+        member_headers = await _login(client, "claims_member")
+        audit_url = f"/workspaces/{workspace_id}/audit-logs"
+        assert (await client.get(audit_url, headers=member_headers)).status_code == 200
+
+        resp = await client.patch(
+            f"{members_url}/{member_id}", json={"role": "member"}, headers=owner_headers
+        )
+        assert resp.status_code == 200
+        assert (await client.get(audit_url, headers=member_headers)).status_code == 403
+
+        resp = await client.delete(f"{members_url}/{member_id}", headers=owner_headers)
+        assert resp.status_code == 204
+        detail = await client.get(f"/workspaces/{workspace_id}", headers=member_headers)
+        assert detail.status_code == 404
+
+    async def test_claims_rechecked_on_every_request(self, client: AsyncClient):
+        """带声明的 token 不进解析缓存：其他进程提交的成员变更下一次请求即生效"""
+        _, owner_headers = await register_and_login_with_id(client, "claims_peer_owner")
+        member_id, _ = await register_and_login_with_id(client, "claims_peer_member")
+        workspace_id = await create_workspace(client, owner_headers, "claims-peer")
+        resp = await client.post(
+            f"/workspaces/{workspace_id}/members",
+            json={"user_id": member_id, "role": "member"},
+            headers=owner_headers,
+        )
+        assert resp.status_code == 201
+        member_headers = await _login(client, "claims_peer_member")
+        url = f"/workspaces/{workspace_id}"
+        assert (await client.get(url, headers=member_headers)).status_code == 200
+        assert (await client.get(url, headers=member_headers)).status_code == 200
+
+        # 模拟另一个 worker：直接改库，本进程没有任何失效通知
+        async with session_factory() as session:
+            await session.execute(
+                delete(WorkspaceMembership).where(
+                    WorkspaceMembership.workspace_id == workspace_id,
+                    WorkspaceMembership.user_id == member_id,
+                )
+            )
+            await session.execute(
+                update(User)
+                .where(User.id == member_id)
+                .values(membership_epoch=User.membership_epoch + 1)
+            )
+            await session.commit()
+
+        assert (await client.get(url, headers=member_headers)).status_code == 404
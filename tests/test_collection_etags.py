@@ -0,0 +1,123 @@
+from httpx import AsyncClient
+
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+class TestCollectionETags:
+    async def test_change_seq_etag_on_collections(self, client: AsyncClient):
+        _, headers = await _register_login(client, "seq_owner")
+        _, outsider_headers = await _register_login(client, "seq_outsider")
+        workspace_id = await create_workspace(client, headers, "seq-space")
+        project_id = await create_project(client, headers, workspace_id, "seq-project")
+        task_id = await create_task(client, headers, workspace_id, project_id, "seq-task")
+
+        urls = [
+            f"/workspaces/{workspace_id}/tasks",
+            f"/workspaces/{workspace_id}/projects",
+            f"/workspaces/{workspace_id}/members",
+            f"/workspaces/{workspace_id}/tasks/{task_id}/comments",
+        ]
+        etags = set()
+        for url in urls:
+            resp = await client.get(url, headers=headers)
+            assert resp.status_code == 200
+            assert resp.headers["ETag"].startswith(f'W/"ws-{workspace_id}-c')
+            etags.add(resp.headers["ETag"])
+        assert len(etags) == 1
+        etag = etags.pop()
+
+        for url in urls:
+            cached = await client.get(url, headers={**headers, "If-None-Match": etag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+            assert cached.headers["ETag"] == etag
+
+        sparse = await client.get(
+            urls[0],
+            params={"fields": "title"},
+            headers=headers,
+        )
+        assert sparse.headers["ETag"] == etag
+
+        outsider = await client.get(urls[0], headers={**outsider_headers, "If-None-Match": etag})
+        assert outsider.status_code == 404
+
+        comment = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{task_id}/comments",
+            json={"content": "bump"},
+            headers=headers,
+        )
+        assert comment.status_code == 201
+
+        for url in urls:
+            fresh = await client.get(url, headers={**headers, "If-None-Match": etag})
+            assert fresh.status_code == 200
+            assert fresh.headers["ETag"] != etag
+
+    async def test_every_write_bumps_change_seq(self, client: AsyncClient):
+        _, headers = await _register_login(client, "seq_writer")
+        member_id, _ = await _register_login(client, "seq_member")
+        workspace_id = await create_workspace(client, headers, "seq-write-space")
+
+        async def current_etag() -> str:
+            resp = await client.get(f"/workspaces/{workspace_id}/projects", headers=headers)
+            return resp.headers["ETag"]
+
+        seen = {await current_etag()}
+
+        async def assert_bumped(resp, expected_status: int) -> None:
+            assert resp.status_code == expected_status, resp.text
+            etag = await current_etag()
+            assert etag not in seen
+            seen.add(etag)
+
+        base = f"/workspaces/{workspace_id}"
+        project = await client.post(f"{base}/projects", json={"name": "p"}, headers=headers)
+        await assert_bumped(project, 201)
+        project_id = project.json()["id"]
+        await assert_bumped(
+            await client.patch(
+                f"{base}/projects/{project_id}", json={"name": "p2"}, headers=headers
+            ),
+            200,
+        )
+        task = await client.post(
+            f"{base}/projects/{project_id}/tasks", json={"title": "t"}, headers=headers
+        )
+        await assert_bumped(task, 201)
+        task_id = task.json()["id"]
+        await assert_bumped(
+            await client.patch(
+                f"{base}/tasks/{task_id}", json={"version": 1, "title": "t2"}, headers=headers
+            ),
+            200,
+        )
+        await assert_bumped(
+            await client.post(
+                f"{base}/tasks/{task_id}/status-transitions",
+                json={"to_status": "in_progress"},
+                headers=headers,
+            ),
+            200,
+        )
+        await assert_bumped(
+            await client.post(f"{base}/tasks/{task_id}/tags", json={"tag": "x"}, headers=headers),
+            201,
+        )
+        await assert_bumped(
+            await client.post(
+                f"{base}/members", json={"user_id": member_id, "role": "member"}, headers=headers
+            ),
+            201,
+        )
+        await assert_bumped(
+            await client.post(
+                f"{base}/tasks/{task_id}/watchers", json={"user_id": member_id}, headers=headers
+            ),
+            201,
+        )
+        await assert_bumped(await client.delete(f"{base}/tasks/{task_id}", headers=headers), 204)
+        await assert_bumped(
+            await client.delete(f"{base}/members/{member_id}", headers=headers), 204
+        )
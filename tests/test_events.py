@@ -0,0 +1,132 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.events import broker
+from app.services.audit import log_action
+from tests.conftest import test_session as session_factory
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _wait_for_subscribers(workspace_id: int, count: int) -> None:
+    for _ in range(200):
+        if broker.subscriber_count(workspace_id) == count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("subscriber count did not settle")
+
+
+class TestWorkspaceEvents:
+    async def test_stream_pushes_committed_changes(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(broker, "max_queue", 4)
+        monkeypatch.setattr(settings, "EVENT_HEARTBEAT_SECONDS", 0.05)
+        _, headers = await _register_login(client, "sse_owner")
+        workspace_id = await create_workspace(client, headers, "sse-space")
+        project_id = await create_project(client, headers, workspace_id, "sse-project")
+
+        stream = asyncio.create_task(
+            client.get(f"/workspaces/{workspace_id}/events", headers=headers)
+        )
+        await _wait_for_subscribers(workspace_id, 1)
+
+        task_id = await create_task(client, headers, workspace_id, project_id, "live")
+        resp = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{task_id}/tags",
+            json={"tag": "urgent"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        await asyncio.sleep(0.2)
+
+        # 消费者跟不上：发布方不等待，直接踢掉该连接
+        for seq in range(5):
+            broker.publish(
+                workspace_id,
+                {"seq": seq, "entity_type": "task", "entity_id": 0, "action": "noop"},
+            )
+        resp = await asyncio.wait_for(stream, timeout=5)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert ": keep-alive" in resp.text
+
+        events = _parse_events(resp.text)
+        assert [name for name, _ in events] == ["task.create", "task_tag.create", "evicted"]
+        assert events[0][1]["entity_id"] == task_id
+        assert events[0][1]["seq"] < events[1][1]["seq"]
+        assert broker.subscriber_count(workspace_id) == 0
+
+    async def test_events_published_only_after_commit(self, client: AsyncClient):
+        user_id, headers = await _register_login(client, "sse_commit")
+        workspace_id = await create_workspace(client, headers, "sse-commit-space")
+        other_workspace_id = await create_workspace(client, headers, "sse-other-space")
+        subscription = broker.subscribe(workspace_id)
+        try:
+            async with session_factory() as db:
+                await log_action(
+                    db,
+                    actor_user_id=user_id,
+                    workspace_id=workspace_id,
+                    entity_type="task",
+                    entity_id=1,
+                    action="update",
+                )
+                await db.rollback()
+
+                seq = await log_action(
+                    db,
+                    actor_user_id=user_id,
+                    workspace_id=workspace_id,
+                    entity_type="task",
+                    entity_id=2,
+                    action="update",
+                )
+                await log_action(
+                    db,
+                    actor_user_id=user_id,
+                    workspace_id=other_workspace_id,
+                    entity_type="task",
+                    entity_id=3,
+                    action="update",
+                )
+                with pytest.raises(TimeoutError):
+                    await subscription.get(0.01)
+                await db.commit()
+
+            payload = await subscription.get(0.1)
+            assert payload == {
+                "seq": seq,
+                "entity_type": "task",
+                "entity_id": 2,
+                "action": "update",
+                "actor_user_id": user_id,
+            }
+            with pytest.raises(TimeoutError):
+                await subscription.get(0.01)
+        finally:
+            broker.unsubscribe(subscription)
+
+    async def test_non_member_cannot_subscribe(self, client: AsyncClient):
+        _, headers = await _register_login(client, "sse_member")
+        _, outsider_headers = await _register_login(client, "sse_outsider")
+        workspace_id = await create_workspace(client, headers, "sse-private")
+
+        resp = await client.get(f"/workspaces/{workspace_id}/events", headers=outsider_headers)
+        assert resp.status_code == 404
+        assert broker.subscriber_count(workspace_id) == 0
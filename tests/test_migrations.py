@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import subprocess
 import sys
 from pathlib import Path
@@ -26,3 +27,44 @@ def test_migration_smoke_upgrade_downgrade_upgrade(tmp_path):
     _run_alembic(database_url, "upgrade", "head")
     _run_alembic(database_url, "downgrade", "-1")
     _run_alembic(database_url, "upgrade", "head")
+
+
+def test_search_index_backfill_covers_existing_rows(tmp_path):
+    db_path = tmp_path / "search_backfill.db"
+    database_url = f"sqlite+aiosqlite:///{db_path.as_posix()}"
+    _run_alembic(database_url, "upgrade", "c41d8e6f2a57")
+
+    # 跨越多个回填批次，且 id 不连续
+    task_ids = [*range(1, 1201), 2500, 4001]
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO users (id, username, hashed_password) VALUES (1, 'u', 'x')")
+        conn.execute("INSERT INTO workspaces (id, name, created_by) VALUES (1, 'w', 1)")
+        conn.execute(
+            "INSERT INTO projects (id, workspace_id, name, created_by) VALUES (1, 1, 'p', 1)"
+        )
+        conn.executemany(
+            "INSERT INTO tasks (id, workspace_id, project_id, title, description, creator_id) "
+            "VALUES (?, 1, 1, ?, 'shared body', 1)",
+            [(task_id, f"task{task_id}") for task_id in task_ids],
+        )
+        conn.execute(
+            "INSERT INTO task_comments (id, workspace_id, task_id, author_id, content) "
+            "VALUES (3000, 1, 4001, 1, 'legacy remark')"
+        )
+
+    _run_alembic(database_url, "upgrade", "head")
+
+    with sqlite3.connect(db_path) as conn:
+        indexed = conn.execute(
+            "SELECT COUNT(*) FROM tasks_fts WHERE tasks_fts MATCH 'shared'"
+        ).fetchone()[0]
+        last = conn.execute(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'task4001'"
+        ).fetchall()
+        comment = conn.execute(
+            "SELECT rowid FROM task_comments_fts WHERE task_comments_fts MATCH 'legacy'"
+        ).fetchall()
+
+    assert indexed == len(task_ids)
+    assert last == [(4001,)]
+    assert comment == [(3000,)]
@@ -1,8 +1,27 @@
+from collections.abc import Callable
+
+import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
+from app.config import settings
+from app.services import permissions
+from tests.conftest import test_engine
+from tests.conftest import test_session as session_factory
+from tests.helpers import create_project, create_workspace
 from tests.helpers import register_and_login_with_id as _register_login
 
 
+def _record_membership_queries() -> tuple[list[str], Callable[..., None]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "FROM workspace_memberships" in statement:
+            statements.append(statement)
+
+    return statements, record
+
+
 class TestCommentPermissions:
     async def test_comment_author_edit_and_owner_delete_any(self, client: AsyncClient):
         owner_id, owner_headers = await _register_login(client, "comment_owner")
@@ -83,3 +102,101 @@ class TestCommentPermissions:
         assert owner_delete_member.status_code == 204
 
         assert owner_id > 0
+
+
+class TestMembershipCache:
+    async def test_repeated_checks_in_one_request_query_once(self, client: AsyncClient):
+        owner_id, headers = await _register_login(client, "memo_owner")
+        workspace_id = await create_workspace(client, headers, "memo-space")
+        project_id = await create_project(client, headers, workspace_id, "memo-project")
+
+        statements, record = _record_membership_queries()
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            resp = await client.post(
+                f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+                json={"title": "mine", "assignee_id": owner_id},
+                headers=headers,
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+        assert resp.status_code == 201, resp.text
+        # 操作者与负责人是同一人：第二次校验由请求内的记录直接回答
+        assert len(statements) == 1
+
+    async def test_shared_cache_is_invalidated_by_member_changes(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(settings, "MEMBERSHIP_CACHE_TTL_SECONDS", 60)
+        _, owner_headers = await _register_login(client, "shared_owner")
+        member_id, member_headers = await _register_login(client, "shared_member")
+        workspace_id = await create_workspace(client, owner_headers, "shared-space")
+        members_url = f"/workspaces/{workspace_id}/members"
+        resp = await client.post(
+            members_url, json={"user_id": member_id, "role": "admin"}, headers=owner_headers
+        )
+        assert resp.status_code == 201
+        audit_url = f"/workspaces/{workspace_id}/audit-logs"
+        assert (await client.get(audit_url, headers=member_headers)).status_code == 200
+
+        statements, record = _record_membership_queries()
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            assert (await client.get(audit_url, headers=member_headers)).status_code == 200
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+        assert statements == []
+
+        resp = await client.patch(
+            f"{members_url}/{member_id}", json={"role": "member"}, headers=owner_headers
+        )
+        assert resp.status_code == 200
+        assert (await client.get(audit_url, headers=member_headers)).status_code == 403
+
+        resp = await client.delete(f"{members_url}/{member_id}", headers=owner_headers)
+        assert resp.status_code == 204
+        detail = await client.get(f"/workspaces/{workspace_id}", headers=member_headers)
+        assert detail.status_code == 404
+
+        metrics = (await client.get("/metrics")).text
+        assert 'membership_lookups_total{source="shared"}' in metrics
+
+    async def test_invalidation_during_lookup_is_not_overwritten(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """查询进行中发生的失效不会被这次查询写回的旧结果掩盖"""
+        monkeypatch.setattr(settings, "MEMBERSHIP_CACHE_TTL_SECONDS", 60)
+        owner_id, headers = await _register_login(client, "race_owner")
+        workspace_id = await create_workspace(client, headers, "race-space")
+
+        async with session_factory() as other:
+            def invalidate_mid_query(conn, cursor, statement, parameters, context, executemany):
+                if "FROM workspace_memberships" in statement:
+                    # 另一个请求在这次 SELECT 读到旧数据之后提交了变更并使缓存失效
+                    permissions.invalidate_membership(other, workspace_id, owner_id)
+
+            event.listen(test_engine.sync_engine, "before_cursor_execute", invalidate_mid_query)
+            try:
+                async with session_factory() as session:
+                    membership = await permissions.get_workspace_membership(
+                        session, workspace_id, owner_id
+                    )
+            finally:
+                event.remove(
+                    test_engine.sync_engine, "before_cursor_execute", invalidate_mid_query
+                )
+        assert membership is not None
+
+        database_before = permissions.MEMBERSHIP_LOOKUPS.value("database")
+        async with session_factory() as session:
+            assert await permissions.get_workspace_membership(session, workspace_id, owner_id)
+        # 写回的条目早于失效时刻，不能命中，必须重新查库
+        assert permissions.MEMBERSHIP_LOOKUPS.value("database") == database_before + 1
+
+        async with session_factory() as session:
+            assert await permissions.get_workspace_membership(session, workspace_id, owner_id)
+        assert permissions.MEMBERSHIP_LOOKUPS.value("database") == database_before + 1
@@ -0,0 +1,126 @@
+"""EXPLAIN QUERY PLAN regression for the task list query shapes.
+
+Every filter/sort combination produced by ``build_task_list_queries`` must be
+answered through an index; a plain ``SCAN tasks`` / ``SCAN task_tags`` means a
+full table scan and fails the test. The hot shapes listed in ``ORDERED_BY_INDEX``
+must additionally be returned in index order, without a temp B-tree sort.
+"""
+
+import itertools
+import re
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import sqlite
+
+from app.schemas.task import SortOrder, TagMode, TaskFilters, TaskSortBy, TaskStatus
+from app.services.task_export import build_export_query
+from app.services.tasks import build_board_query, build_task_list_queries
+from tests.conftest import test_engine
+
+FULL_SCAN = re.compile(r"^SCAN (tasks|task_tags)\b(?!.*\bUSING\b)")
+TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+FILTERS = {
+    "statuses": {"statuses": (TaskStatus.todo, TaskStatus.blocked)},
+    "assignee_ids": {"assignee_ids": (7, 9)},
+    "unassigned": {"unassigned": True},
+    "project_ids": {"project_ids": (3,)},
+    "tags": {"tags": ("urgent", "backend")},
+    "due_range": {
+        "due_at_from": datetime(2026, 1, 1, tzinfo=UTC),
+        "due_at_to": datetime(2026, 2, 1, tzinfo=UTC),
+    },
+}
+
+# (active filters, sort_by) pairs that must not need a separate sort step
+ORDERED_BY_INDEX = [
+    *(((), sort_by) for sort_by in TaskSortBy),
+    (("project_ids",), TaskSortBy.created_at),
+    (("statuses",), TaskSortBy.status),
+    (("due_range",), TaskSortBy.due_at),
+]
+
+
+def _filter_combinations():
+    names = list(FILTERS)
+    for size in range(len(names) + 1):
+        yield from itertools.combinations(names, size)
+
+
+def _build_filters(active: tuple[str, ...], tag_mode: TagMode = TagMode.all) -> TaskFilters:
+    kwargs: dict = {"tag_mode": tag_mode}
+    for name in active:
+        kwargs.update(FILTERS[name])
+    return TaskFilters(**kwargs)
+
+
+async def _explain(statement) -> list[str]:
+    compiled = statement.compile(
+        dialect=sqlite.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    async with test_engine.connect() as conn:
+        result = await conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+        return [row.detail for row in result]
+
+
+@pytest.mark.parametrize("sort_by", list(TaskSortBy))
+@pytest.mark.parametrize("sort_order", list(SortOrder))
+async def test_task_list_queries_use_indexes(sort_by: TaskSortBy, sort_order: SortOrder):
+    for active in _filter_combinations():
+        tag_modes = list(TagMode) if "tags" in active else [TagMode.all]
+        for tag_mode in tag_modes:
+            query, count_query = build_task_list_queries(
+                workspace_id=1,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                filters=_build_filters(active, tag_mode),
+            )
+            for statement in (query.limit(21), count_query):
+                plan = await _explain(statement)
+                scans = [detail for detail in plan if FULL_SCAN.search(detail)]
+                assert not scans, (active, tag_mode.value, sort_by.value, plan)
+
+
+@pytest.mark.parametrize("sort_order", list(SortOrder))
+@pytest.mark.parametrize(("active", "sort_by"), ORDERED_BY_INDEX)
+async def test_hot_task_list_shapes_avoid_temp_sort(
+    active: tuple[str, ...],
+    sort_by: TaskSortBy,
+    sort_order: SortOrder,
+):
+    query, _ = build_task_list_queries(
+        workspace_id=1,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        filters=_build_filters(active),
+    )
+    plan = await _explain(query.limit(21))
+    assert TEMP_SORT not in plan, (active, sort_by.value, sort_order.value, plan)
+
+
+@pytest.mark.parametrize("sort_by", list(TaskSortBy))
+@pytest.mark.parametrize("project_id", [None, 3])
+async def test_board_query_uses_indexes(sort_by: TaskSortBy, project_id: int | None):
+    query = build_board_query(
+        workspace_id=1,
+        project_id=project_id,
+        limit=20,
+        sort_by=sort_by,
+        sort_order=SortOrder.desc,
+    )
+    plan = await _explain(query)
+    scans = [detail for detail in plan if FULL_SCAN.search(detail)]
+    assert not scans, (project_id, sort_by.value, plan)
+
+
+async def test_export_query_uses_indexes():
+    for active in _filter_combinations():
+        plan = await _explain(build_export_query(workspace_id=1, filters=_build_filters(active)))
+        scans = [detail for detail in plan if FULL_SCAN.search(detail)]
+        assert not scans, (active, plan)
+        if not active:
+            # 全量导出按主键顺序读 workspace_id 索引，不需要对整个工作区排序
+            assert TEMP_SORT not in plan, plan
@@ -0,0 +1,156 @@
+from httpx import AsyncClient
+
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+async def _search(client: AsyncClient, headers: dict[str, str], workspace_id: int, **params):
+    resp = await client.get(
+        f"/workspaces/{workspace_id}/search",
+        params=params,
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["items"]
+
+
+class TestSearch:
+    async def test_search_tasks_and_comments_ranked(self, client: AsyncClient):
+        _, headers = await _register_login(client, "search_user")
+        workspace_id = await create_workspace(client, headers, "search-space")
+        project_id = await create_project(client, headers, workspace_id, "search-project")
+
+        in_title = await create_task(
+            client, headers, workspace_id, project_id, "Fix login timeout"
+        )
+        in_description = await create_task(
+            client,
+            headers,
+            workspace_id,
+            project_id,
+            "Session cleanup",
+            description="The login page keeps spinning after the timeout fires",
+        )
+        comment_resp = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{in_description}/comments",
+            json={"content": "Reproduced the timeout on staging"},
+            headers=headers,
+        )
+        assert comment_resp.status_code == 201
+        comment_id = comment_resp.json()["id"]
+
+        hits = await _search(client, headers, workspace_id, q="timeout")
+        assert [(hit["type"], hit["task_id"]) for hit in hits][0] == ("task", in_title)
+        assert {(hit["type"], hit["task_id"], hit["comment_id"]) for hit in hits} == {
+            ("task", in_title, None),
+            ("task", in_description, None),
+            ("comment", in_description, comment_id),
+        }
+        assert all("<mark>timeout</mark>" in hit["snippet"].lower() for hit in hits)
+        assert hits == sorted(hits, key=lambda hit: hit["score"], reverse=True)
+
+        comment_hits = await _search(client, headers, workspace_id, q="timeout", type="comment")
+        assert [hit["comment_id"] for hit in comment_hits] == [comment_id]
+        assert comment_hits[0]["title"] == "Session cleanup"
+
+        both_words = await _search(client, headers, workspace_id, q="login timeout")
+        assert {hit["task_id"] for hit in both_words} == {in_title, in_description}
+
+        prefix = await _search(client, headers, workspace_id, q="reprod*")
+        assert [hit["comment_id"] for hit in prefix] == [comment_id]
+
+        syntax = await _search(client, headers, workspace_id, q='"timeout" OR (NEAR')
+        assert syntax == []
+
+        empty = await client.get(
+            f"/workspaces/{workspace_id}/search",
+            params={"q": "()"},
+            headers=headers,
+        )
+        assert empty.status_code == 400
+
+    async def test_search_index_follows_writes(self, client: AsyncClient):
+        _, headers = await _register_login(client, "search_sync_user")
+        workspace_id = await create_workspace(client, headers, "search-sync-space")
+        project_id = await create_project(client, headers, workspace_id, "search-sync-project")
+        task_id = await create_task(client, headers, workspace_id, project_id, "Draft roadmap")
+
+        comment_resp = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{task_id}/comments",
+            json={"content": "needs budget numbers"},
+            headers=headers,
+        )
+        comment_id = comment_resp.json()["id"]
+
+        patch = await client.patch(
+            f"/workspaces/{workspace_id}/tasks/{task_id}",
+            json={"version": 1, "title": "Publish roadmap"},
+            headers=headers,
+        )
+        assert patch.status_code == 200
+        assert await _search(client, headers, workspace_id, q="draft") == []
+        assert len(await _search(client, headers, workspace_id, q="publish")) == 1
+
+        edit = await client.patch(
+            f"/workspaces/{workspace_id}/tasks/{task_id}/comments/{comment_id}",
+            json={"content": "needs headcount numbers"},
+            headers=headers,
+        )
+        assert edit.status_code == 200
+        assert await _search(client, headers, workspace_id, q="budget") == []
+        assert len(await _search(client, headers, workspace_id, q="headcount")) == 1
+
+        delete = await client.delete(
+            f"/workspaces/{workspace_id}/tasks/{task_id}",
+            headers=headers,
+        )
+        assert delete.status_code == 204
+        assert await _search(client, headers, workspace_id, q="roadmap") == []
+        assert await _search(client, headers, workspace_id, q="headcount") == []
+
+    async def test_search_is_scoped_to_workspace(self, client: AsyncClient):
+        _, alice_headers = await _register_login(client, "search_alice")
+        _, bob_headers = await _register_login(client, "search_bob")
+
+        alice_ws = await create_workspace(client, alice_headers, "alice-search")
+        alice_project = await create_project(client, alice_headers, alice_ws, "p")
+        await create_task(client, alice_headers, alice_ws, alice_project, "quarterly invoice")
+
+        bob_ws = await create_workspace(client, bob_headers, "bob-search")
+        bob_project = await create_project(client, bob_headers, bob_ws, "p")
+        bob_task = await create_task(client, bob_headers, bob_ws, bob_project, "invoice template")
+
+        bob_hits = await _search(client, bob_headers, bob_ws, q="invoice")
+        assert [hit["task_id"] for hit in bob_hits] == [bob_task]
+
+        forbidden = await client.get(
+            f"/workspaces/{alice_ws}/search",
+            params={"q": "invoice"},
+            headers=bob_headers,
+        )
+        assert forbidden.status_code == 404
+
+    async def test_snippet_escapes_html(self, client: AsyncClient):
+        _, headers = await _register_login(client, "search_xss")
+        workspace_id = await create_workspace(client, headers, "search-xss")
+        project_id = await create_project(client, headers, workspace_id, "search-xss-project")
+        task_id = await create_task(
+            client, headers, workspace_id, project_id, "<script>alert(1)</script> deploy"
+        )
+        comment_resp = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{task_id}/comments",
+            json={"content": "<img src=x onerror=alert(1)> broken"},
+            headers=headers,
+        )
+        assert comment_resp.status_code == 201
+
+        [task_hit] = await _search(client, headers, workspace_id, q="script", type="task")
+        assert task_hit["snippet"] == (
+            "&lt;<mark>script</mark>&gt;alert(1)&lt;/<mark>script</mark>&gt; deploy"
+        )
+        # title 是纯文本字段，原样返回
+        assert task_hit["title"] == "<script>alert(1)</script> deploy"
+
+        [comment_hit] = await _search(client, headers, workspace_id, q="onerror")
+        assert "<img" not in comment_hit["snippet"]
+        assert "&lt;img src=x <mark>onerror</mark>=alert(1)&gt;" in comment_hit["snippet"]
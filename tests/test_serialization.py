@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+from app.models.task import Task
+from app.schemas.common import PageResponse, TotalMode
+from app.schemas.task import BoardResponse, TaskResponse, task_response_model
+from app.serialization import FastJSONResponse, dump_trusted, dump_trusted_rows, response_columns
+from tests.conftest import test_session as session_factory
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+def _task(task_id: int, **overrides) -> Task:
+    created = datetime(2026, 3, 1, 8, 30, 15, 123456, tzinfo=timezone(timedelta(hours=8)))
+    values = {
+        "id": task_id,
+        "workspace_id": 1,
+        "project_id": 2,
+        "title": "修复登录超时 ✓ \"quoted\" \\ <b>",
+        "description": "多行\n描述   emoji 🚀",
+        "status": "in_progress",
+        "creator_id": 3,
+        "assignee_id": None,
+        "due_at": None,
+        "version": 4,
+        "created_at": created,
+        "updated_at": created.astimezone(timezone.utc),
+    }
+    return Task(**{**values, **overrides})
+
+
+async def _validated_body(path: str, model, content) -> bytes:
+    """原路径：FastAPI 按 ``response_model`` 校验并序列化。"""
+    app = FastAPI()
+    app.get(path, response_model=model)(lambda: content)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return (await client.get(path)).content
+
+
+class TestFastJSONResponse:
+    async def test_task_bytes_match_response_model(self):
+        task = _task(1)
+        expected = await _validated_body("/task", TaskResponse, TaskResponse.model_validate(task))
+        assert FastJSONResponse(dump_trusted(task, TaskResponse)).body == expected
+
+    async def test_page_bytes_match_response_model(self):
+        due = datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc)
+        tasks = [_task(1), _task(2, due_at=due, assignee_id=5, status="done")]
+        page = {
+            "items": [TaskResponse.model_validate(task) for task in tasks],
+            "total": 2,
+            "total_mode": TotalMode.exact,
+            "skip": 0,
+            "limit": 20,
+            "next_cursor": None,
+        }
+        expected = await _validated_body("/page", PageResponse[TaskResponse], page)
+        fast = {**page, "items": [dump_trusted(task, TaskResponse) for task in tasks]}
+        assert FastJSONResponse(fast).body == expected
+
+    async def test_endpoints_match_response_model(self, client: AsyncClient):
+        """真实接口的输出与把同样的数据交给 response_model 得到的字节一致（含键顺序）"""
+        _, headers = await _register_login(client, "bytes_user")
+        workspace_id = await create_workspace(client, headers, "bytes-space")
+        project_id = await create_project(client, headers, workspace_id, "bytes-project")
+        task_id = await create_task(
+            client, headers, workspace_id, project_id, "中文标题 ✓", description="说明 🚀"
+        )
+        await create_task(
+            client,
+            headers,
+            workspace_id,
+            project_id,
+            "带截止时间",
+            due_at="2026-12-31T23:59:00+08:00",
+        )
+        base = f"/workspaces/{workspace_id}"
+        cases = [
+            (f"{base}/tasks", {"limit": 1}, PageResponse[TaskResponse]),
+            (f"{base}/tasks/{task_id}", {}, TaskResponse),
+            (f"{base}/board", {}, BoardResponse),
+        ]
+        for path, params, model in cases:
+            resp = await client.get(path, params=params, headers=headers)
+            assert resp.status_code == 200, resp.text
+            expected = await _validated_body("/x", model, model.model_validate_json(resp.content))
+            assert resp.content == expected, path
+
+    async def test_core_rows_match_model_validate(self, client: AsyncClient):
+        """Core 查询的 Row 经 dump_trusted_rows 输出的字节，与同一批 ORM 对象经
+        TaskResponse.model_validate 再由 response_model 序列化的字节一致（含 fields= 子集）"""
+        owner_id, headers = await _register_login(client, "rows_user")
+        workspace_id = await create_workspace(client, headers, "rows-space")
+        project_id = await create_project(client, headers, workspace_id, "rows-project")
+        await create_task(client, headers, workspace_id, project_id, "无指派 ✓")
+        await create_task(
+            client,
+            headers,
+            workspace_id,
+            project_id,
+            "带截止时间",
+            description="说明 🚀",
+            assignee_id=owner_id,
+            due_at="2026-12-31T23:59:59.123456+08:00",
+        )
+
+        for fields in (None, frozenset({"id", "title", "assignee_id", "due_at", "updated_at"})):
+            model = task_response_model(fields)
+            async with session_factory() as session:
+                rows = (
+                    await session.execute(
+                        select(*response_columns(Task.__table__, model))
+                        .where(Task.workspace_id == workspace_id)
+                        .order_by(Task.id)
+                    )
+                ).all()
+                tasks = (
+                    await session.scalars(
+                        select(Task).where(Task.workspace_id == workspace_id).order_by(Task.id)
+                    )
+                ).all()
+
+            assert [row.assignee_id for row in rows] == [None, owner_id]
+            expected = await _validated_body(
+                "/rows", list[model], [model.model_validate(task) for task in tasks]
+            )
+            assert FastJSONResponse(dump_trusted_rows(rows, model)).body == expected, fields
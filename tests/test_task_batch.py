@@ -0,0 +1,205 @@
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from tests.conftest import test_engine
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+async def _batch(client: AsyncClient, headers: dict, workspace_id: int, ops: list, **params):
+    resp = await client.post(
+        f"/workspaces/{workspace_id}/tasks/batch",
+        json={"operations": ops},
+        params=params,
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+class TestTaskBatch:
+    async def test_atomic_batch_applies_all_operations(self, client: AsyncClient):
+        owner_id, headers = await _register_login(client, "batch_owner")
+        workspace_id = await create_workspace(client, headers, "batch-space")
+        project_id = await create_project(client, headers, workspace_id, "batch-project")
+        first = await create_task(client, headers, workspace_id, project_id, "first")
+        second = await create_task(client, headers, workspace_id, project_id, "second")
+
+        payload = await _batch(
+            client,
+            headers,
+            workspace_id,
+            [
+                {"op": "create", "project_id": project_id, "title": "new", "assignee_id": owner_id},
+                {"op": "update", "task_id": first, "version": 1, "title": "first v2"},
+                {"op": "transition", "task_id": first, "version": 2, "to_status": "in_progress"},
+                {"op": "delete", "task_id": second, "version": 1},
+            ],
+        )
+        assert payload["committed"] is True
+        results = payload["results"]
+        assert [item["status"] for item in results] == [201, 200, 200, 204]
+        created = results[0]["task"]
+        assert (created["title"], created["assignee_id"], created["version"]) == (
+            "new",
+            owner_id,
+            1,
+        )
+        # 同一任务的多个操作依次生效，返回批量执行后的状态
+        assert results[1]["task"] == results[2]["task"]
+        assert (results[2]["task"]["title"], results[2]["task"]["status"]) == (
+            "first v2",
+            "in_progress",
+        )
+        assert results[3]["task"] is None and results[3]["task_id"] == second
+
+        detail = await client.get(f"/workspaces/{workspace_id}/tasks/{first}", headers=headers)
+        assert detail.json()["version"] == 3
+        gone = await client.get(f"/workspaces/{workspace_id}/tasks/{second}", headers=headers)
+        assert gone.status_code == 404
+        changes = await client.get(f"/workspaces/{workspace_id}/tasks/changes", headers=headers)
+        assert changes.json()["deleted"] == [second]
+
+    async def test_atomic_failure_rolls_back(self, client: AsyncClient):
+        _, headers = await _register_login(client, "batch_atomic")
+        workspace_id = await create_workspace(client, headers, "batch-atomic-space")
+        project_id = await create_project(client, headers, workspace_id, "batch-atomic")
+        task_id = await create_task(client, headers, workspace_id, project_id, "atomic")
+
+        payload = await _batch(
+            client,
+            headers,
+            workspace_id,
+            [
+                {"op": "update", "task_id": task_id, "version": 1, "title": "changed"},
+                {"op": "transition", "task_id": task_id, "to_status": "done"},
+                {"op": "delete", "task_id": task_id},
+            ],
+        )
+        assert payload["committed"] is False
+        assert [(item["status"], item["index"]) for item in payload["results"]] == [
+            (424, 0),
+            (400, 1),
+            (424, 2),
+        ]
+        assert "Invalid status transition" in payload["results"][1]["detail"]
+
+        detail = await client.get(f"/workspaces/{workspace_id}/tasks/{task_id}", headers=headers)
+        assert (detail.json()["title"], detail.json()["version"]) == ("atomic", 1)
+        audit = await client.get(f"/workspaces/{workspace_id}/audit-logs", headers=headers)
+        assert [log["action"] for log in audit.json()["items"]].count("update") == 0
+
+    async def test_non_atomic_reports_per_item_errors(self, client: AsyncClient):
+        owner_id, headers = await _register_login(client, "batch_partial")
+        member_id, member_headers = await _register_login(client, "batch_member")
+        outsider_id, _ = await _register_login(client, "batch_outsider")
+        workspace_id = await create_workspace(client, headers, "batch-partial-space")
+        resp = await client.post(
+            f"/workspaces/{workspace_id}/members",
+            json={"user_id": member_id, "role": "member"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        project_id = await create_project(client, headers, workspace_id, "batch-partial")
+        owned = await create_task(client, headers, workspace_id, project_id, "owner's")
+        mine = await create_task(client, member_headers, workspace_id, project_id, "member's")
+
+        payload = await _batch(
+            client,
+            member_headers,
+            workspace_id,
+            [
+                {"op": "update", "task_id": mine, "version": 1, "assignee_id": outsider_id},
+                {"op": "update", "task_id": mine, "version": 9, "title": "stale"},
+                {"op": "transition", "task_id": owned, "to_status": "in_progress"},
+                {"op": "delete", "task_id": 999999},
+                {"op": "create", "project_id": 999999, "title": "orphan"},
+                {"op": "update", "task_id": mine, "version": 1, "assignee_id": owner_id},
+            ],
+            atomic="false",
+        )
+        assert payload["committed"] is True
+        assert [item["status"] for item in payload["results"]] == [404, 409, 403, 404, 404, 200]
+        assert payload["results"][5]["task"]["assignee_id"] == owner_id
+        assert payload["results"][5]["task"]["version"] == 2
+
+    async def test_shared_lookups_and_validation(self, client: AsyncClient):
+        _, headers = await _register_login(client, "batch_queries")
+        _, outsider_headers = await _register_login(client, "batch_queries_out")
+        workspace_id = await create_workspace(client, headers, "batch-query-space")
+        project_id = await create_project(client, headers, workspace_id, "batch-query")
+        task_ids = [
+            await create_task(client, headers, workspace_id, project_id, f"q{i}") for i in range(10)
+        ]
+        ops = [
+            {"op": "transition", "task_id": task_id, "version": 1, "to_status": "in_progress"}
+            for task_id in task_ids
+        ]
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            payload = await _batch(client, headers, workspace_id, ops)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+        assert [item["status"] for item in payload["results"]] == [200] * 10
+        task_selects = [sql for sql in statements if sql.lstrip().startswith("SELECT tasks.")]
+        assert len(task_selects) == 2
+
+        url = f"/workspaces/{workspace_id}/tasks/batch"
+        missing_version = {"op": "update", "task_id": task_ids[0], "title": "x"}
+        for body in ({"operations": []}, {"operations": [missing_version]}):
+            assert (await client.post(url, json=body, headers=headers)).status_code == 422
+        resp = await client.post(url, json={"operations": ops[:1]}, headers=outsider_headers)
+        assert resp.status_code == 404
+
+    async def test_update_is_conditional_on_version(self, client: AsyncClient):
+        """批量中的更新与单个接口一样用 UPDATE ... WHERE version = ? 写入，
+        加载之后被并发修改的任务返回 409 且不被覆盖"""
+        _, headers = await _register_login(client, "batch_cas")
+        workspace_id = await create_workspace(client, headers, "batch-cas-space")
+        project_id = await create_project(client, headers, workspace_id, "batch-cas")
+        raced = await create_task(client, headers, workspace_id, project_id, "raced")
+        calm = await create_task(client, headers, workspace_id, project_id, "calm")
+
+        statements: list[str] = []
+        raced_once = False
+
+        def concurrent_write(conn, cursor, statement, parameters, context, executemany):
+            nonlocal raced_once
+            statements.append(statement)
+            if statement.lstrip().startswith("UPDATE workspaces") and not raced_once:
+                # 另一个请求在批量加载任务之后、条件更新之前修改了该任务
+                raced_once = True
+                cursor.execute(
+                    "UPDATE tasks SET title = 'theirs', version = version + 1 WHERE id = ?",
+                    (raced,),
+                )
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", concurrent_write)
+        try:
+            payload = await _batch(
+                client,
+                headers,
+                workspace_id,
+                [
+                    {"op": "update", "task_id": raced, "version": 1, "title": "ours"},
+                    {"op": "update", "task_id": calm, "version": 1, "title": "calm v2"},
+                ],
+                atomic="false",
+            )
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", concurrent_write)
+
+        assert [item["status"] for item in payload["results"]] == [409, 200]
+        assert payload["results"][1]["task"]["version"] == 2
+        task_updates = [sql for sql in statements if sql.lstrip().startswith("UPDATE tasks SET")]
+        assert len(task_updates) == 2
+        assert all("tasks.version = ?" in sql and "RETURNING" in sql for sql in task_updates)
+
+        detail = await client.get(f"/workspaces/{workspace_id}/tasks/{raced}", headers=headers)
+        assert (detail.json()["title"], detail.json()["version"]) == ("theirs", 2)
@@ -0,0 +1,135 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import tasks as task_service
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+async def _add_member(client: AsyncClient, headers: dict, workspace_id: int, user_id: int):
+    resp = await client.post(
+        f"/workspaces/{workspace_id}/members",
+        json={"user_id": user_id, "role": "member"},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+
+
+class TestTaskBulkUpdate:
+    async def test_reassign_by_filter_in_chunks(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(task_service, "BULK_UPDATE_CHUNK_SIZE", 2)
+        _, headers = await _register_login(client, "bulk_owner")
+        leaver_id, _ = await _register_login(client, "bulk_leaver")
+        heir_id, _ = await _register_login(client, "bulk_heir")
+        workspace_id = await create_workspace(client, headers, "bulk-space")
+        await _add_member(client, headers, workspace_id, leaver_id)
+        await _add_member(client, headers, workspace_id, heir_id)
+        project_id = await create_project(client, headers, workspace_id, "bulk-project")
+        base = f"/workspaces/{workspace_id}/tasks"
+
+        leaver_tasks = []
+        for i in range(5):
+            task_id = await create_task(
+                client, headers, workspace_id, project_id, f"leaver {i}", assignee_id=leaver_id
+            )
+            leaver_tasks.append(task_id)
+        other = await create_task(client, headers, workspace_id, project_id, "other")
+        token = (await client.get(f"{base}/changes", headers=headers)).json()["next_token"]
+
+        url = f"{base}/bulk-update"
+        params = {"assignee_id": leaver_id}
+        dry = await client.post(
+            url,
+            params={**params, "dry_run": "true"},
+            json={"assignee_id": heir_id},
+            headers=headers,
+        )
+        assert dry.status_code == 200, dry.text
+        assert dry.json() == {"dry_run": True, "matched": 5, "updated": 5, "skipped": 0}
+        unchanged = await client.get(base, params=params, headers=headers)
+        assert unchanged.json()["total"] == 5
+
+        resp = await client.post(url, params=params, json={"assignee_id": heir_id}, headers=headers)
+        assert resp.json() == {"dry_run": False, "matched": 5, "updated": 5, "skipped": 0}
+
+        heir = await client.get(
+            base,
+            params={"assignee_id": heir_id, "sort_by": "id", "sort_order": "asc"},
+            headers=headers,
+        )
+        assert heir.json()["total"] == 5
+        assert [(t["id"], t["version"]) for t in heir.json()["items"]] == [
+            (task_id, 2) for task_id in leaver_tasks
+        ]
+        assert (await client.get(base, params=params, headers=headers)).json()["total"] == 0
+        detail = await client.get(f"{base}/{other}", headers=headers)
+        assert detail.json()["version"] == 1
+
+        changes = await client.get(f"{base}/changes", params={"since": token}, headers=headers)
+        assert sorted(item["id"] for item in changes.json()["items"]) == leaver_tasks
+
+        audit = await client.get(f"/workspaces/{workspace_id}/audit-logs", headers=headers)
+        bulk = [log for log in audit.json()["items"] if log["action"] == "bulk_update"]
+        # 每块（2 个任务）一条记录，changes 列出该块的任务 id
+        assert len(bulk) == 3
+        assert all(log["entity_type"] == "workspace" for log in bulk)
+        details = [json.loads(log["changes"]) for log in bulk]
+        assert sorted(i for d in details for i in d["task_ids"]) == leaver_tasks
+        assert all(d["patch"] == {"assignee_id": heir_id} for d in details)
+
+    async def test_transition_checks_allowed_transitions(self, client: AsyncClient):
+        _, headers = await _register_login(client, "bulk_transition")
+        workspace_id = await create_workspace(client, headers, "bulk-transition-space")
+        source = await create_project(client, headers, workspace_id, "source")
+        target = await create_project(client, headers, workspace_id, "target")
+        base = f"/workspaces/{workspace_id}/tasks"
+        task_ids = [
+            await create_task(client, headers, workspace_id, source, f"t{i}") for i in range(3)
+        ]
+        resp = await client.post(
+            f"{base}/{task_ids[0]}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+
+        # todo -> done 不允许，只有 in_progress 的任务会被修改
+        resp = await client.post(
+            f"{base}/bulk-update",
+            params={"project_id": source},
+            json={"to_status": "done", "project_id": target},
+            headers=headers,
+        )
+        assert resp.json() == {"dry_run": False, "matched": 3, "updated": 1, "skipped": 2}
+
+        moved = await client.get(base, params={"project_id": target}, headers=headers)
+        assert [(t["id"], t["status"], t["version"]) for t in moved.json()["items"]] == [
+            (task_ids[0], "done", 3)
+        ]
+        todo = await client.get(base, params={"status": "todo"}, headers=headers)
+        assert todo.json()["total"] == 2
+
+    async def test_validation_and_permissions(self, client: AsyncClient):
+        _, headers = await _register_login(client, "bulk_guard")
+        member_id, member_headers = await _register_login(client, "bulk_guard_member")
+        outsider_id, _ = await _register_login(client, "bulk_guard_outsider")
+        workspace_id = await create_workspace(client, headers, "bulk-guard-space")
+        await _add_member(client, headers, workspace_id, member_id)
+        url = f"/workspaces/{workspace_id}/tasks/bulk-update"
+
+        for body in ({}, {"project_id": None}, {"to_status": "archived"}):
+            assert (await client.post(url, json=body, headers=headers)).status_code == 422
+        resp = await client.post(url, json={"assignee_id": outsider_id}, headers=headers)
+        assert resp.status_code == 404
+        resp = await client.post(url, json={"project_id": 999999}, headers=headers)
+        assert resp.status_code == 404
+        resp = await client.post(url, json={"assignee_id": None}, headers=member_headers)
+        assert resp.status_code == 403
+        resp = await client.post(url, json={"assignee_id": None}, headers=headers)
+        assert resp.json()["matched"] == 0
@@ -0,0 +1,124 @@
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from tests.conftest import test_engine
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+class TestTaskCompareAndSwap:
+    async def test_update_is_single_conditional_statement(self, client: AsyncClient):
+        _, headers = await _register_login(client, "cas_owner")
+        workspace_id = await create_workspace(client, headers, "cas-space")
+        project_id = await create_project(client, headers, workspace_id, "cas-project")
+        task_id = await create_task(client, headers, workspace_id, project_id, "cas task")
+        url = f"/workspaces/{workspace_id}/tasks/{task_id}"
+        before = (await client.get(url, headers=headers)).json()
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(" ".join(statement.split()))
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            resp = await client.patch(url, json={"title": "renamed", "version": 1}, headers=headers)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["title"] == "renamed"
+        assert resp.json()["version"] == 2
+        assert resp.json()["updated_at"] >= before["updated_at"]
+        assert resp.headers["ETag"] == f'"task-{task_id}-v2"'
+        task_statements = [sql for sql in statements if " tasks" in sql]
+        assert len(task_statements) == 1
+        assert task_statements[0].startswith("UPDATE tasks SET")
+        assert "RETURNING" in task_statements[0]
+
+        audit = await client.get(f"/workspaces/{workspace_id}/audit-logs", headers=headers)
+        update_log = next(log for log in audit.json()["items"] if log["action"] == "update")
+        assert '"version_from": 1' in update_log["changes"]
+        assert '"version_to": 2' in update_log["changes"]
+
+    async def test_failed_conditions_keep_error_precedence(self, client: AsyncClient):
+        _, headers = await _register_login(client, "cas_admin")
+        member_id, member_headers = await _register_login(client, "cas_member")
+        workspace_id = await create_workspace(client, headers, "cas-errors")
+        resp = await client.post(
+            f"/workspaces/{workspace_id}/members",
+            json={"user_id": member_id, "role": "member"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        project_id = await create_project(client, headers, workspace_id, "cas-errors-project")
+        task_id = await create_task(client, headers, workspace_id, project_id, "guarded")
+        url = f"/workspaces/{workspace_id}/tasks/{task_id}"
+
+        missing = await client.patch(
+            f"/workspaces/{workspace_id}/tasks/999999",
+            json={"title": "x", "version": 1},
+            headers=headers,
+        )
+        assert missing.status_code == 404
+        forbidden = await client.patch(
+            url, json={"title": "x", "version": 1}, headers=member_headers
+        )
+        assert forbidden.status_code == 403
+        stale = await client.patch(url, json={"title": "x", "version": 5}, headers=headers)
+        assert stale.status_code == 409
+        stale_etag = await client.patch(
+            url, json={"title": "x"}, headers={**headers, "If-Match": '"task-999-v1"'}
+        )
+        assert stale_etag.status_code == 412
+        unknown_assignee = await client.patch(
+            url, json={"assignee_id": 999999, "version": 1}, headers=headers
+        )
+        assert unknown_assignee.status_code == 404
+        assert unknown_assignee.json()["detail"] == "User not in workspace"
+
+        detail = await client.get(url, headers=headers)
+        assert detail.json()["version"] == 1
+        assert detail.json()["title"] == "guarded"
+
+        listed = await client.patch(
+            url,
+            json={"title": "any of them"},
+            headers={**headers, "If-Match": f'W/"task-{task_id}-v1", "task-{task_id}-v1"'},
+        )
+        assert listed.status_code == 200
+        assert listed.json()["version"] == 2
+
+        # 同一个版本号只有第一次写入能成功
+        first = await client.patch(url, json={"title": "first", "version": 2}, headers=headers)
+        second = await client.patch(url, json={"title": "second", "version": 2}, headers=headers)
+        assert (first.status_code, second.status_code) == (200, 409)
+
+    async def test_transition_and_delete_use_conditional_writes(self, client: AsyncClient):
+        _, headers = await _register_login(client, "cas_flow")
+        workspace_id = await create_workspace(client, headers, "cas-flow")
+        project_id = await create_project(client, headers, workspace_id, "cas-flow-project")
+        task_id = await create_task(client, headers, workspace_id, project_id, "flowing")
+        url = f"/workspaces/{workspace_id}/tasks/{task_id}"
+
+        moved = await client.post(
+            f"{url}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers={**headers, "If-Match": f'"task-{task_id}-v1"'},
+        )
+        assert moved.status_code == 200, moved.text
+        assert moved.json()["status"] == "in_progress"
+        assert moved.json()["version"] == 2
+        assert moved.headers["ETag"] == f'"task-{task_id}-v2"'
+
+        stale_delete = await client.delete(
+            url, headers={**headers, "If-Match": f'"task-{task_id}-v1"'}
+        )
+        assert stale_delete.status_code == 412
+        assert (await client.get(url, headers=headers)).status_code == 200
+
+        deleted = await client.delete(url, headers={**headers, "If-Match": f'"task-{task_id}-v2"'})
+        assert deleted.status_code == 204
+        assert (await client.get(url, headers=headers)).status_code == 404
+
+        changes = await client.get(f"/workspaces/{workspace_id}/tasks/changes", headers=headers)
+        assert changes.json()["deleted"] == [task_id]
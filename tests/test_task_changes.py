@@ -0,0 +1,114 @@
+from httpx import AsyncClient
+
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+async def _sync(client: AsyncClient, headers: dict, workspace_id: int, **params) -> dict:
+    resp = await client.get(
+        f"/workspaces/{workspace_id}/tasks/changes",
+        params=params,
+        headers=headers,
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+class TestTaskChanges:
+    async def test_upserts_and_tombstones_since_token(self, client: AsyncClient):
+        _, headers = await _register_login(client, "sync_owner")
+        workspace_id = await create_workspace(client, headers, "sync-space")
+        project_id = await create_project(client, headers, workspace_id, "sync-project")
+        first = await create_task(client, headers, workspace_id, project_id, "first")
+        second = await create_task(client, headers, workspace_id, project_id, "second")
+
+        initial = await _sync(client, headers, workspace_id)
+        assert [item["id"] for item in initial["items"]] == [first, second]
+        assert initial["deleted"] == []
+        assert initial["has_more"] is False
+        token = initial["next_token"]
+
+        caught_up = await _sync(client, headers, workspace_id, since=token)
+        assert caught_up == {**caught_up, "items": [], "deleted": [], "next_token": token}
+
+        base = f"/workspaces/{workspace_id}/tasks"
+        patched = await client.patch(
+            f"{base}/{first}", json={"version": 1, "title": "first v2"}, headers=headers
+        )
+        assert patched.status_code == 200
+        assert (await client.delete(f"{base}/{second}", headers=headers)).status_code == 204
+
+        delta = await _sync(client, headers, workspace_id, since=token)
+        assert [(item["id"], item["title"]) for item in delta["items"]] == [(first, "first v2")]
+        assert delta["deleted"] == [second]
+
+        # 重新写入同一任务只出现一次，且位置移到最新
+        await client.post(
+            f"{base}/{first}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers=headers,
+        )
+        again = await _sync(client, headers, workspace_id, since=delta["next_token"])
+        assert [item["status"] for item in again["items"]] == ["in_progress"]
+        assert again["deleted"] == []
+
+    async def test_paging_through_stream(self, client: AsyncClient):
+        _, headers = await _register_login(client, "sync_pager")
+        workspace_id = await create_workspace(client, headers, "sync-page-space")
+        project_id = await create_project(client, headers, workspace_id, "sync-page")
+        task_ids = [
+            await create_task(client, headers, workspace_id, project_id, f"t{i}") for i in range(5)
+        ]
+        deleted_id = task_ids.pop(2)
+        resp = await client.delete(
+            f"/workspaces/{workspace_id}/tasks/{deleted_id}", headers=headers
+        )
+        assert resp.status_code == 204
+
+        seen: list[int] = []
+        deleted: list[int] = []
+        token = None
+        while True:
+            params = {"limit": 2} if token is None else {"limit": 2, "since": token}
+            page = await _sync(client, headers, workspace_id, **params)
+            assert len(page["items"]) + len(page["deleted"]) <= 2
+            seen.extend(item["id"] for item in page["items"])
+            deleted.extend(page["deleted"])
+            token = page["next_token"]
+            if not page["has_more"]:
+                break
+        assert seen == task_ids
+        assert deleted == [deleted_id]
+
+    async def test_project_delete_records_tombstones(self, client: AsyncClient):
+        _, headers = await _register_login(client, "sync_project")
+        workspace_id = await create_workspace(client, headers, "sync-project-space")
+        project_id = await create_project(client, headers, workspace_id, "doomed")
+        task_ids = [
+            await create_task(client, headers, workspace_id, project_id, f"d{i}") for i in range(3)
+        ]
+        token = (await _sync(client, headers, workspace_id))["next_token"]
+
+        resp = await client.delete(
+            f"/workspaces/{workspace_id}/projects/{project_id}", headers=headers
+        )
+        assert resp.status_code == 204
+
+        delta = await _sync(client, headers, workspace_id, since=token)
+        assert delta["items"] == []
+        assert sorted(delta["deleted"]) == task_ids
+        listed = await client.get(f"/workspaces/{workspace_id}/tasks", headers=headers)
+        assert listed.json()["items"] == []
+
+    async def test_invalid_token_and_non_member(self, client: AsyncClient):
+        _, headers = await _register_login(client, "sync_guard")
+        _, outsider_headers = await _register_login(client, "sync_outsider")
+        workspace_id = await create_workspace(client, headers, "sync-guard-space")
+        url = f"/workspaces/{workspace_id}/tasks/changes"
+
+        for token in ("not-a-token", "eyJjIjoxfQ"):
+            resp = await client.get(url, params={"since": token}, headers=headers)
+            assert resp.status_code == 400
+
+        resp = await client.get(url, headers=outsider_headers)
+        assert resp.status_code == 404
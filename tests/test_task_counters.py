@@ -0,0 +1,79 @@
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.models.task_counter import TaskCounter
+from app.schemas.task import TaskStatus
+from app.services.task_counters import (
+    count_tasks_by_status,
+    rebuild_task_counters,
+    verify_task_counters,
+)
+from tests.conftest import test_session as session_factory
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+class TestTaskCounters:
+    async def test_counters_follow_task_writes(self, client: AsyncClient):
+        user_id, headers = await _register_login(client, "counter_user")
+        workspace_id = await create_workspace(client, headers, "counter-space")
+        project_id = await create_project(client, headers, workspace_id, "counter-project")
+
+        first = await create_task(client, headers, workspace_id, project_id, "first")
+        second = await create_task(
+            client, headers, workspace_id, project_id, "second", assignee_id=user_id
+        )
+        third = await create_task(client, headers, workspace_id, project_id, "third")
+
+        transition = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{first}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers=headers,
+        )
+        assert transition.status_code == 200
+
+        assign = await client.patch(
+            f"/workspaces/{workspace_id}/tasks/{third}",
+            json={"version": 1, "assignee_id": user_id},
+            headers=headers,
+        )
+        assert assign.status_code == 200
+
+        delete_resp = await client.delete(
+            f"/workspaces/{workspace_id}/tasks/{second}",
+            headers=headers,
+        )
+        assert delete_resp.status_code == 204
+
+        async with session_factory() as db:
+            assert await verify_task_counters(db) == []
+            by_status = await count_tasks_by_status(db, workspace_id=workspace_id)
+        assert by_status[TaskStatus.todo] == 1
+        assert by_status[TaskStatus.in_progress] == 1
+
+        list_resp = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"assignee_id": user_id, "status": "todo"},
+            headers=headers,
+        )
+        assert list_resp.status_code == 200
+        assert list_resp.json()["total"] == 1
+
+    async def test_verify_reports_drift_and_rebuild_repairs(self, client: AsyncClient):
+        _, headers = await _register_login(client, "drift_user")
+        workspace_id = await create_workspace(client, headers, "drift-space")
+        project_id = await create_project(client, headers, workspace_id, "drift-project")
+        await create_task(client, headers, workspace_id, project_id, "drift-task")
+
+        async with session_factory() as db:
+            await db.execute(update(TaskCounter).values(task_count=TaskCounter.task_count + 5))
+            await db.commit()
+
+            drift = await verify_task_counters(db, workspace_id=workspace_id)
+            assert len(drift) == 1
+            assert drift[0]["expected"] == 1
+            assert drift[0]["actual"] == 6
+
+            await rebuild_task_counters(db, workspace_id=workspace_id)
+            await db.commit()
+            assert await verify_task_counters(db) == []
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import task_export
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+class TestTaskExport:
+    async def test_ndjson_and_csv_match_task_list(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        # 小批量，确保跨多个分批
+        monkeypatch.setattr(task_export, "EXPORT_BATCH_SIZE", 2)
+        _, headers = await _register_login(client, "export_owner")
+        workspace_id = await create_workspace(client, headers, "export-space")
+        project_id = await create_project(client, headers, workspace_id, "export-project")
+        task_ids = [
+            await create_task(client, headers, workspace_id, project_id, f"row, \"{i}\"")
+            for i in range(5)
+        ]
+        url = f"/workspaces/{workspace_id}/tasks/export"
+
+        listed = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"sort_by": "id", "sort_order": "asc"},
+            headers=headers,
+        )
+        expected = listed.json()["items"]
+
+        ndjson = await client.get(url, headers=headers)
+        assert ndjson.status_code == 200
+        assert ndjson.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="tasks-' in ndjson.headers["content-disposition"]
+        rows = [json.loads(line) for line in ndjson.text.splitlines()]
+        assert rows == expected
+
+        exported = await client.get(url, params={"format": "csv"}, headers=headers)
+        assert exported.status_code == 200
+        assert exported.headers["content-type"].startswith("text/csv")
+        records = list(csv.DictReader(io.StringIO(exported.text)))
+        assert [int(record["id"]) for record in records] == task_ids
+        assert records[0]["title"] == 'row, "0"'
+        assert records[0]["assignee_id"] == ""
+        assert records[0]["created_at"] == expected[0]["created_at"]
+
+    async def test_filters_and_permissions(self, client: AsyncClient):
+        _, headers = await _register_login(client, "export_filter")
+        _, outsider_headers = await _register_login(client, "export_outsider")
+        workspace_id = await create_workspace(client, headers, "export-filter-space")
+        project_id = await create_project(client, headers, workspace_id, "export-filter")
+        first = await create_task(client, headers, workspace_id, project_id, "tagged")
+        await create_task(client, headers, workspace_id, project_id, "plain")
+        await client.post(
+            f"/workspaces/{workspace_id}/tasks/{first}/tags",
+            json={"tag": "bi"},
+            headers=headers,
+        )
+        url = f"/workspaces/{workspace_id}/tasks/export"
+
+        resp = await client.get(url, params={"tag": "bi", "status": "todo"}, headers=headers)
+        assert [json.loads(line)["id"] for line in resp.text.splitlines()] == [first]
+
+        empty = await client.get(url, params={"format": "csv", "status": "done"}, headers=headers)
+        assert empty.text.splitlines() == [",".join(task_export.EXPORT_COLUMNS)]
+
+        resp = await client.get(
+            url,
+            params={"due_at_from": "2026-02-01T00:00:00", "due_at_to": "2026-01-01T00:00:00"},
+            headers=headers,
+        )
+        assert resp.status_code == 400
+        assert (await client.get(url, params={"format": "xml"}, headers=headers)).status_code == 422
+        assert (await client.get(url, headers=outsider_headers)).status_code == 404
@@ -0,0 +1,145 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import task_import
+from tests.helpers import create_project, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+def _ndjson(*records) -> str:
+    return "".join((r if isinstance(r, str) else json.dumps(r)) + "\n" for r in records)
+
+
+class TestTaskImport:
+    async def test_ndjson_import_in_chunks_with_row_errors(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(task_import, "IMPORT_CHUNK_SIZE", 2)
+        owner_id, headers = await _register_login(client, "import_owner")
+        outsider_id, _ = await _register_login(client, "import_outsider")
+        workspace_id = await create_workspace(client, headers, "import-space")
+        project_id = await create_project(client, headers, workspace_id, "import-project")
+
+        body = _ndjson(
+            {"title": "imported alpha", "assignee_id": owner_id},
+            {"title": "beta", "status": "done", "due_at": "2026-11-01T09:00:00Z"},
+            "{not json",
+            "",
+            {"title": ""},
+            {"title": "gamma", "assignee_id": outsider_id},
+            {"title": "delta", "status": "archived"},
+            ["not", "an", "object"],
+            {"title": "epsilon", "description": "last"},
+        )
+        resp = await client.post(
+            f"/workspaces/{workspace_id}/projects/{project_id}/tasks/import",
+            content=body,
+            headers={**headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200, resp.text
+        result = resp.json()
+        assert (result["created"], result["failed"]) == (3, 5)
+        assert [error["line"] for error in result["errors"]] == [3, 5, 6, 7, 8]
+        assert "title" in result["errors"][1]["detail"]
+        assert "not in workspace" in result["errors"][2]["detail"]
+
+        listed = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"sort_by": "id", "sort_order": "asc"},
+            headers=headers,
+        )
+        items = listed.json()["items"]
+        assert listed.json()["total"] == 3
+        assert [(t["title"], t["status"], t["version"]) for t in items] == [
+            ("imported alpha", "todo", 1),
+            ("beta", "done", 1),
+            ("epsilon", "todo", 1),
+        ]
+        assert items[0]["assignee_id"] == owner_id
+        assert items[0]["creator_id"] == owner_id
+
+        done = await client.get(
+            f"/workspaces/{workspace_id}/tasks", params={"status": "done"}, headers=headers
+        )
+        assert done.json()["total"] == 1
+
+        search = await client.get(
+            f"/workspaces/{workspace_id}/search", params={"q": "imported"}, headers=headers
+        )
+        assert [hit["task_id"] for hit in search.json()["items"]] == [items[0]["id"]]
+
+        changes = await client.get(f"/workspaces/{workspace_id}/tasks/changes", headers=headers)
+        assert len(changes.json()["items"]) == 3
+
+        audit = await client.get(f"/workspaces/{workspace_id}/audit-logs", headers=headers)
+        imports = [log for log in audit.json()["items"] if log["action"] == "import_tasks"]
+        assert len(imports) == 2
+
+    async def test_csv_round_trip_from_export(self, client: AsyncClient):
+        _, headers = await _register_login(client, "import_csv")
+        workspace_id = await create_workspace(client, headers, "import-csv-space")
+        source_id = await create_project(client, headers, workspace_id, "source")
+        target_id = await create_project(client, headers, workspace_id, "target")
+        base = f"/workspaces/{workspace_id}/projects"
+
+        csv_body = (
+            'title,description,status\n'
+            '"multi, line","first\nsecond ""quoted""",in_progress\n'
+            "plain,,\n"
+            "broken,row\n"
+            "too,many,values,here\n"
+        )
+        resp = await client.post(
+            f"{base}/{source_id}/tasks/import",
+            params={"format": "csv"},
+            content=csv_body.encode(),
+            headers=headers,
+        )
+        assert resp.status_code == 200, resp.text
+        assert resp.json()["created"] == 2
+        assert [error["line"] for error in resp.json()["errors"]] == [5, 6]
+
+        exported = await client.get(
+            f"/workspaces/{workspace_id}/tasks/export",
+            params={"format": "csv", "project_id": source_id},
+            headers=headers,
+        )
+        resp = await client.post(
+            f"{base}/{target_id}/tasks/import",
+            params={"format": "csv"},
+            content=exported.content,
+            headers=headers,
+        )
+        assert resp.json() == {"created": 2, "failed": 0, "errors": []}
+
+        copied = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"project_id": target_id, "sort_by": "id", "sort_order": "asc"},
+            headers=headers,
+        )
+        assert [(t["title"], t["description"], t["status"]) for t in copied.json()["items"]] == [
+            ("multi, line", 'first\nsecond "quoted"', "in_progress"),
+            ("plain", None, "todo"),
+        ]
+
+    async def test_rejects_bad_targets_and_encoding(self, client: AsyncClient):
+        _, headers = await _register_login(client, "import_guard")
+        _, outsider_headers = await _register_login(client, "import_guard_out")
+        workspace_id = await create_workspace(client, headers, "import-guard-space")
+        project_id = await create_project(client, headers, workspace_id, "import-guard")
+        url = f"/workspaces/{workspace_id}/projects/{project_id}/tasks/import"
+        body = _ndjson({"title": "x"})
+
+        missing = await client.post(
+            f"/workspaces/{workspace_id}/projects/999999/tasks/import",
+            content=body,
+            headers=headers,
+        )
+        assert missing.status_code == 404
+        assert (await client.post(url, content=body, headers=outsider_headers)).status_code == 404
+        bad = await client.post(url, content=b'{"title": "\xff"}\n', headers=headers)
+        assert bad.status_code == 400
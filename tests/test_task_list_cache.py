@@ -0,0 +1,137 @@
+import pytest
+from httpx import AsyncClient
+
+from app.cache import VersionedBytesCache
+from app.config import settings
+from app.services.tasks import task_page_cache
+from tests.helpers import create_project, create_task, create_workspace
+from tests.helpers import register_and_login_with_id as _register_login
+
+
+async def _cache_metrics(client: AsyncClient, cache: str) -> dict[str, float]:
+    """读取 /metrics 中某个进程内缓存的命中、未命中与淘汰计数。"""
+    text = (await client.get("/metrics")).text
+    samples = {
+        "hit": f'cache_requests_total{{cache="{cache}",result="hit"}}',
+        "miss": f'cache_requests_total{{cache="{cache}",result="miss"}}',
+        "eviction": f'cache_evictions_total{{cache="{cache}"}}',
+    }
+    values = dict.fromkeys(samples, 0.0)
+    for line in text.splitlines():
+        for key, sample in samples.items():
+            if line.startswith(sample + " "):
+                values[key] = float(line.split()[-1])
+    return values
+
+
+class TestTaskListCache:
+    async def test_identical_queries_hit_until_write(self, client: AsyncClient):
+        _, headers = await _register_login(client, "page_cache_owner")
+        _, outsider_headers = await _register_login(client, "page_cache_outsider")
+        workspace_id = await create_workspace(client, headers, "page-cache-space")
+        project_id = await create_project(client, headers, workspace_id, "page-cache")
+        task_id = await create_task(client, headers, workspace_id, project_id, "cached")
+        url = f"/workspaces/{workspace_id}/tasks"
+        params = {"status": "todo", "expand": "tags", "limit": 10}
+
+        hits, misses = task_page_cache.hits, task_page_cache.misses
+        first = await client.get(url, params=params, headers=headers)
+        second = await client.get(url, params=params, headers=headers)
+        assert first.status_code == second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert second.headers["content-type"] == "application/json"
+        assert (task_page_cache.hits - hits, task_page_cache.misses - misses) == (1, 1)
+
+        # 默认字段的页面同样可缓存，且与未缓存时的响应一致
+        plain = await client.get(url, headers=headers)
+        assert (await client.get(url, headers=headers)).json() == plain.json()
+        assert plain.json()["items"][0]["id"] == task_id
+
+        outsider = await client.get(url, params=params, headers=outsider_headers)
+        assert outsider.status_code == 404
+
+        resp = await client.post(
+            f"{url}/{task_id}/tags", json={"tag": "fresh"}, headers=headers
+        )
+        assert resp.status_code == 201
+        after = await client.get(url, params=params, headers=headers)
+        assert after.headers["ETag"] != first.headers["ETag"]
+        assert after.json()["items"][0]["tags"][0]["tag"] == "fresh"
+
+    async def test_page_cache_lookups_are_exported(self, client: AsyncClient):
+        """同一页读两次：/metrics 中的未命中与命中各加一，并给出缓存大小"""
+        _, headers = await _register_login(client, "page_cache_metrics")
+        workspace_id = await create_workspace(client, headers, "page-cache-metrics")
+        project_id = await create_project(client, headers, workspace_id, "metrics")
+        await create_task(client, headers, workspace_id, project_id, "counted")
+        url = f"/workspaces/{workspace_id}/tasks"
+
+        before = await _cache_metrics(client, "task_list_pages")
+        for _ in range(2):
+            assert (await client.get(url, headers=headers)).status_code == 200
+        after = await _cache_metrics(client, "task_list_pages")
+
+        assert after["miss"] - before["miss"] == 1
+        assert after["hit"] - before["hit"] == 1
+        metrics = (await client.get("/metrics")).text
+        assert 'cache_entries{cache="task_list_pages"} 1' in metrics
+        size = task_page_cache.size_bytes
+        assert f'cache_size_bytes{{cache="task_list_pages"}} {size}' in metrics
+
+    async def test_estimated_count_lookups_are_exported(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """计数表无法回答的过滤条件下，estimate 计数缓存的命中与未命中出现在 /metrics"""
+        monkeypatch.setattr(settings, "TASK_LIST_CACHE_ENABLED", False)
+        _, headers = await _register_login(client, "count_cache_metrics")
+        workspace_id = await create_workspace(client, headers, "count-cache-metrics")
+        project_id = await create_project(client, headers, workspace_id, "counts")
+        await create_task(client, headers, workspace_id, project_id, "counted")
+        url = f"/workspaces/{workspace_id}/tasks"
+        params = {"include_total": "estimate", "due_at_to": "2099-01-01T00:00:00Z"}
+
+        before = await _cache_metrics(client, "task_counts")
+        for _ in range(2):
+            resp = await client.get(url, params=params, headers=headers)
+            assert resp.status_code == 200
+            assert resp.json()["total"] == 0
+        after = await _cache_metrics(client, "task_counts")
+
+        assert after["miss"] - before["miss"] == 1
+        assert after["hit"] - before["hit"] == 1
+
+    async def test_toggle_disables_cache(
+        self,
+        client: AsyncClient,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        monkeypatch.setattr(settings, "TASK_LIST_CACHE_ENABLED", False)
+        _, headers = await _register_login(client, "page_cache_off")
+        workspace_id = await create_workspace(client, headers, "page-cache-off")
+
+        for _ in range(2):
+            resp = await client.get(f"/workspaces/{workspace_id}/tasks", headers=headers)
+            assert resp.status_code == 200
+        assert len(task_page_cache) == 0
+
+    def test_memory_cap_evicts_least_recently_used(self):
+        cache: VersionedBytesCache[str] = VersionedBytesCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        assert cache.get("a") == b"1234"
+        cache.set("c", b"1234")
+        cache.set("too-big", b"x" * 11)
+
+        assert cache.get("b") is None
+        assert cache.get("too-big") is None
+        assert cache.stats() == {
+            "entries": 2,
+            "size_bytes": 8,
+            "max_bytes": 10,
+            "hits": 1,
+            "misses": 2,
+            "evictions": 1,
+        }
@@ -1,7 +1,9 @@
 from datetime import UTC, datetime, timedelta
 
 from httpx import AsyncClient
+from sqlalchemy import event
 
+from tests.conftest import test_engine
 from tests.helpers import register_and_login_with_id as _register_login
 
 
@@ -261,3 +263,481 @@ class TestTaskV2:
         assert payload["total"] == 1
         assert len(payload["items"]) == 1
         assert payload["items"][0]["id"] == task_match_id
+
+    async def test_cursor_pagination_matches_offset_order(self, client: AsyncClient):
+        _, headers = await _register_login(client, "cursor_user")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "cursor-space",
+            "cursor-project",
+        )
+
+        now = datetime.now(UTC)
+        for index in range(7):
+            payload: dict = {"title": f"cursor-task-{index}"}
+            if index % 3:
+                payload["due_at"] = (now + timedelta(days=index % 2)).isoformat()
+            create_resp = await client.post(
+                f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+                json=payload,
+                headers=headers,
+            )
+            assert create_resp.status_code == 201
+
+        for sort_by in ("created_at", "updated_at", "due_at", "status", "id"):
+            for sort_order in ("asc", "desc"):
+                params = {"sort_by": sort_by, "sort_order": sort_order}
+                full_resp = await client.get(
+                    f"/workspaces/{workspace_id}/tasks",
+                    params={**params, "limit": 100},
+                    headers=headers,
+                )
+                assert full_resp.status_code == 200
+                assert full_resp.json()["next_cursor"] is None
+                expected_ids = [item["id"] for item in full_resp.json()["items"]]
+
+                seen_ids: list[int] = []
+                cursor = None
+                while True:
+                    page_params = {**params, "limit": 3}
+                    if cursor is not None:
+                        page_params["cursor"] = cursor
+                    page_resp = await client.get(
+                        f"/workspaces/{workspace_id}/tasks",
+                        params=page_params,
+                        headers=headers,
+                    )
+                    assert page_resp.status_code == 200
+                    page = page_resp.json()
+                    assert page["total"] == 7
+                    seen_ids.extend(item["id"] for item in page["items"])
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+
+                assert seen_ids == expected_ids, (sort_by, sort_order)
+
+        mismatched = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"limit": 3, "sort_by": "due_at", "cursor": cursor or "bad-cursor"},
+            headers=headers,
+        )
+        assert mismatched.status_code == 400
+
+    async def test_list_total_modes(self, client: AsyncClient):
+        _, headers = await _register_login(client, "total_mode_user")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "total-space",
+            "total-project",
+        )
+        for title in ("count-a", "count-b"):
+            create_resp = await client.post(
+                f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+                json={"title": title},
+                headers=headers,
+            )
+            assert create_resp.status_code == 201
+
+        for mode, expected_total in (("exact", 2), ("estimate", 2), ("false", None)):
+            list_resp = await client.get(
+                f"/workspaces/{workspace_id}/tasks",
+                params={"include_total": mode},
+                headers=headers,
+            )
+            assert list_resp.status_code == 200
+            payload = list_resp.json()
+            assert payload["total_mode"] == mode
+            assert payload["total"] == expected_total
+            assert len(payload["items"]) == 2
+
+    async def test_sparse_fieldsets(self, client: AsyncClient):
+        _, headers = await _register_login(client, "fields_user")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "fields-space",
+            "fields-project",
+        )
+        create_resp = await client.post(
+            f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+            json={"title": "fields-task", "description": "long body"},
+            headers=headers,
+        )
+        assert create_resp.status_code == 201
+        task_id = create_resp.json()["id"]
+
+        list_resp = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"fields": "title,status,assignee_id"},
+            headers=headers,
+        )
+        assert list_resp.status_code == 200
+        payload = list_resp.json()
+        assert payload["total"] == 1
+        assert payload["items"] == [
+            {"id": task_id, "title": "fields-task", "status": "todo", "assignee_id": None}
+        ]
+
+        get_resp = await client.get(
+            f"/workspaces/{workspace_id}/tasks/{task_id}",
+            params={"fields": "description"},
+            headers=headers,
+        )
+        assert get_resp.status_code == 200
+        assert get_resp.json() == {"id": task_id, "description": "long body"}
+
+        unknown_resp = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"fields": "title,password"},
+            headers=headers,
+        )
+        assert unknown_resp.status_code == 400
+
+    async def test_multi_value_filters(self, client: AsyncClient):
+        user_id, headers = await _register_login(client, "multi_filter_user")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "multi-filter-space",
+            "multi-filter-project",
+        )
+
+        async def create(title: str, assignee_id: int | None, tags: list[str]) -> int:
+            resp = await client.post(
+                f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+                json={"title": title, "assignee_id": assignee_id},
+                headers=headers,
+            )
+            assert resp.status_code == 201
+            task_id = resp.json()["id"]
+            for tag in tags:
+                tag_resp = await client.post(
+                    f"/workspaces/{workspace_id}/tasks/{task_id}/tags",
+                    json={"tag": tag},
+                    headers=headers,
+                )
+                assert tag_resp.status_code == 201
+            return task_id
+
+        async def transition(task_id: int, to_status: str) -> None:
+            resp = await client.post(
+                f"/workspaces/{workspace_id}/tasks/{task_id}/status-transitions",
+                json={"to_status": to_status},
+                headers=headers,
+            )
+            assert resp.status_code == 200
+
+        task_a = await create("a", user_id, ["urgent", "backend"])
+        task_b = await create("b", user_id, ["urgent"])
+        task_c = await create("c", None, ["backend"])
+        task_d = await create("d", None, [])
+        await transition(task_b, "in_progress")
+        await transition(task_b, "blocked")
+        await transition(task_c, "in_progress")
+
+        async def ids(params: dict | list) -> set[int]:
+            resp = await client.get(
+                f"/workspaces/{workspace_id}/tasks",
+                params=params,
+                headers=headers,
+            )
+            assert resp.status_code == 200
+            payload = resp.json()
+            assert payload["total"] == len(payload["items"])
+            return {item["id"] for item in payload["items"]}
+
+        assert await ids({"status": "todo,blocked"}) == {task_a, task_b, task_d}
+        assert await ids([("tag", "urgent"), ("tag", "backend")]) == {task_a}
+        assert await ids([("tag", "urgent"), ("tag", "backend"), ("tag_mode", "any")]) == {
+            task_a,
+            task_b,
+            task_c,
+        }
+        assert await ids({"unassigned": "true"}) == {task_c, task_d}
+        assert await ids({"unassigned": "false"}) == {task_a, task_b}
+        assert await ids({"assignee_id": f"in:{user_id}", "unassigned": "true"}) == {
+            task_a,
+            task_b,
+            task_c,
+            task_d,
+        }
+        assert await ids(
+            {"assignee_id": f"in:{user_id}", "unassigned": "true", "status": "in_progress"}
+        ) == {task_c}
+        assert await ids({"project_id": f"in:{project_id}", "status": "done"}) == set()
+
+        for bad_params in ({"status": "todo,bogus"}, {"assignee_id": "in:x"}, {"project_id": "0"}):
+            resp = await client.get(
+                f"/workspaces/{workspace_id}/tasks",
+                params=bad_params,
+                headers=headers,
+            )
+            assert resp.status_code == 422, bad_params
+
+    async def test_board_columns(self, client: AsyncClient):
+        _, headers = await _register_login(client, "board_user")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "board-space",
+            "board-project",
+        )
+        other_project = await client.post(
+            f"/workspaces/{workspace_id}/projects",
+            json={"name": "board-other"},
+            headers=headers,
+        )
+        other_project_id = other_project.json()["id"]
+
+        todo_ids = []
+        for index in range(3):
+            resp = await client.post(
+                f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+                json={"title": f"todo-{index}"},
+                headers=headers,
+            )
+            todo_ids.append(resp.json()["id"])
+        other = await client.post(
+            f"/workspaces/{workspace_id}/projects/{other_project_id}/tasks",
+            json={"title": "elsewhere"},
+            headers=headers,
+        )
+        assert other.status_code == 201
+        moved = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{todo_ids[0]}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers=headers,
+        )
+        assert moved.status_code == 200
+
+        board_resp = await client.get(
+            f"/workspaces/{workspace_id}/board",
+            params={"project_id": project_id, "limit": 1, "sort_order": "asc"},
+            headers=headers,
+        )
+        assert board_resp.status_code == 200
+        board = board_resp.json()
+        columns = {column["status"]: column for column in board["columns"]}
+        assert list(columns) == ["todo", "in_progress", "blocked", "done"]
+        assert [task["id"] for task in columns["todo"]["items"]] == [todo_ids[1]]
+        assert columns["todo"]["total"] == 2
+        assert [task["id"] for task in columns["in_progress"]["items"]] == [todo_ids[0]]
+        assert columns["in_progress"]["total"] == 1
+        assert columns["in_progress"]["next_cursor"] is None
+        assert columns["done"] == {"status": "done", "items": [], "total": 0, "next_cursor": None}
+
+        next_page = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={
+                "project_id": project_id,
+                "status": "todo",
+                "limit": 1,
+                "sort_order": "asc",
+                "cursor": columns["todo"]["next_cursor"],
+            },
+            headers=headers,
+        )
+        assert next_page.status_code == 200
+        assert [task["id"] for task in next_page.json()["items"]] == [todo_ids[2]]
+
+        whole_workspace = await client.get(
+            f"/workspaces/{workspace_id}/board",
+            headers=headers,
+        )
+        todo_column = whole_workspace.json()["columns"][0]
+        assert todo_column["total"] == 3
+        assert todo_column["items"][0]["title"] == "elsewhere"
+
+    async def test_expand_relations_batch_loaded(self, client: AsyncClient):
+        user_id, headers = await _register_login(client, "expand_user")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "expand-space",
+            "expand-project",
+        )
+
+        task_ids = []
+        for index in range(5):
+            resp = await client.post(
+                f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+                json={"title": f"expand-{index}"},
+                headers=headers,
+            )
+            task_ids.append(resp.json()["id"])
+
+        for tag in ("ui", "api"):
+            tag_resp = await client.post(
+                f"/workspaces/{workspace_id}/tasks/{task_ids[0]}/tags",
+                json={"tag": tag},
+                headers=headers,
+            )
+            assert tag_resp.status_code == 201
+        watch_resp = await client.post(
+            f"/workspaces/{workspace_id}/tasks/{task_ids[1]}/watchers",
+            json={"user_id": user_id},
+            headers=headers,
+        )
+        assert watch_resp.status_code == 201
+        for content in ("first", "second"):
+            comment_resp = await client.post(
+                f"/workspaces/{workspace_id}/tasks/{task_ids[0]}/comments",
+                json={"content": content},
+                headers=headers,
+            )
+            assert comment_resp.status_code == 201
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        async def list_page(limit: int, expand: str) -> dict:
+            statements.clear()
+            event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+            try:
+                resp = await client.get(
+                    f"/workspaces/{workspace_id}/tasks",
+                    params={"limit": limit, "sort_order": "asc", "expand": expand},
+                    headers=headers,
+                )
+            finally:
+                event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+            assert resp.status_code == 200
+            return resp.json()
+
+        payload = await list_page(5, "tags,watchers,comment_count")
+        items = {item["id"]: item for item in payload["items"]}
+        assert [tag["tag"] for tag in items[task_ids[0]]["tags"]] == ["ui", "api"]
+        assert items[task_ids[0]]["comment_count"] == 2
+        assert items[task_ids[0]]["watchers"] == []
+        assert [watcher["user_id"] for watcher in items[task_ids[1]]["watchers"]] == [user_id]
+        assert items[task_ids[4]]["tags"] == [] and items[task_ids[4]]["comment_count"] == 0
+        full_page_statements = len(statements)
+
+        await list_page(1, "tags,watchers,comment_count")
+        assert len(statements) == full_page_statements
+
+        detail = await client.get(
+            f"/workspaces/{workspace_id}/tasks/{task_ids[0]}",
+            params={"expand": "comment_count", "fields": "title"},
+            headers=headers,
+        )
+        assert detail.status_code == 200
+        assert detail.json() == {"id": task_ids[0], "title": "expand-0", "comment_count": 2}
+
+        unknown = await client.get(
+            f"/workspaces/{workspace_id}/tasks",
+            params={"expand": "comments"},
+            headers=headers,
+        )
+        assert unknown.status_code == 400
+
+    async def test_task_etags_and_preconditions(self, client: AsyncClient):
+        _, headers = await _register_login(client, "etag_user")
+        _, outsider_headers = await _register_login(client, "etag_outsider")
+        workspace_id, project_id = await _create_workspace_project(
+            client,
+            headers,
+            "etag-space",
+            "etag-project",
+        )
+        create_resp = await client.post(
+            f"/workspaces/{workspace_id}/projects/{project_id}/tasks",
+            json={"title": "etag-task"},
+            headers=headers,
+        )
+        task_id = create_resp.json()["id"]
+        task_url = f"/workspaces/{workspace_id}/tasks/{task_id}"
+
+        first = await client.get(task_url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert etag == f'"task-{task_id}-v1"'
+
+        not_modified = await client.get(task_url, headers={**headers, "If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+
+        weak = await client.get(task_url, headers={**headers, "If-None-Match": f"W/{etag}"})
+        assert weak.status_code == 304
+
+        outsider = await client.get(task_url, headers={**outsider_headers, "If-None-Match": etag})
+        assert outsider.status_code == 404
+
+        sparse = await client.get(
+            task_url,
+            params={"fields": "title"},
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert sparse.status_code == 304
+        assert sparse.headers["ETag"] == f'W/"task-{task_id}-v1"'
+
+        # 精简响应的字节与完整表示不同，只给弱 ETag，不能作为写前置条件
+        sparse_full = await client.get(task_url, params={"fields": "title"}, headers=headers)
+        assert sparse_full.headers["ETag"] == f'W/"task-{task_id}-v1"'
+        weak_write = await client.patch(
+            task_url,
+            json={"title": "weak"},
+            headers={**headers, "If-Match": sparse_full.headers["ETag"]},
+        )
+        assert weak_write.status_code == 412
+
+        expanded = await client.get(
+            task_url,
+            params={"expand": "tags"},
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert expanded.status_code == 200
+        assert "ETag" not in expanded.headers
+
+        patched = await client.patch(
+            task_url,
+            json={"title": "etag-task-2"},
+            headers={**headers, "If-Match": etag},
+        )
+        assert patched.status_code == 200
+        new_etag = patched.headers["ETag"]
+        assert new_etag == f'"task-{task_id}-v2"'
+
+        stale_get = await client.get(task_url, headers={**headers, "If-None-Match": etag})
+        assert stale_get.status_code == 200
+        assert stale_get.json()["title"] == "etag-task-2"
+
+        stale_patch = await client.patch(
+            task_url,
+            json={"title": "lost update"},
+            headers={**headers, "If-Match": etag},
+        )
+        assert stale_patch.status_code == 412
+
+        no_precondition = await client.patch(task_url, json={"title": "x"}, headers=headers)
+        assert no_precondition.status_code == 400
+
+        stale_transition = await client.post(
+            f"{task_url}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers={**headers, "If-Match": etag},
+        )
+        assert stale_transition.status_code == 412
+
+        transition = await client.post(
+            f"{task_url}/status-transitions",
+            json={"to_status": "in_progress"},
+            headers={**headers, "If-Match": new_etag},
+        )
+        assert transition.status_code == 200
+        assert transition.headers["ETag"] == f'"task-{task_id}-v3"'
+
+        stale_delete = await client.delete(task_url, headers={**headers, "If-Match": new_etag})
+        assert stale_delete.status_code == 412
+
+        delete = await client.delete(
+            task_url,
+            headers={**headers, "If-Match": transition.headers["ETag"]},
+        )
+        assert delete.status_code == 204